@@ -1,633 +1,455 @@
+import time
+_SCRIPT_STARTED = time.perf_counter()
+
 import streamlit as st
-import google.generativeai as genai
 import random
 import os
-import json
-import re
 import sys
 import io
-from ddgs import DDGS
+import uuid
+import pandas as pd
+from collections import deque
+from ddgs import search_cache_stats, search_guard_status
+from json_extract import JSONStreamExtractor
+from jobs import JobExecutor, STAGE_LABELS
+from pipeline import (
+    BATCH_MODES, BATCH_SHARED_SEARCH, clean_all_tags, configure, get_article_store, get_llm_cache, length_fix_stats, model_pool_stats, run_batch,
+    search_dedup_stats, shared_search_savings, write_all_platforms, write_naver_profit, write_naver_profit_variants,
+    write_naver_info, write_tistory_info
+)
+from render import clipboard_literal
+import tracing
 from dotenv import load_dotenv
 from datetime import datetime
 
 # ==========================================
 # 1. 환경 설정
 # ==========================================
-load_dotenv()
-sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.detach(), encoding='utf-8')
-
-GENAI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Streamlit은 위젯을 건드릴 때마다 이 파일을 다시 실행하므로
+# 무거운 준비 작업은 st.cache_resource로 프로세스당 한 번만 수행합니다.
+# (모델/검색 풀/응답 캐시는 pipeline 모듈이 프로세스당 한 번 만들어 재사용)
+
+@st.cache_resource
+def setup_environment():
+    """.env 로드 및 콘솔 UTF-8 설정 (프로세스 수명 동안 1회)"""
+    load_dotenv()
+    # detach() 재포장은 리런마다 스트림을 갈아끼우므로 reconfigure로 한 번만 설정
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding='utf-8')
+    return True
+
+@st.cache_resource
+def get_job_executor():
+    """원고 생성 작업 실행기 (모든 세션 공용, JOB_WORKERS개 워커가 사용자별 대기열을 번갈아 처리)"""
+    return JobExecutor(workers=int(os.getenv("JOB_WORKERS", "4")), history=int(os.getenv("JOB_HISTORY", "500")))
+
+@st.cache_resource
+def get_runtime_stats():
+    """콜드 스타트 / 리런 오버헤드 측정값 (프로세스 공용)"""
+    return {"cold_start": None, "reruns": deque(maxlen=200)}
+
+setup_environment()
+
+# 키 여러 개(GEMINI_API_KEYS, 쉼표 구분)를 우선 사용
+GENAI_API_KEY = os.getenv("GEMINI_API_KEYS") or os.getenv("GEMINI_API_KEY")
 if not GENAI_API_KEY:
     st.error("🚨 GEMINI_API_KEY를 .env 파일에서 찾을 수 없습니다.")
     st.stop()
 
-genai.configure(api_key=GENAI_API_KEY)
-model = genai.GenerativeModel('gemini-3-flash-preview')
+configure(GENAI_API_KEY)
+job_executor = get_job_executor()
+article_store = get_article_store()
+runtime_stats = get_runtime_stats()
+_SETUP_DONE = time.perf_counter()
+# 이번 실행에서 본문을 보낸 복사 버튼 해시 (끝까지 렌더된 실행에서만 clipboard_sent로 옮김)
+_clipboard_pending = []
 
 # ==========================================
-# 2. 공통 함수
+# 2. 공통 UI 함수
 # ==========================================
 
-def hunt_realtime_info(keyword):
-    """실시간 정보 수집"""
-    try:
-        with DDGS() as ddgs:
-            results = list(ddgs.news(keyword, region='kr-kr', safesearch='off', timelimit='w', max_results=6))
-            if not results:
-                results = list(ddgs.text(keyword, region='kr-kr', max_results=6))
-            context = ""
-            for r in results:
-                context += f"정보원: {r.get('title', '')}\n핵심내용: {r.get('body', '')}\n\n"
-            return context if context else "최신 트렌드 분석을 기반으로 집필합니다."
-    except:
-        return "최신 트렌드 분석을 기반으로 집필합니다."
-
-def clean_all_tags(text):
-    """HTML 태그 제거"""
-    text = re.sub(r'<[^>]*>', '', text)
-    text = text.replace("**", "").replace("__", "").replace("*", "")
-    return text.strip()
-
-def get_ftc_text(url):
-    """공정위 문구"""
-    if not url: return ""
-    u = url.lower()
-    if "coupang" in u: return "이 포스팅은 쿠팡 파트너스 활동의 일환으로, 이에 따른 일정액의 수수료를 제공받습니다."
-    if "naver" in u or "smartstore" in u: return "이 포스팅은 네이버 쇼핑커넥트 활동의 일환으로, 판매 발생 시 수수료를 제공받습니다."
-    if "oliveyoung" in u: return "이 포스팅은 올리브영 쇼핑 큐레이터 활동의 일환으로, 판매 발생시 수수료를 제공받습니다."
-    return "이 포스팅은 제휴 마케팅 활동의 일환으로 커미션를 받습니다."
-
-# ==========================================
-# 3. 네이버 수익형 (11.py)
-# ==========================================
-
-NAVER_PROFIT_PERSONAS = [
-    {
-        "role": "30대 워킹맘",
-        "tone": "친근한 존댓말",
-        "keywords": ["진짜", "완전", "대박", "리얼", "솔직히"],
-        "emoji_style": "😊 💕 👍 ✨ 🔥",
-        "intro_style": "일상 에피소드"
-    },
-    {
-        "role": "20대 직장인",
-        "tone": "가벼운 반말",
-        "keywords": ["ㅇㅁ", "가성비", "꿀템", "핵이득", "존맛"],
-        "emoji_style": "🔥 💯 ✅ 💸 ⚡",
-        "intro_style": "문제 상황 제시"
-    },
-    {
-        "role": "40대 구매 전문가",
-        "tone": "정중한 존댓말",
-        "keywords": ["실제로", "확실히", "분명", "경험상", "추천드립니다"],
-        "emoji_style": "✅ 💡 📊 👌 ⭐",
-        "intro_style": "통계/데이터"
-    },
-    {
-        "role": "블로그 마니아",
-        "tone": "설명형 존댓말",
-        "keywords": ["정리해드릴게요", "알려드립니다", "확인해보세요", "참고하세요"],
-        "emoji_style": "📌 ✏️ 💬 🎯 📝",
-        "intro_style": "핫한 질문"
-    },
-    {
-        "role": "소비 분석가",
-        "tone": "분석적 존댓말",
-        "keywords": ["비교해보면", "데이터상", "실측", "결과적으로"],
-        "emoji_style": "📈 🔍 💰 🎓 ⚖️",
-        "intro_style": "폭로/반전"
+def stream_preview_text(raw_text):
+    """생성 중인 응답 → 지금까지의 본문 미리보기 (청크를 추출기에 넣어 잘린 JSON 복구)"""
+    extractor = JSONStreamExtractor()
+    extractor.feed(raw_text)
+    return clean_all_tags(extractor.partial().get('content', ''))
+
+def ui_generation_options(prefix):
+    """사이드바 설정 → write_* 공통 인자"""
+    return {
+        "use_cache": not st.session_state.search_fresh,
+        "use_llm_cache": not st.session_state.llm_fresh,
+        "seed": st.session_state.get(f"{prefix}_seed") if st.session_state.reuse_seed else None
     }
-]
-
-NAVER_PROFIT_STRUCTURES = {
-    1: {"name": "스토리텔링형", "sections": ["개인 경험담", "문제 발견", "제품 만남", "사용 과정", "결과/변화"], "cta_position": "변화 직후"},
-    2: {"name": "데이터 분석형", "sections": ["시장 현황", "수치 비교", "스펙 분석", "가격 분석", "종합 평가"], "cta_position": "핵심 데이터 후"},
-    3: {"name": "비교 대결형", "sections": ["경쟁 제품들", "1차 비교", "심층 비교", "상황별 추천", "최종 승자"], "cta_position": "비교 결과 후"},
-    4: {"name": "폭로 고발형", "sections": ["충격 사실", "업계 속사정", "진실 분석", "대안 제시", "행동 촉구"], "cta_position": "진실 폭로 후"},
-    5: {"name": "Q&A 해결형", "sections": ["베스트 질문", "오해 바로잡기", "핵심 답변", "추가 팁", "최종 정리"], "cta_position": "핵심 답변 후"}
-}
-
-DIVIDERS = [
-    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-    "────────────────────────────",
-    "◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈",
-    "============================================"
-]
 
-def get_naver_h3(text):
-    """네이버 19px 소제목"""
-    return f'\n{random.choice(DIVIDERS)}\n<span style="font-size: 19px; font-weight: bold; color: #000000;">📍 {text}</span>\n'
-
-def generate_naver_profit_prompt(keyword, product, url, facts, persona, structure):
-    """네이버 수익형 프롬프트"""
-    current_date = datetime.now().strftime("%Y년 %m월 %d일")
+def session_owner():
+    """작업 대기열과 원고 저장소를 나누는 세션 ID (주소의 ?sid=로 남겨 새로고침해도 이어짐)"""
+    if "session_owner" not in st.session_state:
+        st.session_state.session_owner = st.query_params.get("sid") or uuid.uuid4().hex
+    st.query_params["sid"] = st.session_state.session_owner
+    return st.session_state.session_owner
+
+# 세션에 남겨 둘 모드별 작업 ID 수 (작업 목록은 최근 10건만 표시)
+SESSION_JOBS = 20
+
+def submit_job(prefix, label, run):
+    """run(job)을 백그라운드 작업으로 제출하고 이 모드의 작업 목록에 추가"""
+    job_id = job_executor.submit(session_owner(), prefix, label, run)
+    jobs = st.session_state.setdefault(f"{prefix}_jobs", [])
+    jobs.append(job_id)
+    del jobs[:-SESSION_JOBS]
+
+def submit_generation(prefix, label, write, *args):
+    """원고 생성을 백그라운드 작업으로 제출 (버튼을 누른 시점의 사이드바 설정 사용)"""
+    options = ui_generation_options(prefix)
+    stream = st.session_state.stream_mode
     
-    return f"""
-당신은 지금 {persona["role"]}입니다. 블로그를 {random.randint(3, 8)}년째 운영 중입니다.
-
-[철칙 - 위반 시 즉시 폐기]
-1. "안녕하세요", "오늘은", "알아보겠습니다" 같은 AI 티 나는 문구 절대 금지
-2. 예의 바른 인사 금지. 바로 충격/위기/호기심으로 시작!
-3. 메타 언급 금지 ("태그를 사용", "방식으로", "구조는")
-4. 마크다운(*, #, -, **) 절대 금지. 오직 <b>태그만!
-5. 🚫 자기소개 절대 금지 ("저는", "블로거", "리뷰어", "전문가입니다", "~년차", "운영중")
-6. 🚫 쿠팡 언급 절대 금지 ("쿠팡에서", "쿠팡으로", "쿠팡 파트너스")
-7. 🚫 마무리 멘트 절대 금지 ("결론", "마무리", "마치며", "정리하면", "요약하면", "끝으로", "마지막으로")
-8. 🚫 날짜 노출 절대 금지 ("2025년", "1월", "오늘", "어제", "내일", 구체적 날짜 표기)
-
-[작성 정보]
-- 날짜: {current_date} (참고용, 본문에 절대 쓰지 마세요!)
-- 키워드: {keyword}
-- 제품: {product}
-- 링크: {url}
-- 실시간 이슈: {facts}
-- 캐릭터 말투: {persona["tone"]}
-- 자주 쓸 말: {", ".join(persona["keywords"])}
-- 이모지: {persona["emoji_style"]} (본문에 자연스럽게)
-- 구조: {structure["name"]}
-
-[글자수]
-정확히 1800~2400자 (엄수)
-
-[JSON 응답]
-{{
-    "title": "제목",
-    "content": "본문",
-    "meta_description": "SEO 요약 (150자)",
-    "hashtags": "7개"
-}}
+    def run(job):
+        return write(*args, on_chunk=job.append if stream else None, on_stage=job.set_stage, **options)
+    
+    submit_job(prefix, label, run)
+
+def store_post(mode, post):
+    """원고를 저장소에 넣고 ID 반환 (전체 생성 결과는 플랫폼별로 따로 저장하고 ID만 묶음)"""
+    if "posts" in post:
+        return dict(post, posts={platform: store_post(platform, p) for platform, p in post['posts'].items()})
+    return article_store.save(session_owner(), mode, post.get('keyword', ''), post)
+
+def fetch_post(ref):
+    """store_post의 반환값 → 저장된 원고 (LRU로 지워진 원고는 None, 전체 생성 결과에서는 빠짐)"""
+    if not ref:
+        return None
+    if isinstance(ref, dict):
+        posts = ((platform, article_store.get(article_id)) for platform, article_id in ref['posts'].items())
+        return dict(ref, posts={platform: p for platform, p in posts if p})
+    return article_store.get(ref)
+
+def select_post(prefix, ref, seed):
+    """화면에 표시할 원고 지정 (세션에는 원고 ID와 시드만 보관)"""
+    st.session_state[f"{prefix}_post"] = ref
+    st.session_state[f"{prefix}_seed"] = seed
+
+def load_job_result(prefix, job):
+    """끝난 작업의 원고를 저장소로 옮기고 화면에 불러옴 (작업에는 원고 ID만 남겨 메모리에서 비움)"""
+    if "ref" not in job.result:
+        record_generation_timing(job.result)
+        job.result = {"ref": store_post(prefix, job.result), "seed": job.result['seed']}
+    select_post(prefix, job.result['ref'], job.result['seed'])
+
+def collect_finished_jobs(prefix, load=load_job_result):
+    """새로 끝난 작업을 한 번씩 반영 (가장 최근에 끝난 원고를 화면에 표시)"""
+    seen = st.session_state.setdefault(f"{prefix}_jobs_seen", set())
+    job_ids = st.session_state.get(f"{prefix}_jobs", [])
+    seen.intersection_update(job_ids)
+    for job_id in job_ids:
+        job = job_executor.get(job_id)
+        if job is None or not job.finished or job_id in seen:
+            continue
+        seen.add(job_id)
+        if job.state == "done":
+            load(prefix, job)
+
+def _job_panel(prefix, load=load_job_result):
+    """이 모드에서 제출한 작업 목록과 진행 단계"""
+    jobs = [j for j in map(job_executor.get, st.session_state.get(f"{prefix}_jobs", [])) if j]
+    if not jobs:
+        return
+    seen = st.session_state.get(f"{prefix}_jobs_seen", set())
+    if any(j.finished and j.id not in seen for j in jobs):
+        # 새로 끝난 작업이 있으면 전체 리런으로 결과 영역까지 갱신
+        st.rerun()
+    
+    st.caption(f"🗂️ 작업 {len(jobs)}건")
+    for job in reversed(jobs[-10:]):
+        col1, col2 = st.columns([5, 1])
+        status = STAGE_LABELS.get(job.state, job.state)
+        if job.state == "queued":
+            status += f" (내 앞 {job_executor.position(job.id)}건)"
+        elif job.state == "error":
+            status += f": {job.error}"
+        col1.markdown(f"**{job.label}** · {status} · {job.elapsed():.1f}초")
+        if job.state == "queued" and col2.button("취소", key=f"cancel_{job.id}"):
+            job_executor.cancel(job.id)
+            st.rerun()
+        if job.state == "done" and col2.button("불러오기", key=f"load_{job.id}"):
+            load(prefix, job)
+            st.rerun()
+        if job.progress and not job.finished:
+            done, total = job.progress
+            st.progress(done / total if total else 0.0, text=f"{done}/{total} 완료")
+            notes = job.notes()
+            if notes:
+                st.markdown("\n".join(notes[-10:]))
+        elif job.state == "generating" and job.text():
+            st.text(stream_preview_text(job.text()))
+
+_job_panel_live = st.fragment(run_every=float(os.getenv("JOB_POLL_SEC", "1")))(_job_panel)
+
+def show_jobs(prefix, load=load_job_result):
+    """작업 목록 표시 (진행 중인 작업이 있으면 이 영역만 주기적으로 갱신)
+
+    load(prefix, job): 끝난 작업의 결과를 화면에 불러오는 함수 (기본은 원고 1건)
+    """
+    collect_finished_jobs(prefix, load)
+    jobs = [j for j in map(job_executor.get, st.session_state.get(f"{prefix}_jobs", [])) if j]
+    if any(not j.finished for j in jobs):
+        _job_panel_live(prefix, load)
+    else:
+        _job_panel(prefix, load)
+
+def record_generation_timing(post):
+    """스트리밍·일반 비교용 생성 시간 기록 (캐시 재생은 제외)"""
+    if "posts" in post:
+        for platform_post in post['posts'].values():
+            record_generation_timing(platform_post)
+        return
+    if post['cached']:
+        return
+    timings = st.session_state.setdefault('gen_timings', [])
+    timings.append({"streamed": post['streamed'], "ttft": post['ttft'], "elapsed": post['elapsed']})
+    del timings[:-50]
+
+def length_caption(length):
+    """글자수 보정 결과 → 캡션 꼬리 (보정하지 않았으면 빈 문자열)"""
+    if not length or not length['rounds']:
+        return ""
+    action = "늘림" if length['action'] == "extend" else "줄임"
+    share = length['tokens'] / length['full_tokens'] * 100 if length['full_tokens'] else 0
+    return f" · 📐 {length['before']:,}자에서 {action} ({length['rounds']}회, 토큰 {length['tokens']:,} · 전체 재생성의 {share:.0f}%)"
+
+def show_generation_timing(post):
+    """페르소나/구조와 첫 토큰/전체 생성 시간 표시"""
+    st.info(f"🎭 페르소나: {post['persona']}" + (f" | 📖 구조: {post['structure']}" if post['structure'] else ""))
+    if post['repaired']:
+        st.warning("⚠️ 응답이 잘리거나 형식이 깨져 있어 복구한 원고입니다. 내용을 꼭 확인해주세요.")
+    quality = post['quality']
+    banned = ", ".join(f"{phrase}×{count}" for _, phrase, count in quality['banned'])
+    st.caption(f"📏 점수 {quality['score']:.0f}/100 · 본문 {quality['chars']:,}자" + (f" · 금지 문구 {banned}" if banned else "") + (f" · CTA 누락 {', '.join(quality['cta_missing'])}" if quality['cta_missing'] else "") + (f" · 🩹 위반 문장 {quality['fixed']}개 수정" if quality.get('fixed') else "") + length_caption(quality.get('length')))
+    if post['cached']:
+        st.caption(f"♻️ 저장된 응답 재생 (시드 {post['seed']}, 모델 호출 없음)")
+        return
+    kind = "스트리밍" if post['streamed'] else "일반"
+    st.caption(f"⏱️ {kind} 생성 · 첫 토큰 {post['ttft']:.2f}초 · 전체 {post['elapsed']:.2f}초")
+
+def show_recent(prefix):
+    """이 모드에서 내가 만든 최근 원고 목록 (저장소에서 불러오기, 키워드로 거르기)"""
+    with st.expander("📚 최근 원고"):
+        keyword = st.text_input("키워드로 찾기", key=f"{prefix}_recent_kw").strip()
+        articles = article_store.recent(mode=prefix, keyword=keyword or None, session=session_owner(), limit=10)
+        if not articles:
+            st.caption("저장된 원고가 없습니다.")
+        current = st.session_state.get(f"{prefix}_post")
+        for article in articles:
+            col1, col2 = st.columns([5, 1])
+            score = f"{article['score']:.0f}점 · " if article['score'] is not None else ""
+            mark = " ✅" if article['id'] == current else ""
+            col1.markdown(f"{score}**{article['keyword']}**{mark} · {article['title']} · {datetime.fromtimestamp(article['created']):%m-%d %H:%M}")
+            if not mark and col2.button("불러오기", key=f"{prefix}_recent_{article['id']}"):
+                post = article_store.get(article['id'])
+                if post:
+                    select_post(prefix, article['id'], post['seed'])
+                st.rerun()
+
+def show_candidates(prefix, post):
+    """여러 후보를 생성한 경우 점수순 후보 목록 (다른 후보를 골라 불러올 수 있음)"""
+    candidates = post.get('candidates') or []
+    if len(candidates) < 2 and not post.get('errors'):
+        return
+    with st.expander(f"🎯 후보 {len(candidates)}개 점수 비교", expanded=True):
+        for i, candidate in enumerate(candidates):
+            quality = candidate['quality']
+            col1, col2 = st.columns([5, 1])
+            current = " ✅" if candidate['seed'] == post['seed'] else ""
+            col1.markdown(
+                f"**{quality['score']:.0f}점**{current} · {candidate['persona']} / {candidate['structure']} · "
+                f"{quality['chars']:,}자 · 금지 문구 {sum(c for _, _, c in quality['banned'])}건 · {candidate['title']}"
+            )
+            if not current and col2.button("불러오기", key=f"{prefix}_candidate_{i}"):
+                select_post(prefix, store_post(prefix, dict(candidate, candidates=candidates, errors=post.get('errors', []))), candidate['seed'])
+                st.rerun()
+        for error in post.get('errors', []):
+            st.caption(f"❌ 실패한 후보: {error}")
+
+# 플랫폼별 복사 버튼 (문구, 버튼 스타일, 복사 후 알림)
+COPY_BUTTONS = {
+    "naver_profit": ("📋 네이버 블로그 서식 포함 복사", "background:#111; color:#00FF7F; border:2px solid #00FF7F;", "✅ 복사 완료!"),
+    "naver_info": ("🟢 전문가 칼럼 복사하기", "background:#03cf5d; color:white; border:none;", "✅ 복사 완료!"),
+    "tistory_info": ("🟠 티스토리 HTML 복사하기", "background:#FF6B35; color:white; border:none;", "✅ 복사 완료! 티스토리 HTML 모드에 붙여넣기 하세요")
+}
 
-[🔥 제목 작성법 - 클릭 유도 필수!]
-8가지 패턴 중 1개:
-1. 손해 공포형: "이거 모르면 {{금액}}원 날립니다"
-2. 정보 격차형: "알 사람은 다 아는 {{상품}} 진실"
-3. 시간 압박형: "지금만 {{혜택}}, 내일부터 인상"
-4. 후회 경고형: "{{행동}} 했다가 멘붕 왔습니다"
-5. 내부자 폭로형: "업계인이 폭로하는 {{진실}}"
-6. 비교 충격형: "{{A}} vs {{B}}, 결과 충격"
-7. 반전 경험형: "{{기대}}했는데 {{반전}}"
-8. 긴급 정보형: "지금 당장 확인하세요, {{위험}}"
-
-제목 규칙:
-- {keyword} 반드시 포함
-- 15~25자
-- 구체적 숫자 사용
-- 이모지 금지
-
-[💣 도입부 (첫 5문장이 생명)]
-5가지 후킹 전략 중 1개:
-1. 충격 사실: "이거 알면 절대 못합니다." + 수치 증명
-2. 손해 경험: "{{금액}}원 날렸습니다." + 이유
-3. 시간 압박: "지금만입니다." + 손해
-4. 정보 격차: "알 사람만 압니다." + 모르면 손해
-5. 반전 경험: "{{기대}}했는데 {{반전}}"
-
-도입 필수:
-✅ 첫 문장 5단어 이내
-✅ 구체적 숫자 2개+
-✅ 이모지 1~2개
-✅ {persona["intro_style"]}로 시작
-
-[본문 구성]
-{", ".join(structure["sections"])}로 전개
-
-각 섹션:
-- 소제목: [TITLE]제목[/TITLE]
-- 키워드/숫자 <b>태그</b> 강조
-- 이모지 자연스럽게
-- FOMO 문구 반복
-
-🔥 중간 재후킹 (3번째 섹션):
-- "여기까지만 알아도 {{금액}}원 아낍니다"
-- "근데 진짜 중요한 건 지금부터예요"
-
-FOMO 문구 (최소 5회):
-"이거 모르고 샀다간...", "안 쓰면 바보", "알 사람만 안다", "지금 아니면 기회 없어요", "뒤늦게 알고 후회했어요"
-
-[CTA 배치]
-[[CTA_1]]을 {structure["cta_position"]}에 1번
-[[CTA_2]]를 FAQ 직전에 1번
-총 2번 배치
-
-[FAQ 필수 3개]
-Q1: 가장 큰 실수/오해
-Q2: 꼭 확인해야 할 것
-Q3: 지금 사야 하는 이유
-
-[마무리]
-FAQ 후 마지막 2~3문장으로 강하게:
-"지금 안 하면 진짜 후회합니다", "{{금액}}원 날리기 싫으면 지금 바로"
-→ 행동 촉구만! 정리/요약 절대 금지!
-
-[해시태그]
-7개 (이모지 없이, 검색 키워드)
-
-{product}에 대한 {structure["name"]} 스타일 원고를 작성하세요.
-JSON만 출력하세요.
-"""
+def copy_button(platform, post):
+    """서식(HTML) 그대로 클립보드에 복사하는 버튼
+
+    원고 HTML은 내용 해시별로 세션당 한 번만 브라우저에 보내 sessionStorage에 두고,
+    이후 리런에서는 해시만 보내므로 원고가 바뀔 때만 본문이 전송됨
+    (보냄 표시는 실행이 끝까지 렌더된 뒤에 남기므로, 중간에 끊긴 리런에서 보낸 본문은 다음에 다시 보냄)
+    """
+    label, style, done = COPY_BUTTONS[platform]
+    digest = post['clipboard_hash']
+    sent = st.session_state.setdefault("clipboard_sent", deque(maxlen=50))
+    if digest in sent:
+        payload = "null"
+    else:
+        payload = clipboard_literal(post['clipboard'])
+        _clipboard_pending.append(digest)
+    st.components.v1.html(f"""
+        <button onclick="copyRich()" style="width:100%; padding:20px; {style} border-radius:12px; font-weight:bold; cursor:pointer; font-size:18px;">
+            {label}
+        </button>
+        <script>
+        const key = "blog-ai-copy-{digest}";
+        const payload = {payload};
+        if (payload !== null) sessionStorage.setItem(key, payload);
+        function copyRich() {{
+            const html = sessionStorage.getItem(key);
+            if (html === null) {{
+                alert("복사할 원고를 찾지 못했습니다. 새로고침 후 다시 시도해주세요.");
+                return;
+            }}
+            const blob = new Blob([html], {{ type: "text/html" }});
+            const data = [new ClipboardItem({{ "text/html": blob }})];
+            navigator.clipboard.write(data).then(() => alert("{done}"));
+        }}
+        </script>
+    """, height=100)
+
+# ==========================================
+# 3. 네이버 수익형 (11.py)
+# ==========================================
 
 def render_naver_profit():
     """네이버 수익형 UI"""
     st.title("💀 네이버 수익형 v8.8: FOMO 극대화")
     st.markdown("<p style='color:#666;'>매번 다른 페르소나와 구조로 AI 흔적을 완벽히 숨깁니다.</p>", unsafe_allow_html=True)
     
-    if 'naver_profit_content' not in st.session_state: 
-        st.session_state.naver_profit_content = ""
-    if 'naver_profit_display' not in st.session_state: 
-        st.session_state.naver_profit_display = ""
-    
     col1, col2 = st.columns(2)
     with col1:
         keyword = st.text_input("💎 키워드", key="naver_profit_kw", placeholder="예: 무선 청소기 추천")
         product = st.text_input("📦 상품명", key="naver_profit_prod", placeholder="예: 다이슨 V15")
     with col2:
         url = st.text_input("🔗 제휴 링크", key="naver_profit_url", placeholder="http://...")
+        variants = st.number_input("🎯 후보 수 (2 이상이면 동시 생성 후 최고 점수 선택)", 1, 5, 1, key="naver_profit_variants")
     
     if st.button("🚀 FOMO 극대화 원고 생성", key="naver_profit_btn"):
         if not keyword or not product or not url:
             st.warning("⚠️ 모든 정보를 입력해주세요.")
+        elif variants > 1:
+            submit_generation("naver_profit", f"{keyword} · {product} · 후보 {variants}개", write_naver_profit_variants, keyword, product, url, int(variants))
         else:
-            with st.spinner('페르소나 선택 중...'):
-                try:
-                    persona = random.choice(NAVER_PROFIT_PERSONAS)
-                    structure_id = random.randint(1, 5)
-                    structure = NAVER_PROFIT_STRUCTURES[structure_id]
-                    
-                    facts = hunt_realtime_info(keyword)
-                    prompt = generate_naver_profit_prompt(keyword, product, url, facts, persona, structure)
-                    
-                    st.info(f"🎭 페르소나: {persona['role']} | 📖 구조: {structure['name']}")
-                    
-                    response = model.generate_content(prompt)
-                    raw_text = response.text
-                    
-                    json_match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-                    if json_match:
-                        data = json.loads(json_match.group())
-                        title = data.get('title', f'{keyword} 후기')
-                        content = data.get('content', '')
-                        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', lambda m: get_naver_h3(m.group(1)), content)
-                        
-                        cta_html = f'<div style="margin: 30px 0; padding: 20px; border: 3px solid #000; background: #fff; border-radius: 5px;"><p style="font-size: 15px; color: #000; margin: 0 0 10px 0; font-weight: bold;">🚨 이거 모르고 사면 손해!</p><p style="font-size: 16px; color: #000; margin: 0; font-weight: bold;">👉 {product} 최저가 & 혜택 확인하기</p></div>'
-                        content = content.replace("[[CTA_1]]", cta_html, 1)
-                        content = content.replace("[[CTA_2]]", cta_html, 1)
-                        content = re.sub(r'\[\[CTA_\d+\]\]', '', content)
-                        
-                        disclosure = get_ftc_text(url)
-                        
-                        final = f"""<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
-{disclosure}
-
-<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #000;">{title}</h1>
-
-{content}
-
-<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{data.get('hashtags', '')}</div>
-</div>"""
-                        
-                        st.session_state.naver_profit_content = final
-                        st.session_state.naver_profit_display = clean_all_tags(final)
-                    else:
-                        st.error("JSON 형식을 찾을 수 없습니다.")
-                except Exception as e:
-                    st.error(f"오류: {e}")
+            submit_generation("naver_profit", f"{keyword} · {product}", write_naver_profit, keyword, product, url)
+    
+    show_jobs("naver_profit")
     
-    if st.session_state.naver_profit_display:
+    show_recent("naver_profit")
+    post = fetch_post(st.session_state.get("naver_profit_post"))
+    if post:
         st.divider()
+        show_generation_timing(post)
+        show_candidates("naver_profit", post)
         st.subheader("📋 원고 확인")
-        st.text_area("내용 확인", value=st.session_state.naver_profit_display, height=500, key="naver_profit_display_area")
+        st.text_area("내용 확인", value=post['display'], height=500, key="naver_profit_display_area")
         
-        safe = st.session_state.naver_profit_content.replace("`", "\\`").replace("$", "\\$")
-        safe = re.sub(r'>\s*\n\s*<', '><', safe)
-        html_code = safe.replace("\n", "<br>")
-        
-        st.components.v1.html(f"""
-            <button onclick="copyRich()" style="width:100%; padding:20px; background:#111; color:#00FF7F; border:2px solid #00FF7F; border-radius:12px; font-weight:bold; cursor:pointer; font-size:18px;">
-                📋 네이버 블로그 서식 포함 복사
-            </button>
-            <script>
-            function copyRich() {{
-                const html = `{html_code}`;
-                const blob = new Blob([html], {{ type: "text/html" }});
-                const data = [new ClipboardItem({{ "text/html": blob }})];
-                navigator.clipboard.write(data).then(() => alert("✅ 복사 완료!"));
-            }}
-            </script>
-        """, height=100)
+        copy_button("naver_profit", post)
 
 # ==========================================
 # 4. 네이버 정보성
 # ==========================================
 
-NAVER_INFO_PERSONAS = [
-    {"role": "전문 칼럼니스트", "tone": "정중한 존댓말", "keywords": ["분석하면", "살펴보면", "알 수 있습니다"], "emoji": "📊 💡 ✅"},
-    {"role": "정보 큐레이터", "tone": "친절한 설명", "keywords": ["정리하면", "핵심은", "중요한 점은"], "emoji": "📌 ✏️ 💬"},
-    {"role": "업계 전문가", "tone": "전문적 존댓말", "keywords": ["실제로", "데이터상", "경험상"], "emoji": "🎓 📈 ⭐"}
-]
-
-def get_naver_info_h3(text):
-    """네이버 정보성 19px 소제목"""
-    styles = [
-        'border-left: 10px solid #2c5aa0; padding-left: 15px; border-bottom: 1px solid #eee; margin: 40px 0 20px 0;',
-        'border-top: 4px solid #2c5aa0; padding: 15px; border-bottom: 1px solid #eee; margin: 40px 0 20px 0;',
-        'display: inline-block; padding: 5px 15px; border: 2px solid #2c5aa0; color: #2c5aa0; border-radius: 20px; margin: 40px 0 20px 0; font-weight: bold;'
-    ]
-    return f"<h3 style='font-size:19px; font-weight:bold; color:#111; {random.choice(styles)}'>{text}</h3>"
-
-def generate_naver_info_prompt(keyword, facts, persona):
-    """네이버 정보성 프롬프트"""
-    return f"""
-당신은 {persona["role"]}입니다.
-
-[철칙]
-1. AI 인사말 금지 ("안녕하세요", "오늘은", "알아보겠습니다")
-2. 자기소개 금지
-3. 마무리 멘트 금지 ("결론", "마무리", "마치며")
-4. 날짜 노출 금지
-5. 마크다운 금지, <b>태그만 사용
-
-[작성 정보]
-- 키워드: {keyword}
-- 실시간 정보: {facts}
-- 말투: {persona["tone"]}
-- 자주 쓸 표현: {", ".join(persona["keywords"])}
-- 이모지: {persona["emoji"]} (본문에 자연스럽게)
-
-[글자수]
-정확히 1800~2400자
-
-[JSON 응답]
-{{
-    "title": "제목 (15-25자, {keyword} 포함)",
-    "content": "본문",
-    "hashtags": "7개"
-}}
-
-[구조]
-도입: 주제 소개 (이모지 포함)
-본문: 5개 소제목 [TITLE]제목[/TITLE]
-- 소제목마다 <b>태그</b>로 키워드 강조
-- 이모지 {persona["emoji"]} 자연스럽게 배치
-
-[필수 섹션]
-1. ✅ 체크리스트
-   <div style="background:#f8f9fa; padding:15px; border-left:4px solid #2c5aa0; margin:20px 0;">
-   <b>📋 핵심 체크리스트</b><br>
-   ☑️ 항목 1<br>
-   ☑️ 항목 2<br>
-   ☑️ 항목 3
-   </div>
-
-2. 📊 속성표
-   <table style="width:100%; border-collapse:collapse; margin:20px 0;">
-   <tr style="background:#f8f9fa;"><th style="border:1px solid #ddd; padding:10px;">항목</th><th style="border:1px solid #ddd; padding:10px;">내용</th></tr>
-   <tr><td style="border:1px solid #ddd; padding:10px;"><b>대상</b></td><td style="border:1px solid #ddd; padding:10px;">내용</td></tr>
-   </table>
-
-3. ❓ Q&A (3~5개)
-   <div style="margin:30px 0;">
-   <b style="color:#2c5aa0;">Q1. 질문?</b><br>
-   A1. 답변...<br><br>
-   <b style="color:#2c5aa0;">Q2. 질문?</b><br>
-   A2. 답변...
-   </div>
-
-[해시태그]
-7개 (이모지 없이)
-
-JSON만 출력하세요.
-"""
-
 def render_naver_info():
     """네이버 정보성 UI"""
     st.title("🟢 네이버 정보성 v16.2: 체크리스트 & Q&A")
     
-    if 'naver_info_content' not in st.session_state: 
-        st.session_state.naver_info_content = ""
-    if 'naver_info_display' not in st.session_state: 
-        st.session_state.naver_info_display = ""
-    
     keyword = st.text_input("💎 키워드", key="naver_info_kw", placeholder="예: 건강보험 환급 방법")
     
     if st.button("🚀 전문 칼럼 생성", key="naver_info_btn"):
         if not keyword:
             st.warning("⚠️ 키워드를 입력해주세요.")
         else:
-            with st.spinner('전문가 페르소나 접속 중...'):
-                try:
-                    persona = random.choice(NAVER_INFO_PERSONAS)
-                    facts = hunt_realtime_info(keyword)
-                    prompt = generate_naver_info_prompt(keyword, facts, persona)
-                    
-                    st.info(f"🎭 페르소나: {persona['role']}")
-                    
-                    response = model.generate_content(prompt)
-                    raw_text = response.text
-                    
-                    json_match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-                    if json_match:
-                        data = json.loads(json_match.group())
-                        title = data.get('title', f'{keyword} 완전 정리')
-                        content = data.get('content', '')
-                        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', lambda m: get_naver_info_h3(m.group(1)), content)
-                        
-                        final = f"""<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
-<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #2c5aa0;">{title}</h1>
-
-{content}
-
-<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{data.get('hashtags', '')}</div>
-</div>"""
-                        
-                        st.session_state.naver_info_content = final
-                        st.session_state.naver_info_display = clean_all_tags(final)
-                    else:
-                        st.error("JSON 형식을 찾을 수 없습니다.")
-                except Exception as e:
-                    st.error(f"오류: {e}")
+            submit_generation("naver_info", keyword, write_naver_info, keyword)
+    
+    show_jobs("naver_info")
     
-    if st.session_state.naver_info_display:
+    show_recent("naver_info")
+    post = fetch_post(st.session_state.get("naver_info_post"))
+    if post:
         st.divider()
+        show_generation_timing(post)
         st.subheader("📋 원고 확인")
-        st.text_area("내용 확인", value=st.session_state.naver_info_display, height=500, key="naver_info_display_area")
-        
-        safe = st.session_state.naver_info_content.replace("`", "\\`").replace("$", "\\$")
-        safe = re.sub(r'>\s*\n\s*<', '><', safe)
-        html_code = safe.replace("\n", "<br>")
+        st.text_area("내용 확인", value=post['display'], height=500, key="naver_info_display_area")
         
-        st.components.v1.html(f"""
-            <button onclick="copyRich()" style="width:100%; padding:20px; background:#03cf5d; color:white; border:none; border-radius:12px; font-weight:bold; cursor:pointer; font-size:18px;">
-                🟢 전문가 칼럼 복사하기
-            </button>
-            <script>
-            function copyRich() {{
-                const html = `{html_code}`;
-                const blob = new Blob([html], {{ type: "text/html" }});
-                const data = [new ClipboardItem({{ "text/html": blob }})];
-                navigator.clipboard.write(data).then(() => alert("✅ 복사 완료!"));
-            }}
-            </script>
-        """, height=100)
+        copy_button("naver_info", post)
 
 # ==========================================
 # 5. 티스토리 정보성 (p.py 재작성)
 # ==========================================
 
-TISTORY_INFO_PERSONAS = [
-    {"role": "트렌드 분석가", "tone": "세련된 존댓말", "keywords": ["주목할 점은", "흥미로운 것은", "특징적인"], "emoji": "📊 💡 ✨"},
-    {"role": "콘텐츠 큐레이터", "tone": "친근한 존댓말", "keywords": ["정리하면", "핵심은", "중요한 건"], "emoji": "📌 ✏️ 💬"},
-    {"role": "정보 전문가", "tone": "전문적 존댓말", "keywords": ["분석하면", "데이터상", "실제로"], "emoji": "🎓 📈 ⭐"}
-]
-
-def get_tistory_info_h3():
-    """티스토리 정보성 화려한 소제목"""
-    color = "#{:06x}".format(random.randint(0, 0x777777))
-    styles = [
-        f'border-left: 15px solid {color}; padding: 10px 15px; background: #f8f9fa; font-weight: bold; margin: 40px 0 20px 0;',
-        f'background: linear-gradient(to right, {color}, transparent); padding: 12px 20px; border-radius: 5px; margin: 40px 0 20px 0;',
-        f'border: 2px solid {color}; padding: 15px; border-left: 10px solid {color}; border-radius: 0 10px 10px 0; margin: 40px 0 20px 0;'
-    ]
-    return random.choice(styles)
-
-def generate_tistory_info_prompt(keyword, facts, persona):
-    """티스토리 정보성 프롬프트 - 주제 이탈 방지"""
-    return f"""
-당신은 {keyword}에 대한 {persona["role"]}입니다.
-
-[절대 규칙 - 매우 중요!]
-1. 🚫 {keyword} 주제에서 절대 벗어나지 마세요
-2. 🚫 관련 없는 경제/투자/전략 이야기 금지
-3. 🚫 억지로 미래 예측이나 분석 넣지 마세요
-4. 🚫 글자수 채우려고 이상한 내용 추가 금지
-5. 🚫 AI 인사말/자기소개/마무리 멘트 금지
-6. 🚫 날짜 노출 금지
-7. 마크다운 금지, HTML만 사용
-
-[작성 정보]
-- 주제: {keyword} (이 주제만 다루세요!)
-- 실시간 정보: {facts}
-- 말투: {persona["tone"]}
-- 자주 쓸 표현: {", ".join(persona["keywords"])}
-- 이모지: {persona["emoji"]} (본문에 자연스럽게)
-
-[글자수]
-정확히 1800~2400자
-(주제 관련 내용으로만! 글자수 채우려고 주제 벗어나지 마세요)
-
-[JSON 응답]
-{{
-    "title": "제목 (15-25자, {keyword} 포함)",
-    "content": "본문",
-    "hashtags": "7개"
-}}
-
-[작성 방향]
-- {keyword}의 핵심만 집중적으로 다루세요
-- 구체적 사실과 정보 위주로 작성
-- 독자가 {keyword}에 대해 궁금해할 내용만
-- 주제와 관련 없으면 절대 쓰지 마세요
-
-[구조]
-도입: {keyword} 관련 후킹 (이모지 포함)
-본문: 5개 소제목 [TITLE]제목[/TITLE]
-- {keyword}와 직접 관련된 내용만
-- <b>태그</b>로 키워드 강조
-- 이모지 자연스럽게
-
-[필수 요소]
-✅ {keyword}에 대한 구체적 정보
-✅ 실용적인 내용
-✅ 독자가 바로 적용할 수 있는 것
-❌ 관련 없는 경제/투자 이야기
-❌ 억지 예측이나 전망
-❌ 주제 벗어난 내용
-
-[해시태그]
-{keyword} 관련 7개 (이모지 없이)
-
-JSON만 출력하세요.
-"""
-
 def render_tistory_info():
     """티스토리 정보성 UI"""
     st.title("🟠 티스토리 정보성: 주제 집중 모드")
     st.markdown("<p style='color:#666;'>주제에서 절대 벗어나지 않는 고품질 정보 콘텐츠</p>", unsafe_allow_html=True)
     
-    if 'tistory_info_content' not in st.session_state: 
-        st.session_state.tistory_info_content = ""
-    if 'tistory_info_display' not in st.session_state: 
-        st.session_state.tistory_info_display = ""
-    
     keyword = st.text_input("💎 키워드", key="tistory_info_kw", placeholder="예: 연예인 은퇴 선언")
     
     if st.button("🚀 고품질 콘텐츠 생성", key="tistory_info_btn"):
         if not keyword:
             st.warning("⚠️ 키워드를 입력해주세요.")
         else:
-            with st.spinner('전문가 페르소나 접속 중...'):
-                try:
-                    persona = random.choice(TISTORY_INFO_PERSONAS)
-                    facts = hunt_realtime_info(keyword)
-                    prompt = generate_tistory_info_prompt(keyword, facts, persona)
-                    
-                    st.info(f"🎭 페르소나: {persona['role']}")
-                    
-                    response = model.generate_content(prompt)
-                    raw_text = response.text
-                    
-                    json_match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-                    if json_match:
-                        data = json.loads(json_match.group())
-                        title = data.get('title', f'{keyword} 완전 분석')
-                        content = data.get('content', '')
-                        
-                        def replace_h3(match):
-                            style = get_tistory_info_h3()
-                            return f"<h3 style='{style}'>{match.group(1)}</h3>"
-                        
-                        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', replace_h3, content)
-                        
-                        final = f"""<div style="font-family: 'Noto Sans KR', sans-serif; font-size: 16px; line-height: 1.8; color: #333; max-width: 800px; margin: auto;">
-<h1 style="font-size: 32px; font-weight: bold; color: #222; margin: 30px 0; text-align: center;">{title}</h1>
-
-<div style="padding: 15px; background: #f1f3f5; border-radius: 8px; margin: 20px 0;">
-<b style="color: #495057;">💡 핵심 요약:</b> {keyword}에 대한 심층 분석
-</div>
-
-{content}
-
-<div style="margin-top: 40px; padding-top: 20px; border-top: 2px solid #dee2e6; color: #6c757d; font-size: 14px;">{data.get('hashtags', '')}</div>
-</div>"""
-                        
-                        st.session_state.tistory_info_content = final
-                        st.session_state.tistory_info_display = clean_all_tags(final)
-                    else:
-                        st.error("JSON 형식을 찾을 수 없습니다.")
-                except Exception as e:
-                    st.error(f"오류: {e}")
+            submit_generation("tistory_info", keyword, write_tistory_info, keyword)
+    
+    show_jobs("tistory_info")
     
-    if st.session_state.tistory_info_display:
+    show_recent("tistory_info")
+    post = fetch_post(st.session_state.get("tistory_info_post"))
+    if post:
         st.divider()
+        show_generation_timing(post)
         st.subheader("📋 원고 확인")
-        st.text_area("내용 확인", value=st.session_state.tistory_info_display, height=500, key="tistory_info_display_area")
-        
-        safe = st.session_state.tistory_info_content.replace("`", "\\`").replace("$", "\\$")
-        html_code = safe.replace("\n", "")
+        st.text_area("내용 확인", value=post['display'], height=500, key="tistory_info_display_area")
         
-        st.components.v1.html(f"""
-            <button onclick="copyRich()" style="width:100%; padding:20px; background:#FF6B35; color:white; border:none; border-radius:12px; font-weight:bold; cursor:pointer; font-size:18px;">
-                🟠 티스토리 HTML 복사하기
-            </button>
-            <script>
-            function copyRich() {{
-                const html = `{html_code}`;
-                const blob = new Blob([html], {{ type: "text/html" }});
-                const data = [new ClipboardItem({{ "text/html": blob }})];
-                navigator.clipboard.write(data).then(() => alert("✅ 복사 완료! 티스토리 HTML 모드에 붙여넣기 하세요"));
-            }}
-            </script>
-        """, height=100)
+        copy_button("tistory_info", post)
+
+# ==========================================
+# 5-1. 전체 플랫폼 동시 생성
+# ==========================================
+
+def render_fanout():
+    """키워드 하나로 네이버 수익형/정보성 + 티스토리 정보성을 한 번에 생성하는 UI"""
+    st.title("🚀 전체 플랫폼 동시 생성")
+    st.markdown("<p style='color:#666;'>검색은 한 번만 하고 플랫폼별 원고를 동시에 생성합니다. 상품명·링크를 비우면 정보성 원고만 만듭니다.</p>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        keyword = st.text_input("💎 키워드", key="fanout_kw", placeholder="예: 무선 청소기 추천")
+        product = st.text_input("📦 상품명 (선택)", key="fanout_prod", placeholder="예: 다이슨 V15")
+    with col2:
+        url = st.text_input("🔗 제휴 링크 (선택)", key="fanout_url", placeholder="http://...")
+    
+    if st.button("🚀 전체 원고 동시 생성", key="fanout_btn"):
+        if not keyword:
+            st.warning("⚠️ 키워드를 입력해주세요.")
+        elif bool(product) != bool(url):
+            st.warning("⚠️ 수익형까지 만들려면 상품명과 제휴 링크를 모두 입력해주세요.")
+        else:
+            submit_generation("fanout", f"{keyword} · 전체", write_all_platforms, keyword, product, url)
+    
+    show_jobs("fanout")
+    
+    result = fetch_post(st.session_state.get("fanout_post"))
+    if not result:
+        return
+    st.divider()
+    slowest = max((p['elapsed'] for p in result['posts'].values()), default=0)
+    st.caption(f"⏱️ 전체 {result['elapsed']:.2f}초 · 가장 느린 생성 {slowest:.2f}초 (시드 {result['seed']})")
+    for platform, error in result['errors'].items():
+        st.error(f"❌ {BATCH_MODES[platform]} 생성 실패: {error}")
+    columns = st.columns(len(result['posts'])) if result['posts'] else []
+    for column, (platform, post) in zip(columns, result['posts'].items()):
+        with column:
+            st.subheader(BATCH_MODES[platform])
+            show_generation_timing(post)
+            st.text_area("내용 확인", value=post['display'], height=500, key=f"fanout_{platform}_display_area")
+            copy_button(platform, post)
 
 # ==========================================
 # 6. 티스토리 수익형 (기존 유지)
@@ -697,7 +519,126 @@ def render_tistory_profit():
     """, language="python")
 
 # ==========================================
-# 7. 메인 UI
+# 7. 대량 생성 (키워드 시트 배치)
+# ==========================================
+
+BATCH_COLUMNS = {"키워드": "keyword", "상품명": "product", "제품": "product", "링크": "url", "제휴 링크": "url", "모드": "mode", "시드": "seed"}
+
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+
+def load_keyword_sheet(uploaded_file):
+    """업로드된 CSV/XLSX 시트를 행 목록으로 변환"""
+    if uploaded_file.name.lower().endswith(".csv"):
+        df = pd.read_csv(uploaded_file, dtype=str, encoding="utf-8-sig")
+    else:
+        df = pd.read_excel(uploaded_file, dtype=str, engine="openpyxl")
+    
+    df = df.rename(columns=lambda c: BATCH_COLUMNS.get(str(c).strip(), str(c).strip().lower()))
+    if "keyword" not in df.columns:
+        raise ValueError("키워드(keyword) 컬럼이 필요합니다.")
+    for col in ("product", "url", "mode", "seed"):
+        if col not in df.columns:
+            df[col] = ""
+    df = df.fillna("")
+    df = df[df["keyword"].str.strip() != ""]
+    # seed: 이전 배치 결과 시트를 다시 올리면 같은 프롬프트 → 저장된 응답 재생
+    return df[["keyword", "product", "url", "mode", "seed"]].to_dict("records")
+
+def batch_results_to_xlsx(results):
+    """배치 결과를 XLSX 바이트로 변환"""
+    buf = io.BytesIO()
+    # 원고 HTML이 수식/링크로 변환되지 않도록 문자열 그대로 기록
+    options = {"strings_to_formulas": False, "strings_to_urls": False}
+    with pd.ExcelWriter(buf, engine="xlsxwriter", engine_kwargs={"options": options}) as writer:
+        pd.DataFrame(results).to_excel(writer, index=False, sheet_name="results")
+    return buf.getvalue()
+
+# 배치 결과 표 컬럼 (세션/작업에는 이 요약과 원고 ID만 두고, 본문이 든 전체 행은 저장소에)
+BATCH_COLUMNS = ["keyword", "mode", "status", "title", "persona", "score", "chars", "search_keyword", "seed", "cached", "elapsed", "error"]
+
+def store_batch_results(owner, results):
+    """배치 결과 행을 저장소에 넣고 표에 쓸 요약 + 원고 ID(id)만 반환
+
+    세션 최근 원고 한도에 밀리지 않도록 배치 행은 세션과 별도 묶음(owner:batch)으로 저장
+    """
+    ids = article_store.save_many(f"{owner}:batch", "batch", results)
+    return [dict({col: r.get(col, "") for col in BATCH_COLUMNS}, id=article_id) for r, article_id in zip(results, ids)]
+
+def fetch_batch_rows(results):
+    """요약 행 → 저장소의 전체 행 (LRU로 지워진 행은 요약 그대로)"""
+    rows = article_store.get_many([r["id"] for r in results])
+    return [row or r for row, r in zip(rows, results)]
+
+def load_batch_result(prefix, job):
+    """끝난 배치 작업의 결과 표를 화면에 불러옴"""
+    st.session_state.batch_results = job.result['results']
+    st.session_state.batch_elapsed = job.result['elapsed']
+
+def render_batch():
+    """대량 생성 UI"""
+    st.title("📦 대량 생성: 키워드 시트 배치")
+    st.markdown("<p style='color:#666;'>keyword / product / url / mode 컬럼의 CSV·XLSX를 올리면 여러 원고를 동시에 생성합니다.</p>", unsafe_allow_html=True)
+    
+    if 'batch_results' not in st.session_state:
+        st.session_state.batch_results = []
+    
+    uploaded = st.file_uploader("📄 키워드 시트 (CSV/XLSX)", type=["csv", "xlsx"], key="batch_file")
+    workers = st.slider("⚙️ 동시 작업 수", 1, BATCH_MAX_WORKERS, min(4, BATCH_MAX_WORKERS), key="batch_workers")
+    shared_search = st.checkbox("🔗 비슷한 키워드끼리 검색 1번 나눠 쓰기 (검색 횟수 절약)", value=BATCH_SHARED_SEARCH, key="batch_shared_search")
+    st.caption(f"모드 값: {', '.join(f'{k} ({v})' for k, v in BATCH_MODES.items())} · 비워두면 상품/링크 유무로 자동 선택 · 결과 시트의 seed 컬럼을 그대로 두고 다시 올리면 저장된 응답을 재생합니다")
+    
+    if st.button("🚀 일괄 생성 시작", key="batch_btn"):
+        if not uploaded:
+            st.warning("⚠️ 키워드 시트를 업로드해주세요.")
+        else:
+            try:
+                rows = load_keyword_sheet(uploaded)
+            except Exception as e:
+                st.error(f"오류: {e}")
+                rows = []
+            
+            if rows:
+                # 배치 전체를 작업 하나로 제출 (스크립트 스레드를 막지 않으므로 진행 중에도 다른 화면 사용 가능)
+                options = {"use_cache": not st.session_state.search_fresh, "use_llm_cache": not st.session_state.llm_fresh, "shared_search": shared_search}
+                owner = session_owner()
+                
+                def run(job):
+                    job.set_stage("generating")
+                    job.set_progress(0, len(rows))
+                    
+                    def on_progress(done, total, result):
+                        mark = "✅" if result["status"] == "ok" else "❌"
+                        job.set_progress(done, total, f"- {mark} {result['keyword']} ({result['elapsed']}초) {result['error']}")
+                    
+                    started = time.perf_counter()
+                    results = run_batch(rows, workers, on_progress, **options)
+                    return {"results": store_batch_results(owner, results), "elapsed": time.perf_counter() - started}
+                
+                submit_job("batch", f"{uploaded.name} · {len(rows)}건", run)
+    
+    show_jobs("batch", load_batch_result)
+    
+    if st.session_state.batch_results:
+        st.divider()
+        st.subheader("📋 배치 결과")
+        results = st.session_state.batch_results
+        elapsed = st.session_state.get("batch_elapsed") or 0.0
+        ok = sum(1 for r in results if r["status"] == "ok")
+        st.success(f"✅ {ok}/{len(results)}건 성공 · {elapsed:.1f}초" + (f" · 분당 {len(results) / elapsed * 60:.1f}건" if elapsed else ""))
+        shared_rows, searches = shared_search_savings(results)
+        if shared_rows:
+            st.caption(f"🔗 검색 공유: {shared_rows}건을 검색 {searches}회로 처리 ({shared_rows - searches}회 절약)")
+        st.dataframe(pd.DataFrame(results)[BATCH_COLUMNS], use_container_width=True)
+        st.download_button(
+            "📥 결과 XLSX 다운로드",
+            data=batch_results_to_xlsx(fetch_batch_rows(results)),
+            file_name=f"ghost_hub_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            key="batch_download"
+        )
+
+# ==========================================
+# 8. 메인 UI
 # ==========================================
 
 st.set_page_config(page_title="GHOST HUB", layout="wide", initial_sidebar_state="expanded")
@@ -711,11 +652,61 @@ mode = st.sidebar.radio(
         "🟢 네이버 수익형 (FOMO)",
         "🟢 네이버 정보성 (체크리스트)",
         "🟠 티스토리 정보성 (주제집중)",
-        "🟠 티스토리 수익형 (기존파일)"
+        "🚀 전체 플랫폼 동시 생성",
+        "🟠 티스토리 수익형 (기존파일)",
+        "📦 대량 생성 (시트 배치)"
     ],
     index=0
 )
 
+st.sidebar.markdown("---")
+st.sidebar.checkbox("🔄 검색 캐시 무시 (새로 검색)", key="search_fresh", value=False)
+st.sidebar.toggle("⚡ 스트리밍 생성 (실시간 미리보기)", key="stream_mode", value=True)
+st.sidebar.checkbox("🧠 LLM 응답 새로 생성 (캐시 무시)", key="llm_fresh", value=False)
+st.sidebar.checkbox("🎲 직전 페르소나·구조 재사용 (저장된 응답 재생)", key="reuse_seed", value=False)
+cache_stats = search_cache_stats()
+st.sidebar.caption(f"🗄️ 검색 캐시: 히트 {cache_stats['hits']} · 미스 {cache_stats['misses']} · 저장 {cache_stats['size']}/{cache_stats['max_entries']}건 (TTL {cache_stats['ttl']}초)")
+dedup = search_dedup_stats()
+if dedup['snippets']:
+    st.sidebar.caption(f"🧹 중복 스니펫: {dedup['snippets']}건 중 {dedup['dropped']}건 제거 · {dedup['dropped_chars']:,}자 절약")
+length_stats = length_fix_stats()
+if length_stats['articles']:
+    st.sidebar.caption(f"📐 글자수 보정: {length_stats['articles']}건 · {length_stats['rounds']}회 · 토큰 {length_stats['tokens']:,} (전체 재생성 추정 {length_stats['full_tokens']:,})")
+for streamed, label in ((True, "스트리밍"), (False, "일반")):
+    runs = [t for t in st.session_state.get('gen_timings', []) if t['streamed'] == streamed]
+    if runs:
+        st.sidebar.caption(f"⏱️ {label}: 평균 첫 토큰 {sum(t['ttft'] for t in runs) / len(runs):.2f}초 · 전체 {sum(t['elapsed'] for t in runs) / len(runs):.2f}초 ({len(runs)}회)")
+if runtime_stats["cold_start"]:
+    cold = runtime_stats["cold_start"]
+    reruns = sorted(r["total_ms"] for r in runtime_stats["reruns"])
+    rerun_text = f" · 리런 중앙값 {reruns[len(reruns) // 2]:.0f}ms ({len(reruns)}회)" if reruns else ""
+    st.sidebar.caption(f"🧊 콜드 스타트 {cold['total_ms']:.0f}ms (준비 {cold['setup_ms']:.0f}ms){rerun_text}")
+llm_stats = get_llm_cache().stats()
+st.sidebar.caption(f"🧠 LLM 캐시: 히트 {llm_stats['hits']} · 미스 {llm_stats['misses']} · 절약 토큰 {llm_stats['tokens_saved']:,} · 저장 {llm_stats['size']}건")
+store_stats = article_store.stats()
+st.sidebar.caption(f"📚 원고 저장소: {store_stats['size']}/{store_stats['max_total']}건 · {store_stats['bytes'] / 1024 / 1024:.1f}MB (세션당 {store_stats['max_per_session']}건, 제거 {store_stats['evicted']}건)")
+job_stats = job_executor.stats()
+st.sidebar.caption(f"🧵 생성 작업: 실행 {job_stats['running']}/{job_stats['workers']} · 대기 {job_stats['queued']}건 (사용자 {job_stats['owners']}명)")
+guard = search_guard_status()
+st.sidebar.caption(f"🚦 검색 속도 제한: 토큰 {guard['tokens']}/{guard['capacity']} · 브레이커 {guard['breaker']}" + (f" (재시도 {guard['retry_in']}초 후)" if guard['breaker'] == "open" else ""))
+if guard['clients']:
+    c = guard['clients']
+    st.sidebar.caption(f"🔌 검색 클라이언트: 사용 {c['in_use']}/{c['size']} · 생성 {c['created']} · 재사용 {c['reused']} · 교체 {c['recycled']}")
+pool_stats = model_pool_stats()
+if pool_stats:
+    with st.sidebar.expander(f"🔑 Gemini 키 {len(pool_stats['keys'])}개"):
+        for k in pool_stats['keys']:
+            state = "정상" if k['healthy'] else f"쉬는 중 {k['cooldown']:.0f}초"
+            errors = f" · 429 {k['quota_errors']} · 5xx {k['server_errors']}" if k['failures'] else ""
+            st.caption(f"`{k['key']}` {k['masked']} {state} · 진행 {k['inflight']} · 분당 {k['rpm_used']} · 누적 {k['requests']}회{errors}")
+        st.caption("모델별 성공: " + " · ".join(f"{name} {count}" for name, count in pool_stats['models'].items()))
+trace_stats = tracing.stats()
+if trace_stats:
+    with st.sidebar.expander("📈 단계별 지연 (최근 p50 / p95)"):
+        for name, s in trace_stats.items():
+            failed = f" · 실패 {s['errors']}" if s['errors'] else ""
+            st.caption(f"`{name}` {s['p50_ms']:.0f} / {s['p95_ms']:.0f}ms ({s['count']}회{failed})")
+
 st.sidebar.markdown("---")
 st.sidebar.markdown("""
 ### 📊 모드별 특징
@@ -723,6 +714,7 @@ st.sidebar.markdown("""
 **🟢 네이버 수익형**
 - FOMO 극대화
 - 페르소나 5개 랜덤
+- 후보 여러 개 중 최고 점수 선택
 - CTA 2개
 - 나눔고딕 15px
 
@@ -738,10 +730,20 @@ st.sidebar.markdown("""
 - 그라데이션
 - 고품질 콘텐츠
 
+**🚀 전체 플랫폼 동시 생성**
+- 검색 1회 공유
+- 플랫폼별 동시 생성
+- 결과 나란히 비교
+
 **🟠 티스토리 수익형**
 - 기존 t정보.py 사용
 - 애니메이션 CTA
 - 깜빡이는 효과
+
+**📦 대량 생성**
+- CSV/XLSX 키워드 시트
+- 동시 작업 수 조절
+- 결과 XLSX 다운로드
 """)
 
 # 모드에 따라 렌더링
@@ -751,5 +753,25 @@ elif mode == "🟢 네이버 정보성 (체크리스트)":
     render_naver_info()
 elif mode == "🟠 티스토리 정보성 (주제집중)":
     render_tistory_info()
+elif mode == "🚀 전체 플랫폼 동시 생성":
+    render_fanout()
+elif mode == "📦 대량 생성 (시트 배치)":
+    render_batch()
+else:
+    render_tistory_profit()
+
+# 실행 비용 기록 (프로세스 첫 실행 = 콜드 스타트, 이후 = 리런)
+_run_cost = {
+    "setup_ms": (_SETUP_DONE - _SCRIPT_STARTED) * 1000,
+    "total_ms": (time.perf_counter() - _SCRIPT_STARTED) * 1000
+}
+if runtime_stats["cold_start"] is None:
+    runtime_stats["cold_start"] = _run_cost
 else:
-    render_tistory_profit()
\ No newline at end of file
+    runtime_stats["reruns"].append(_run_cost)
+
+# 끝까지 렌더된 실행에서 보낸 복사 본문만 브라우저에 저장된 것으로 표시
+clipboard_sent = st.session_state.setdefault("clipboard_sent", deque(maxlen=50))
+for digest in _clipboard_pending:
+    if digest not in clipboard_sent:
+        clipboard_sent.append(digest)
\ No newline at end of file
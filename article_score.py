@@ -0,0 +1,75 @@
+# 생성된 원고를 모델 호출 없이 채점하는 모듈입니다. (여러 후보 중 가장 좋은 원고 고르기용)
+# 프롬프트가 요구하는 조건 — 글자수 1800~2400자, 철칙 금지 문구, 제목의 키워드, CTA 마커 — 을
+# 얼마나 지켰는지 점수(0~100)와 항목별 결과로 돌려줍니다.
+
+import re
+
+from phrase_guard import DEFAULT_STYLE, MATCHER, MATCHERS, find_violations
+
+# 프롬프트의 [글자수] 조건 (본문 미리보기 텍스트 기준)
+TARGET_CHARS = (1800, 2400)
+
+_MARKER = re.compile(r'\[TITLE\]|\[/TITLE\]|\[\[CTA_\d+\]\]')
+_CTA = re.compile(r'\[\[CTA_(\d+)\]\]')
+_TAG = re.compile(r'<[^>]*>')
+_SPACE = re.compile(r'\s+')
+
+# 항목별 배점 (합계 100)
+WEIGHTS = {"length": 40, "banned": 30, "title_keyword": 15, "cta": 15}
+# 금지 문구 1건당 감점 비율 (banned 배점 대비)
+BANNED_PENALTY = 0.25
+
+
+def body_text(content):
+    """본문(마커/태그 포함) → 글자수를 셀 미리보기 텍스트 (공백은 한 칸으로)"""
+    text = _TAG.sub('', _MARKER.sub('', content or ''))
+    text = text.replace("**", "").replace("__", "").replace("*", "")
+    return _SPACE.sub(' ', text).strip()
+
+
+def banned_hits(text, style=DEFAULT_STYLE, keyword=None):
+    """스타일의 금지 문구/날짜 → [(분류, 문구, 횟수)] (처음 나온 순서, 키워드 안의 표현은 제외)"""
+    counts = {}
+    for _, _, phrase, category in find_violations(text, MATCHERS.get(style, MATCHER), keyword):
+        counts[(category, phrase)] = counts.get((category, phrase), 0) + 1
+    return [(category, phrase, count) for (category, phrase), count in counts.items()]
+
+
+def score_article(keyword, data, cta=("1", "2"), target=TARGET_CHARS, style=DEFAULT_STYLE):
+    """모델 JSON(dict) → {"score", "chars", "banned", "title_keyword", "cta_missing"}
+
+    - 길이: 범위 안이면 만점, 벗어난 글자수만큼 비례 감점 (범위 폭만큼 벗어나면 0점)
+    - 금지 문구: 스타일(프롬프트)의 철칙 기준으로 1건마다 감점 (제목 + 본문, 키워드 안의 표현은 제외)
+    - 제목 키워드: 띄어쓰기를 무시하고 포함 여부
+    - CTA: cta에 적힌 마커가 본문에 모두 있는지 (정보성처럼 CTA가 없는 글은 cta=())
+    """
+    title = data.get('title', '')
+    content = data.get('content', '')
+    text = body_text(content)
+    chars = len(text)
+
+    low, high = target
+    off = max(low - chars, chars - high, 0)
+    length_ratio = max(0.0, 1 - off / (high - low))
+
+    hits = banned_hits(f"{title}\n{text}", style, keyword)
+    banned_ratio = max(0.0, 1 - BANNED_PENALTY * sum(count for _, _, count in hits))
+
+    title_keyword = _SPACE.sub('', keyword) in _SPACE.sub('', title)
+    found = set(_CTA.findall(content))
+    cta_missing = [c for c in cta if c not in found]
+    cta_ratio = 1 - len(cta_missing) / len(cta) if cta else 1.0
+
+    score = (
+        WEIGHTS["length"] * length_ratio
+        + WEIGHTS["banned"] * banned_ratio
+        + WEIGHTS["title_keyword"] * title_keyword
+        + WEIGHTS["cta"] * cta_ratio
+    )
+    return {
+        "score": round(score, 1),
+        "chars": chars,
+        "banned": hits,
+        "title_keyword": title_keyword,
+        "cta_missing": cta_missing
+    }
@@ -0,0 +1,143 @@
+# 생성된 원고를 세션 메모리 대신 SQLite에 보관하는 저장소입니다.
+# 세션(st.session_state)에는 원고 ID만 두고, 본문은 필요할 때 꺼내 씁니다.
+# 세션별 / 전체 최대 개수와 전체 용량을 넘으면 가장 오래 사용하지 않은 원고(LRU)부터 지웁니다.
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+
+class ArticleStore:
+    def __init__(self, path, max_total=2000, max_per_session=30, max_bytes=None):
+        self.path = path
+        self.max_total = max_total
+        self.max_per_session = max_per_session
+        self.max_bytes = max_bytes
+        self.evicted = 0
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # 스레드 간 연결 공유 (모든 접근은 self._lock으로 직렬화)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "id TEXT PRIMARY KEY, session TEXT NOT NULL, mode TEXT NOT NULL, keyword TEXT NOT NULL, "
+                "title TEXT NOT NULL, score REAL, size INTEGER NOT NULL, post TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            # 최근 목록(모드/키워드/세션별)과 LRU 제거용 색인
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_mode ON articles(mode, keyword, created)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_session ON articles(session, mode, created)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_accessed ON articles(accessed)")
+
+    def save(self, session, mode, keyword, post):
+        """원고 저장 → 원고 ID (저장 후 세션/전체 한도를 넘으면 LRU 순서로 제거)"""
+        now = time.time()
+        with self._lock, self._conn:
+            article_id = self._insert(session, mode, keyword, post, now)
+            self._evict(session)
+        return article_id
+
+    def save_many(self, session, mode, posts):
+        """원고 여러 건을 한 번에 저장 → 입력 순서대로 원고 ID 목록 (키워드는 각 원고의 keyword)
+
+        배치 결과처럼 한꺼번에 들어온 원고는 세션 한도보다 많아도 이번 묶음은 모두 남김 (전체 개수/용량 한도는 그대로)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            ids = [self._insert(session, mode, post.get('keyword', ''), post, now) for post in posts]
+            self._evict(session, keep=len(ids))
+        return ids
+
+    def _insert(self, session, mode, keyword, post, now):
+        """원고 1건 INSERT → 원고 ID (호출 측에서 잠금)"""
+        article_id = uuid.uuid4().hex[:16]
+        value = json.dumps(post, ensure_ascii=False)
+        quality = post.get('quality') or {}
+        self._conn.execute(
+            "INSERT INTO articles (id, session, mode, keyword, title, score, size, post, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (article_id, session, mode, keyword, post.get('title', ''), quality.get('score'), len(value.encode('utf-8')), value, now, now)
+        )
+        return article_id
+
+    def get(self, article_id):
+        """저장된 원고 (없거나 제거됐으면 None), 조회된 원고는 최근 사용 시각 갱신"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT post FROM articles WHERE id = ?", (article_id,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE articles SET accessed = ? WHERE id = ?", (time.time(), article_id))
+        return json.loads(row[0])
+
+    def get_many(self, article_ids):
+        """get을 여러 건 한 번에 → 입력 순서대로 원고 목록 (없는 원고는 None)"""
+        if not article_ids:
+            return []
+        marks = ", ".join("?" * len(article_ids))
+        with self._lock, self._conn:
+            rows = dict(self._conn.execute(f"SELECT id, post FROM articles WHERE id IN ({marks})", article_ids).fetchall())
+            self._conn.execute(f"UPDATE articles SET accessed = ? WHERE id IN ({marks})", (time.time(), *article_ids))
+        return [json.loads(rows[i]) if i in rows else None for i in article_ids]
+
+    def recent(self, mode=None, keyword=None, session=None, limit=20):
+        """최근 원고 목록 (본문 제외) → [{"id", "mode", "keyword", "title", "score", "created"}]"""
+        where, params = [], []
+        for column, value in (("session", session), ("mode", mode), ("keyword", keyword)):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT id, mode, keyword, title, score, created FROM articles"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [dict(zip(("id", "mode", "keyword", "title", "score", "created"), row)) for row in rows]
+
+    def _evict(self, session, keep=0):
+        """세션 한도 → 전체 개수 → 전체 용량 순으로 오래 안 쓴 원고 제거 (호출 측에서 잠금)
+
+        keep: 세션 한도보다 많아도 남길 최근 원고 수 (방금 한꺼번에 저장한 원고)
+        """
+        before = self._conn.total_changes
+        self._conn.execute(
+            "DELETE FROM articles WHERE id IN (SELECT id FROM articles WHERE session = ? ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (session, max(self.max_per_session, keep))
+        )
+        self._conn.execute(
+            "DELETE FROM articles WHERE id IN (SELECT id FROM articles ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_total,)
+        )
+        if self.max_bytes:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+            if total > self.max_bytes:
+                doomed = []
+                for article_id, size in self._conn.execute("SELECT id, size FROM articles ORDER BY accessed ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((article_id,))
+                    total -= size
+                self._conn.executemany("DELETE FROM articles WHERE id = ?", doomed)
+        self.evicted += self._conn.total_changes - before
+
+    def stats(self):
+        """현재 개수/용량과 한도, 지금까지 제거한 원고 수"""
+        with self._lock:
+            size, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM articles").fetchone()
+        return {
+            "size": size,
+            "bytes": total,
+            "evicted": self.evicted,
+            "max_total": self.max_total,
+            "max_per_session": self.max_per_session,
+            "max_bytes": self.max_bytes
+        }
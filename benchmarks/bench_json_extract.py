@@ -0,0 +1,139 @@
+# 모델 응답 JSON 추출 벤치마크
+# 기존 방식(re.search(r'\{.*\}') + json.loads)과 json_extract 추출기를
+# 정상/손상 응답 코퍼스에서 비교해 파싱 시간과 복구율을 출력합니다.
+#
+# 사용법: python benchmarks/bench_json_extract.py [--corpus 실제응답폴더] [--repeat 20] [--json]
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_extract import extract_json
+
+SECTIONS = ["개인 경험담", "문제 발견", "제품 만남", "사용 과정", "결과/변화"]
+
+
+def make_response(rng, length=2400):
+    """실제 응답과 비슷한 모양의 JSON 원고 생성"""
+    body = []
+    for name in SECTIONS:
+        body.append(f"[TITLE]{name}[/TITLE]")
+        while sum(len(p) for p in body) < length * (SECTIONS.index(name) + 1) / len(SECTIONS):
+            body.append(f"<b>무선 청소기</b> 흡입력이 {rng.randint(10, 99)}% 올랐어요 🔥 \"진짜\" 대박입니다.")
+        body.append("[[CTA_1]]" if name == "사용 과정" else "")
+    data = {
+        "title": f"무선 청소기 {rng.randint(1, 9)}가지 진실, 모르면 {rng.randint(5, 50)}만원 날립니다",
+        "content": "\n".join(body),
+        "meta_description": "무선 청소기 구매 전 꼭 알아야 할 핵심 정리",
+        "hashtags": "#무선청소기 #청소기추천 #다이슨 #가성비 #살림템 #청소 #리뷰"
+    }
+    text = json.dumps(data, ensure_ascii=False, indent=4)
+    wrappers = [
+        lambda t: t,
+        lambda t: f"```json\n{t}\n```",
+        lambda t: f"요청하신 원고입니다.\n{t}\n참고: {{필요 시 수정}}",
+    ]
+    return rng.choice(wrappers)(text)
+
+
+def corrupt(rng, text):
+    """흔한 손상 유형 적용 → (유형, 손상된 텍스트)"""
+    kind = rng.choice(["truncate", "truncate", "truncate", "no_close", "trailing_comma", "raw_newline"])
+    if kind == "truncate":
+        start = text.find("{")
+        return kind, text[:rng.randint(start + 40, len(text) - 1)]
+    if kind == "no_close":
+        return kind, text[:text.rfind("}")]
+    if kind == "trailing_comma":
+        i = text.rfind('"')
+        return kind, text[:i + 1] + "," + text[i + 1:]
+    return kind, text.replace("\\n", "\n")
+
+
+def baseline(raw):
+    """기존 방식"""
+    m = re.search(r'\{.*\}', raw, re.DOTALL)
+    if not m:
+        raise ValueError("JSON 형식을 찾을 수 없습니다.")
+    return json.loads(m.group())
+
+
+def extractor(raw):
+    return extract_json(raw)[0]
+
+
+def run(corpus, repeat):
+    report = {}
+    for name, parse in (("baseline", baseline), ("extractor", extractor)):
+        salvaged = 0
+        by_kind = {}
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for kind, raw in corpus:
+                try:
+                    ok = bool(parse(raw).get("content"))
+                except ValueError:
+                    ok = False
+                by_kind.setdefault(kind, [0, 0])
+                by_kind[kind][0] += ok
+                by_kind[kind][1] += 1
+        elapsed = time.perf_counter() - started
+        salvaged = sum(v[0] for v in by_kind.values())
+        total = sum(v[1] for v in by_kind.values())
+        report[name] = {
+            "us_per_doc": round(elapsed / total * 1e6, 1),
+            "salvage_rate": round(salvaged / total, 3),
+            "by_kind": {k: round(v[0] / v[1], 3) for k, v in sorted(by_kind.items())}
+        }
+    return report
+
+
+def load_corpus(folder, rng, size):
+    corpus = []
+    if folder:
+        # 실제 응답 파일(*.txt) + 각각의 손상본
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".txt"):
+                with open(os.path.join(folder, name), encoding="utf-8") as f:
+                    raw = f.read()
+                corpus.append(("real", raw))
+                corpus.append(corrupt(rng, raw))
+    for _ in range(size):
+        raw = make_response(rng, rng.randint(1800, 4000))
+        corpus.append(("intact", raw))
+        corpus.append(corrupt(rng, raw))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 추출 벤치마크")
+    parser.add_argument("--corpus", help="실제 모델 응답(*.txt) 폴더")
+    parser.add_argument("--size", type=int, default=100, help="합성 응답 개수")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.corpus, rng, args.size)
+    report = run(corpus, args.repeat)
+    report["documents"] = len(corpus)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"문서 {len(corpus)}개 × {args.repeat}회")
+    for name in ("baseline", "extractor"):
+        r = report[name]
+        kinds = ", ".join(f"{k} {v:.0%}" for k, v in r["by_kind"].items())
+        print(f"{name:10s} {r['us_per_doc']:8.1f}µs/문서  복구율 {r['salvage_rate']:.1%}  ({kinds})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# 파이프라인 단계별 벤치마크
+# 가짜 Gemini / DuckDuckGo(fakes.py)를 지연·오류율 프로필과 함께 끼워 넣고
+# 검색(hunt_realtime_info) → 프롬프트(generate_*_prompt) → 생성(generate_text) → JSON 추출
+# → 렌더링([TITLE]/CTA) → 태그 제거(clean_all_tags) → 전체(write_*) 순으로 단계별 시간을 잽니다.
+# 결과는 JSON으로 저장해 버전 간 비교(--compare)에 쓸 수 있습니다.
+#
+# 사용법: python benchmarks/bench_pipeline.py [--search-profile typical] [--model-profile typical]
+#                                             [--pool-keys 3] [--out result.json] [--compare baseline.json] [--json]
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 실제 캐시/속도 제한과 섞이지 않도록 임시 캐시 + 넉넉한 제한 (import 전에 설정)
+_TMP = tempfile.mkdtemp(prefix="bench_pipeline_")
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(_TMP, "search.sqlite3"))
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_TMP, "llm.sqlite3"))
+os.environ.setdefault("SEARCH_RATE_PER_SEC", "1000")
+os.environ.setdefault("SEARCH_BURST", "1000")
+os.environ.setdefault("SEARCH_BREAKER_THRESHOLD", "1000")
+
+import ddgs
+import pipeline
+from fakes import PROFILES, FakeDDGS, FakeGenerativeModel
+from gemini_pool import GeminiPool
+from json_extract import extract_json
+from render import STYLES, render_article
+from snippet_dedup import dedup_snippets
+from article_score import score_article
+from phrase_guard import check_article
+
+KEYWORD = "무선 청소기 추천"
+# 일괄 생성 벤치마크용 키워드 시트 (비슷한 키워드 묶음 2개 + 단독 1개)
+BATCH_ROWS = [
+    {"keyword": "무선 청소기 추천", "product": "다이슨 V15", "url": "https://link.coupang.com/x"},
+    {"keyword": "무선 청소기 추천 2025", "mode": "naver_info"},
+    {"keyword": "다이슨 무선 청소기", "mode": "tistory_info"},
+    {"keyword": "건강보험 환급 방법", "mode": "naver_info"},
+    {"keyword": "2025년 건강보험 환급 방법", "mode": "tistory_info"},
+    {"keyword": "아이폰 배터리 교체 비용", "mode": "naver_info"}
+]
+CTX = {"keyword": KEYWORD, "product": "다이슨 V15", "url": "https://link.coupang.com/x", "disclosure": pipeline.get_ftc_text("https://link.coupang.com/x")}
+
+
+def measure(fn, repeat, warmup=1, flaky=False):
+    """fn을 repeat번 실행한 호출별 시간 통계
+
+    flaky=True인 단계(가짜 API 오류가 나는 단계)는 예외를 오류로 세고 시간에서 제외
+    """
+    samples = []
+    errors = 0
+    for i in range(warmup + repeat):
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception:
+            if not flaky:
+                raise
+            errors += i >= warmup
+            continue
+        if i >= warmup:
+            samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    if not samples:
+        return {"calls": repeat, "errors": errors}
+    return {
+        "calls": repeat,
+        "errors": errors,
+        "mean_ms": round(sum(samples) / len(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4)
+    }
+
+
+def run(args):
+    FakeDDGS.configure(PROFILES[args.search_profile], results=args.results)
+    ddgs.RealDDGS = FakeDDGS
+    fakes = []
+
+    def make_fake(api_key, model_name):
+        fake = FakeGenerativeModel(PROFILES[args.model_profile], chars_per_sec=args.chars_per_sec, model_name=f"models/{model_name}")
+        fakes.append(fake)
+        return fake
+
+    if args.pool_keys:
+        # 가짜 키 N개 × 대체 모델 1개 풀로 라우팅/페일오버 오버헤드까지 포함해 측정
+        model = GeminiPool([f"fake-key-{i}" for i in range(args.pool_keys)], ["fake-gemini", "fake-gemini-lite"],
+                           quota_cooldown=0.05, server_cooldown=0.05, model_factory=make_fake)
+    else:
+        model = make_fake(None, "fake-gemini")
+    pipeline.set_model(model)
+
+    stages = {}
+    counter = iter(range(10 ** 9))
+
+    def fresh_keyword():
+        # 검색 캐시 단일 비행/히트가 섞이지 않도록 매번 다른 키워드
+        return f"{KEYWORD} {next(counter)}"
+
+    # 검색
+    stages["search.hunt_realtime_info.cold"] = measure(
+        lambda: pipeline.hunt_realtime_info(fresh_keyword(), use_cache=False), args.io_repeat, flaky=True)
+    stages["search.hunt_realtime_info.variants.cold"] = measure(
+        lambda: pipeline.hunt_realtime_info(fresh_keyword(), use_cache=False, variants=pipeline.SEARCH_VARIANTS), args.io_repeat, flaky=True)
+    stages["search.hunt_realtime_info.warm"] = measure(
+        lambda: pipeline.hunt_realtime_info(KEYWORD), args.repeat)
+
+    # 중복 제거 (팬아웃 4개 쿼리 × 결과 수만큼 모인 스니펫 기준)
+    snippets = [r for i in range(4) for r in FakeDDGS()._search(f"{KEYWORD} {i % 2}", args.results)]
+    stages["search.dedup_snippets"] = measure(lambda: dedup_snippets(snippets), args.repeat)
+    stages["search.rank_search_results"] = measure(lambda: pipeline.rank_search_results(KEYWORD, snippets), args.repeat)
+
+    # 프롬프트
+    facts = pipeline.hunt_realtime_info(KEYWORD)
+    profit_persona = pipeline.NAVER_PROFIT_PERSONAS[0]
+    structure = pipeline.NAVER_PROFIT_STRUCTURES[1]
+    stages["prompt.naver_profit"] = measure(
+        lambda: pipeline.generate_naver_profit_prompt(KEYWORD, CTX["product"], CTX["url"], facts, profit_persona, structure), args.repeat)
+    stages["prompt.naver_info"] = measure(
+        lambda: pipeline.generate_naver_info_prompt(KEYWORD, facts, pipeline.NAVER_INFO_PERSONAS[0]), args.repeat)
+    stages["prompt.tistory_info"] = measure(
+        lambda: pipeline.generate_tistory_info_prompt(KEYWORD, facts, pipeline.TISTORY_INFO_PERSONAS[0]), args.repeat)
+
+    # 생성 (응답 캐시를 건너뛰도록 프롬프트마다 다른 꼬리표)
+    prompt = pipeline.generate_naver_info_prompt(KEYWORD, facts, pipeline.NAVER_INFO_PERSONAS[0])
+    stages["llm.generate_text"] = measure(
+        lambda: pipeline.generate_text(f"{prompt}\n#{next(counter)}", use_cache=False), args.io_repeat, flaky=True)
+    stages["llm.generate_text.stream"] = measure(
+        lambda: pipeline.generate_text(f"{prompt}\n#{next(counter)}", on_chunk=lambda chunk: None, use_cache=False), args.io_repeat, flaky=True)
+    # 첫 호출(워밍업)이 저장한 응답을 재생
+    stages["llm.generate_text.cached"] = measure(lambda: pipeline.generate_text(prompt), args.repeat, flaky=True)
+
+    # 추출 / 렌더링 / 태그 제거
+    raw = fakes[0].respond(prompt)
+    stages["extract_json"] = measure(lambda: extract_json(raw), args.repeat)
+    data, _ = extract_json(raw)
+    for name, style in STYLES.items():
+        stages[f"render.{name}"] = measure(lambda style=style: render_article(data, style, **CTX), args.repeat)
+    html = render_article(data, STYLES["naver_profit"], **CTX)["html"]
+    stages["clean_all_tags"] = measure(lambda: pipeline.clean_all_tags(html), args.repeat)
+    stages["score_article"] = measure(lambda: score_article(KEYWORD, data), args.repeat)
+    stages["check_article"] = measure(lambda: check_article(data), args.repeat)
+
+    # 전체 (검색은 캐시 사용, 생성은 매번 새로)
+    stages["e2e.write_naver_profit"] = measure(
+        lambda: pipeline.write_naver_profit(fresh_keyword(), CTX["product"], CTX["url"], use_llm_cache=False), args.io_repeat, flaky=True)
+    stages["e2e.write_naver_info"] = measure(
+        lambda: pipeline.write_naver_info(fresh_keyword(), use_llm_cache=False), args.io_repeat, flaky=True)
+    stages["e2e.write_tistory_info"] = measure(
+        lambda: pipeline.write_tistory_info(fresh_keyword(), use_llm_cache=False), args.io_repeat, flaky=True)
+    stages["e2e.write_naver_profit_variants"] = measure(
+        lambda: pipeline.write_naver_profit_variants(fresh_keyword(), CTX["product"], CTX["url"], n=3, use_llm_cache=False), args.io_repeat, flaky=True)
+    # 검색 1회 + 3개 동시 생성 (≈ 가장 느린 단일 생성)
+    stages["e2e.write_all_platforms"] = measure(
+        lambda: pipeline.write_all_platforms(fresh_keyword(), CTX["product"], CTX["url"], use_llm_cache=False), args.io_repeat, flaky=True)
+
+    # 일괄 생성: 행마다 검색 vs 비슷한 키워드끼리 검색 공유 (검색 캐시 없이)
+    batch_search_calls = {}
+    for name, shared in (("separate", False), ("shared", True)):
+        before = FakeDDGS.calls
+        stages[f"e2e.run_batch.{name}"] = measure(
+            lambda shared=shared: pipeline.run_batch(BATCH_ROWS, 4, use_cache=False, use_llm_cache=False, shared_search=shared), args.io_repeat, flaky=True)
+        batch_search_calls[name] = (FakeDDGS.calls - before) / (args.io_repeat + 1)
+
+    return {
+        "meta": {
+            "version": git_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "search_profile": {"name": args.search_profile, **PROFILES[args.search_profile].to_dict()},
+            "model_profile": {"name": args.model_profile, **PROFILES[args.model_profile].to_dict()},
+            "repeat": args.repeat,
+            "io_repeat": args.io_repeat,
+            "search_calls": FakeDDGS.calls,
+            "search_errors": FakeDDGS.errors,
+            "model_calls": sum(f.calls for f in fakes),
+            "model_errors": sum(f.errors for f in fakes),
+            "batch_search_calls": batch_search_calls,
+            "pool": model.stats() if args.pool_keys else None
+        },
+        "stages": stages
+    }
+
+
+def git_version():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """기준 결과 대비 p50 변화율 → (단계, 기준 ms, 현재 ms, 비율, 회귀 여부) 목록
+
+    µs 단위 단계의 측정 잡음을 회귀로 보지 않도록 차이가 min_delta_ms 미만이면 제외
+    """
+    rows = []
+    for name, stats in report["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or "p50_ms" not in base or "p50_ms" not in stats or not base["p50_ms"]:
+            continue
+        ratio = stats["p50_ms"] / base["p50_ms"]
+        regressed = ratio > 1 + threshold and stats["p50_ms"] - base["p50_ms"] >= min_delta_ms
+        rows.append((name, base["p50_ms"], stats["p50_ms"], ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 벤치마크 (가짜 Gemini/DuckDuckGo 사용)")
+    parser.add_argument("--search-profile", default="fast", choices=sorted(PROFILES))
+    parser.add_argument("--model-profile", default="fast", choices=sorted(PROFILES))
+    parser.add_argument("--chars-per-sec", type=float, default=0, help="가짜 모델 출력 속도 (0이면 즉시)")
+    parser.add_argument("--pool-keys", type=int, default=0, help="가짜 API 키 N개짜리 GeminiPool로 생성 (0이면 모델 1개 직접 사용)")
+    parser.add_argument("--results", type=int, default=8, help="검색 1회당 결과 수")
+    parser.add_argument("--repeat", type=int, default=200, help="CPU 단계 반복 수")
+    parser.add_argument("--io-repeat", type=int, default=10, help="검색/생성 등 지연이 있는 단계 반복 수")
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50이 이 비율 이상 느려지면 회귀 (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="p50 차이가 이보다 작으면 회귀로 보지 않음")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    # 파이프라인 로그가 JSON 출력에 섞이지 않도록 stderr로
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        report = run(args)
+    finally:
+        sys.stdout = stdout
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            rows = compare(report, json.load(f), args.threshold, args.min_delta_ms)
+        report["compare"] = [
+            {"stage": name, "baseline_p50_ms": base, "p50_ms": now, "ratio": round(ratio, 3), "regressed": bad}
+            for name, base, now, ratio, bad in rows
+        ]
+        regressions = [r for r in report["compare"] if r["regressed"]]
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        meta = report["meta"]
+        print(f"버전 {meta['version']} · 검색 {args.search_profile} · 모델 {args.model_profile}")
+        for name, stats in report["stages"].items():
+            if "p50_ms" not in stats:
+                print(f"{name:42s} 전부 실패 ({stats['errors']}/{stats['calls']})")
+                continue
+            errors = f"  오류 {stats['errors']}/{stats['calls']}" if stats["errors"] else ""
+            print(f"{name:42s} p50 {stats['p50_ms']:10.3f}ms  p95 {stats['p95_ms']:10.3f}ms{errors}")
+        calls = meta["batch_search_calls"]
+        print(f"일괄 생성 {len(BATCH_ROWS)}건당 검색 호출: 행마다 {calls['separate']:.0f}회 → 묶음 공유 {calls['shared']:.0f}회")
+        for row in report.get("compare", []):
+            mark = "⚠️ 회귀" if row["regressed"] else ""
+            print(f"{row['stage']:42s} {row['baseline_p50_ms']:.3f}ms → {row['p50_ms']:.3f}ms ({row['ratio']:.2f}x) {mark}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+# 렌더링 마이크로 벤치마크
+# 기존 체인([TITLE] re.sub → CTA str.replace → f-string 틀 → clean_all_tags → 클립보드 escape/re.sub)과
+# render.render_article 단일 패스 파이프라인을 큰 원고에서 비교하고, 두 결과가 같은지도 확인합니다.
+# 클립보드는 기존 페이로드의 이스케이프를 풀었을 때 같은지 보고, 전송 크기도 비교합니다.
+#
+# 사용법: python benchmarks/bench_render.py [--chars 20000] [--repeat 200] [--json]
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render import STYLES, clipboard_literal, render_article, get_naver_h3, get_naver_info_h3, get_tistory_info_h3, get_naver_profit_cta
+
+CTX = {"keyword": "무선 청소기 추천", "product": "다이슨 V15", "url": "https://link.coupang.com/x", "disclosure": "이 포스팅은 쿠팡 파트너스 활동의 일환으로, 이에 따른 일정액의 수수료를 제공받습니다."}
+
+
+def clean_all_tags(text):
+    """기존 HTML 태그 제거"""
+    text = re.sub(r'<[^>]*>', '', text)
+    text = text.replace("**", "").replace("__", "").replace("*", "")
+    return text.strip()
+
+
+def legacy_clipboard(final, mode):
+    """기존 렌더 함수가 리런마다 다시 계산하던 복사 버튼 페이로드"""
+    safe = final.replace("`", "\\`").replace("$", "\\$")
+    if mode == "tistory_info":
+        return safe.replace("\n", "")
+    safe = re.sub(r'>\s*\n\s*<', '><', safe)
+    return safe.replace("\n", "<br>")
+
+
+def legacy_clipboard_html(payload):
+    """기존 페이로드(템플릿 리터럴용 이스케이프) → 실제로 복사되던 HTML"""
+    return payload.replace("\\`", "`").replace("\\$", "$")
+
+
+def legacy_render(data, mode):
+    """기존 렌더 함수들의 후처리 체인 (1.py에서 옮겨온 그대로)"""
+    keyword = CTX["keyword"]
+    if mode == "naver_profit":
+        title = data.get('title', f'{keyword} 후기')
+        content = data.get('content', '')
+        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', lambda m: get_naver_h3(m.group(1)), content)
+        cta_html = get_naver_profit_cta(CTX)
+        content = content.replace("[[CTA_1]]", cta_html, 1)
+        content = content.replace("[[CTA_2]]", cta_html, 1)
+        content = re.sub(r'\[\[CTA_\d+\]\]', '', content)
+        final = f"""<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
+{CTX["disclosure"]}
+
+<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #000;">{title}</h1>
+
+{content}
+
+<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{data.get('hashtags', '')}</div>
+</div>"""
+    elif mode == "naver_info":
+        title = data.get('title', f'{keyword} 완전 정리')
+        content = data.get('content', '')
+        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', lambda m: get_naver_info_h3(m.group(1)), content)
+        final = f"""<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
+<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #2c5aa0;">{title}</h1>
+
+{content}
+
+<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{data.get('hashtags', '')}</div>
+</div>"""
+    else:
+        title = data.get('title', f'{keyword} 완전 분석')
+        content = data.get('content', '')
+        content = re.sub(r'\[TITLE\](.*?)\[/TITLE\]', lambda m: f"<h3 style='{get_tistory_info_h3()}'>{m.group(1)}</h3>", content)
+        final = f"""<div style="font-family: 'Noto Sans KR', sans-serif; font-size: 16px; line-height: 1.8; color: #333; max-width: 800px; margin: auto;">
+<h1 style="font-size: 32px; font-weight: bold; color: #222; margin: 30px 0; text-align: center;">{title}</h1>
+
+<div style="padding: 15px; background: #f1f3f5; border-radius: 8px; margin: 20px 0;">
+<b style="color: #495057;">💡 핵심 요약:</b> {keyword}에 대한 심층 분석
+</div>
+
+{content}
+
+<div style="margin-top: 40px; padding-top: 20px; border-top: 2px solid #dee2e6; color: #6c757d; font-size: 14px;">{data.get('hashtags', '')}</div>
+</div>"""
+    return {"title": title, "html": final, "text": clean_all_tags(final), "clipboard": legacy_clipboard(final, mode)}
+
+
+def make_article(rng, chars):
+    """큰 원고 생성 (소제목/CTA/태그/마크다운/줄바꿈 섞음)"""
+    lines = []
+    size = 0
+    section = 0
+    while size < chars:
+        if len(lines) % 12 == 0:
+            section += 1
+            lines.append(f"[TITLE]{section}. 핵심 포인트 **정리**[/TITLE]")
+        if len(lines) % 40 == 5:
+            lines.append(f"[[CTA_{1 + (len(lines) // 40) % 3}]]")
+        line = rng.choice([
+            "<b>흡입력</b>이 무려 <b>230AW</b>라서 $1 차이로 `진짜` 달라요 🔥",
+            "  솔직히 이거 모르고 샀다간... **후회**합니다 ✨  ",
+            "<div style=\"background:#f8f9fa; padding:15px;\">",
+            "</div>",
+            "☑️ 항목 __중요__ * 체크",
+            ""
+        ])
+        lines.append(line)
+        size += len(line) + 1
+    return {"title": "무선 청소기 3가지 진실", "content": "\n".join(lines), "hashtags": "#무선청소기 #다이슨"}
+
+
+def bench(fn, repeat, rounds=5):
+    """호출당 µs (rounds번 측정 중 최솟값)"""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        elapsed = (time.perf_counter() - started) / repeat * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌더링 마이크로 벤치마크")
+    parser.add_argument("--chars", type=int, default=20000, help="원고 길이(자)")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    data = make_article(random.Random(args.seed), args.chars)
+    report = {"chars": len(data["content"]), "modes": {}}
+    for mode, style in STYLES.items():
+        # 소제목 스타일이 랜덤이므로 같은 시드로 돌려 결과 비교
+        random.seed(args.seed)
+        expected = legacy_render(data, mode)
+        random.seed(args.seed)
+        actual = render_article(data, style, **CTX)
+        legacy_us = bench(lambda: legacy_render(data, mode), args.repeat)
+        pipeline_us = bench(lambda: render_article(data, style, **CTX), args.repeat)
+        # 기존 방식은 리런마다 클립보드 페이로드를 다시 만들었고, 파이프라인은 생성 시 1번만 만듦
+        rerun_us = bench(lambda: legacy_clipboard(expected["html"], mode), args.repeat)
+        report["modes"][mode] = {
+            "legacy_us": round(legacy_us, 1),
+            "pipeline_us": round(pipeline_us, 1),
+            "speedup": round(legacy_us / pipeline_us, 2),
+            "legacy_rerun_us": round(rerun_us, 1),
+            "pipeline_rerun_us": 0.0,
+            "identical": dict(
+                {key: expected[key] == actual[key] for key in ("title", "html", "text")},
+                clipboard=legacy_clipboard_html(expected["clipboard"]) == actual["clipboard"]
+            ),
+            # 기존은 리런마다 페이로드 전체를 보냈고, 지금은 원고가 바뀔 때 1번만 보냄
+            "legacy_payload_bytes": len(expected["clipboard"].encode("utf-8")),
+            "payload_bytes": len(clipboard_literal(actual["clipboard"]).encode("utf-8"))
+        }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"원고 {report['chars']}자 × {args.repeat}회")
+    for mode, r in report["modes"].items():
+        same = ", ".join(k for k, v in r["identical"].items() if v)
+        diff = ", ".join(k for k, v in r["identical"].items() if not v)
+        print(f"{mode:13s} 기존 {r['legacy_us']:9.1f}µs  파이프라인 {r['pipeline_us']:9.1f}µs  ×{r['speedup']:.2f}  "
+              f"리런당 기존 {r['legacy_rerun_us']:.1f}µs → 0µs  동일: {same}" + (f"  다름: {diff}" if diff else ""))
+        print(f"{'':13s} 복사 페이로드 {r['legacy_payload_bytes']:,}B (리런마다) → {r['payload_bytes']:,}B (원고가 바뀔 때만)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# 벤치마크용 Gemini / DuckDuckGo 대역입니다.
+# 네트워크 없이 지연 시간·오류율 프로필대로 응답하므로 파이프라인 각 단계의 오버헤드를
+# 실제 API 변동과 분리해서 측정할 수 있습니다.
+#
+#   ddgs.RealDDGS = FakeDDGS            # 검색 백엔드 교체
+#   pipeline.set_model(FakeGenerativeModel(PROFILES["typical"]))
+
+import json
+import time
+import zlib
+import random
+import threading
+
+
+class LatencyProfile:
+    """응답 지연(초)과 오류율 프로필
+
+    - latency: 평균 지연, jitter: ±비율로 흔들림 (0.3이면 ±30%)
+    - error_rate: 호출이 예외로 끝날 확률
+    - tail_rate / tail_factor: 가끔 latency × tail_factor만큼 느려지는 꼬리 지연
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, tail_rate=0.0, tail_factor=5.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_factor = tail_factor
+
+    def sample(self, rng):
+        """이번 호출의 지연 시간 (오류면 None)"""
+        if rng.random() < self.error_rate:
+            return None
+        delay = self.latency * (1 + rng.uniform(-self.jitter, self.jitter))
+        if rng.random() < self.tail_rate:
+            delay *= self.tail_factor
+        return max(0.0, delay)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+PROFILES = {
+    "instant": LatencyProfile(),
+    "fast": LatencyProfile(latency=0.02, jitter=0.2),
+    "typical": LatencyProfile(latency=0.3, jitter=0.3, error_rate=0.02, tail_rate=0.05),
+    "slow": LatencyProfile(latency=1.5, jitter=0.4, error_rate=0.05, tail_rate=0.1),
+    "flaky": LatencyProfile(latency=0.3, jitter=0.5, error_rate=0.3, tail_rate=0.2)
+}
+
+SNIPPETS = [
+    "{q} 실사용 후기: 흡입력은 {n}% 좋아졌지만 무게가 {m}kg라 손목이 아픕니다.",
+    "{q} 최저가는 {n}만 {m}천원, 카드 할인까지 받으면 더 내려갑니다.",
+    "2025년 {q} 비교표를 보면 배터리 지속 시간이 {n}분으로 가장 깁니다.",
+    "{q} 구매 전 체크할 점 {m}가지. 필터 교체 주기와 A/S 기간을 꼭 확인하세요.",
+    "커뮤니티 반응: {q} 소음이 {n}dB 수준이라 밤에 쓰기 부담스럽다는 의견이 많습니다."
+]
+
+_rng_lock = threading.Lock()
+_rng = random.Random(7)
+
+
+def _sample(profile):
+    with _rng_lock:
+        return profile.sample(_rng)
+
+
+class FakeDDGS:
+    """duckduckgo_search.DDGS 대역 (ddgs.RealDDGS 자리에 넣어 사용)
+
+    클래스 속성 profile / results로 전체 동작을 바꾸고, calls / errors로 호출 수를 확인
+    """
+
+    profile = PROFILES["instant"]
+    results = 8
+    calls = 0
+    errors = 0
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+
+    @classmethod
+    def configure(cls, profile, results=8):
+        cls.profile = profile
+        cls.results = results
+        cls.calls = 0
+        cls.errors = 0
+
+    def _search(self, keywords, max_results):
+        delay = _sample(self.profile)
+        FakeDDGS.calls += 1
+        if delay is None:
+            FakeDDGS.errors += 1
+            raise RuntimeError("202 Ratelimit")
+        time.sleep(delay)
+        rng = random.Random(keywords)
+        site = zlib.crc32(keywords.encode("utf-8")) % 10000
+        for i in range(min(max_results or self.results, self.results)):
+            body = " ".join(
+                rng.choice(SNIPPETS).format(q=keywords, n=rng.randint(10, 99), m=rng.randint(1, 9))
+                for _ in range(3)
+            )
+            yield {
+                "title": f"{keywords} {i + 1}위 정리 - 블로그",
+                "body": body,
+                "href": f"https://example.com/{site}/{i}",
+                "url": f"https://example.com/{site}/{i}"
+            }
+
+    def text(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10, **kwargs):
+        return self._search(keywords, max_results)
+
+    def news(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10, **kwargs):
+        return self._search(f"{keywords} 뉴스", max_results)
+
+
+def make_article_json(keyword, sections=5, paragraph=400):
+    """실제 응답과 비슷한 모양의 JSON 원고 텍스트"""
+    body = []
+    for i in range(sections):
+        body.append(f"[TITLE]{i + 1}. {keyword} 핵심 포인트[/TITLE]")
+        body.append((f"<b>{keyword}</b> 써보니 **진짜** 달라요 🔥 " * (paragraph // 30))[:paragraph])
+        if i == 2:
+            body.append("[[CTA_1]]")
+    body.append("[[CTA_2]]")
+    return json.dumps({
+        "title": f"{keyword} 3가지 진실, 모르면 손해",
+        "content": "\n".join(body),
+        "meta_description": f"{keyword} 구매 전 꼭 알아야 할 핵심 정리",
+        "hashtags": f"#{keyword.replace(' ', '')} #추천 #후기 #가성비 #비교 #리뷰 #정리"
+    }, ensure_ascii=False, indent=4)
+
+
+class _Usage:
+    def __init__(self, total_token_count):
+        self.total_token_count = total_token_count
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Response:
+    """generate_content 반환값 대역 (stream=True면 청크 반복, 끝나면 usage_metadata 채움)"""
+
+    def __init__(self, text, chunks, chunk_delay):
+        self.text = text
+        self._chunks = chunks
+        self._chunk_delay = chunk_delay
+        self.usage_metadata = _Usage(len(text) // 2)
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            if self._chunk_delay:
+                time.sleep(self._chunk_delay)
+            yield _Chunk(chunk)
+
+
+class FakeGenerativeModel:
+    """google.generativeai.GenerativeModel 대역
+
+    - profile: 첫 토큰까지의 지연과 오류율
+    - chars_per_sec: 첫 토큰 이후 출력 속도 (0이면 즉시)
+    - respond(prompt): 응답 텍스트를 만드는 함수 (기본은 5개 섹션짜리 JSON 원고)
+    """
+
+    def __init__(self, profile=PROFILES["instant"], chars_per_sec=0, chunk_chars=60, respond=None, model_name="models/fake-gemini"):
+        self.profile = profile
+        self.chars_per_sec = chars_per_sec
+        self.chunk_chars = chunk_chars
+        self.respond = respond or (lambda prompt: make_article_json("무선 청소기 추천"))
+        self.model_name = model_name
+        self.calls = 0
+        self.errors = 0
+
+    def generate_content(self, prompt, stream=False):
+        delay = _sample(self.profile)
+        self.calls += 1
+        if delay is None:
+            self.errors += 1
+            raise RuntimeError("429 Resource has been exhausted")
+        time.sleep(delay)
+        text = self.respond(prompt)
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        chunk_delay = self.chunk_chars / self.chars_per_sec if self.chars_per_sec else 0
+        if not stream:
+            time.sleep(chunk_delay * len(chunks))
+        return _Response(text, chunks, chunk_delay)
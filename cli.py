@@ -0,0 +1,107 @@
+# Streamlit 없이 원고를 일괄 생성하는 명령줄 진입점입니다. (cron / 배치 작업용)
+#
+#   python cli.py keywords.txt -w 4 > posts.jsonl
+#   echo "무선 청소기 추천" | python cli.py --mode naver_info
+#
+# 입력은 한 줄에 한 건: 키워드만 쓰거나, 탭으로 구분한 "키워드\t상품명\t링크[\t모드]",
+# 또는 keyword/product/url/mode/seed 키를 가진 JSON 객체. 빈 줄과 #으로 시작하는 줄은 무시합니다.
+# 결과는 끝나는 순서대로 한 줄에 하나씩 JSON으로 stdout에 출력하고, 진행 로그는 stderr로 보냅니다.
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+from dotenv import load_dotenv
+
+import pipeline
+
+ROW_FIELDS = ("keyword", "product", "url", "mode")
+
+
+def parse_line(line, default_mode=""):
+    """입력 한 줄 → 행 dict (건너뛸 줄이면 None)"""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        row = json.loads(line)
+    else:
+        row = dict(zip(ROW_FIELDS, (part.strip() for part in line.split("\t"))))
+    row.setdefault("mode", default_mode)
+    if not str(row.get("keyword", "")).strip():
+        raise ValueError(f"키워드가 없습니다: {line}")
+    return row
+
+
+def read_rows(stream, default_mode=""):
+    rows = []
+    for number, line in enumerate(stream, 1):
+        try:
+            row = parse_line(line, default_mode)
+        except ValueError as e:
+            raise SystemExit(f"입력 {number}번째 줄 오류: {e}")
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="키워드 목록으로 블로그 원고를 생성해 JSONL로 출력")
+    parser.add_argument("input", nargs="?", default="-", help="키워드 파일 (생략하거나 -면 stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=int(os.getenv("BATCH_MAX_WORKERS", "4")), help="동시 생성 수")
+    parser.add_argument("--mode", default="", choices=["", *pipeline.BATCH_MODES], help="모드를 적지 않은 줄에 쓸 기본 모드 (생략 시 상품/링크 유무로 자동)")
+    parser.add_argument("--fresh-search", action="store_true", help="검색 캐시 무시")
+    parser.add_argument("--fresh-llm", action="store_true", help="LLM 응답 캐시 무시")
+    parser.add_argument("--no-shared-search", action="store_true", help="비슷한 키워드끼리 검색을 나눠 쓰지 않고 행마다 따로 검색")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding="utf-8")
+
+    if args.input == "-":
+        rows = read_rows(sys.stdin, args.mode)
+    else:
+        with open(args.input, encoding="utf-8-sig") as f:
+            rows = read_rows(f, args.mode)
+    if not rows:
+        return 0
+
+    try:
+        pipeline.configure()
+    except RuntimeError as e:
+        print(f"🚨 {e}", file=sys.stderr)
+        return 2
+
+    out = sys.stdout
+    started = time.perf_counter()
+
+    def on_progress(done, total, result):
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        mark = "OK " if result["status"] == "ok" else "ERR"
+        print(f"[{done}/{total}] {mark} {result['keyword']} ({result['elapsed']}초) {result['error']}", file=sys.stderr)
+
+    # 파이프라인 내부 로그(print)가 JSONL 출력에 섞이지 않도록 stderr로 돌림
+    with contextlib.redirect_stdout(sys.stderr):
+        results = pipeline.run_batch(
+            rows, args.workers, on_progress,
+            use_cache=not args.fresh_search, use_llm_cache=not args.fresh_llm,
+            shared_search=False if args.no_shared_search else None
+        )
+
+    elapsed = time.perf_counter() - started
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print(f"완료: {len(results) - failed}/{len(results)}건 성공 · {elapsed:.1f}초", file=sys.stderr)
+    shared_rows, searches = pipeline.shared_search_savings(results)
+    if shared_rows:
+        print(f"검색 공유: {shared_rows}건을 검색 {searches}회로 처리 ({shared_rows - searches}회 절약)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,16 @@
 # 이 파일은 기존 ddgs 라이브러리를 대체하여 안정성을 높이는 섀도우(Shadow) 모듈입니다.
 # 원본 파일들의 로직을 수정하지 않고 검색 기능을 강화합니다.
 
+import os
 import sys
 import time
 import random
+import threading
 import importlib.util
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from disk_cache import DiskCache
+import tracing
 
 # 재귀 임포트 방지를 위한 경로 처리
 # 현재 디렉토리가 sys.path의 맨 앞에 있다면 제거하여 실제 라이브러리를 찾도록 함
@@ -35,10 +40,318 @@ if _current_dir in __file__:
         # 경로 복구
         sys.path.insert(0, _current_dir)
 
+# 검색 결과 디스크 캐시 (.env 로드 이후 설정이 반영되도록 첫 사용 시 생성)
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache():
+    """프로세스 공용 검색 캐시 (SEARCH_CACHE_PATH / SEARCH_CACHE_TTL / SEARCH_CACHE_MAX_ENTRIES)"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "search_cache.sqlite3")
+            _search_cache = DiskCache(
+                os.getenv("SEARCH_CACHE_PATH", default_path),
+                table="search",
+                ttl=int(os.getenv("SEARCH_CACHE_TTL", "900")),
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000"))
+            )
+    return _search_cache
+
+def search_cache_stats():
+    """검색 캐시 히트/미스 통계"""
+    return get_search_cache().stats()
+
+class TokenBucket:
+    """프로세스 공용 토큰 버킷 (초당 rate개 충전, 최대 capacity개 버스트)"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """토큰 1개 획득 (timeout 초 안에 못 얻으면 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def tokens(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+class CircuitBreaker:
+    """연속 실패 시 검색을 차단하고 reset_timeout 후 1회 시험 요청(half-open)으로 복구 여부 확인"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """요청 허용 여부 (차단 중이면 즉시 False)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                # 시험 요청은 한 번에 하나만
+                self._probing = True
+                return True
+            return False
+
+    def release(self):
+        """허용받은 요청을 보내지 못했을 때 시험 요청 슬롯 반환"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def retry_in(self):
+        """다음 시험 요청까지 남은 시간(초)"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+# 모든 세션/스레드가 공유하는 검색 보호 장치 (첫 사용 시 .env 설정으로 생성)
+_rate_limiter = None
+_circuit_breaker = None
+_guard_lock = threading.Lock()
+
+def _get_guard():
+    global _rate_limiter, _circuit_breaker
+    with _guard_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(
+                rate=float(os.getenv("SEARCH_RATE_PER_SEC", "0.5")),
+                capacity=int(os.getenv("SEARCH_BURST", "3"))
+            )
+            _circuit_breaker = CircuitBreaker(
+                failure_threshold=int(os.getenv("SEARCH_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("SEARCH_BREAKER_RESET", "60"))
+            )
+    return _rate_limiter, _circuit_breaker
+
+class LatencyTracker:
+    """메서드별 최근 응답 시간 기록, 헤지(복제) 요청 기준 지연 계산"""
+    def __init__(self, percentile=95, min_samples=20, window=200):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.hedges = 0
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, method_name, seconds):
+        with self._lock:
+            self._samples.setdefault(method_name, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, method_name, percentile):
+        with self._lock:
+            samples = sorted(self._samples.get(method_name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+    def record_hedge(self):
+        """복제 요청 1건 집계 (여러 검색 스레드에서 동시에 호출)"""
+        with self._lock:
+            self.hedges += 1
+
+    def hedge_delay(self, method_name):
+        """이 시간 안에 응답이 없으면 복제 요청 발송 (표본이 부족하면 None = 헤지 안 함)"""
+        with self._lock:
+            count = len(self._samples.get(method_name, ()))
+        if count < self.min_samples:
+            return None
+        return self.quantile(method_name, self.percentile)
+
+# 헤지 기준 지연 기록 + 검색 호출 전용 스레드 풀
+# (마감 시간을 넘긴 요청은 풀에 버려진 채 자체 timeout까지 실행)
+_latency = None
+_search_executor = None
+_hedge_lock = threading.Lock()
+
+def _get_hedging():
+    global _latency, _search_executor
+    with _hedge_lock:
+        if _latency is None:
+            _latency = LatencyTracker(
+                percentile=float(os.getenv("SEARCH_HEDGE_PERCENTILE", "95")),
+                min_samples=int(os.getenv("SEARCH_HEDGE_MIN_SAMPLES", "20"))
+            )
+            _search_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("SEARCH_MAX_INFLIGHT", "16")),
+                thread_name_prefix="ddgs"
+            )
+    return _latency, _search_executor
+
+def _backoff_delay(attempt, base=1.0, cap=8.0):
+    """지터 포함 지수 백오프 (full jitter)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def search_guard_status():
+    """레이트 리미터/서킷 브레이커 상태 (남은 토큰, 브레이커 상태, 다음 시험 요청까지 초, 클라이언트 풀)"""
+    limiter, breaker = _get_guard()
+    latency, _ = _get_hedging()
+    pool = get_client_pool()
+    return {
+        "tokens": round(limiter.tokens(), 2),
+        "capacity": limiter.capacity,
+        "rate": limiter.rate,
+        "breaker": breaker.state,
+        "failures": breaker.failures,
+        "retry_in": round(breaker.retry_in(), 1),
+        "hedges": latency.hedges,
+        "clients": pool.stats() if pool else None
+    }
+
+class _PooledClient:
+    """풀에 든 검색 클라이언트 1개 (같은 timeout끼리만 재사용, 연속 실패 수 기록)"""
+    def __init__(self, client, timeout):
+        self.client = client
+        self.timeout = timeout
+        self.failures = 0
+
+class ClientPool:
+    """프로세스 공용 검색 클라이언트 풀
+
+    클라이언트(내부 HTTP 세션)를 스레드/세션 간에 돌려 써서 keep-alive 연결과 TLS 세션을 재사용하고,
+    동시에 존재하는 클라이언트 수를 size개로 제한해 전체 외부 연결 수의 상한을 둡니다.
+    한 클라이언트는 한 번에 한 요청만 쓰며(대여/반납), 연속 max_failures번 실패한 클라이언트는
+    차단/꼬인 세션으로 보고 버린 뒤 다음 대여 때 새로 만듭니다.
+    """
+    def __init__(self, factory, size=8, max_failures=3):
+        self.factory = factory
+        self.size = size
+        self.max_failures = max_failures
+        self._idle = {}
+        self._live = 0
+        self._cond = threading.Condition()
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def acquire(self, timeout, wait=None):
+        """timeout용 클라이언트 대여 (wait초 안에 자리가 안 나면 None, wait=None이면 무한 대기)"""
+        deadline = None if wait is None else time.monotonic() + wait
+        with self._cond:
+            while True:
+                idle = self._idle.get(timeout)
+                if idle:
+                    self.reused += 1
+                    return idle.pop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                # 다른 timeout용으로 놀고 있는 클라이언트가 있으면 버리고 그 자리에 생성
+                other = next((lst for lst in self._idle.values() if lst), None)
+                if other:
+                    other.pop()
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+        try:
+            pooled = _PooledClient(self.factory(timeout=timeout), timeout)
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.created += 1
+        return pooled
+
+    def release(self, pooled, ok):
+        """반납 (실패가 max_failures번 이어지면 버림)"""
+        with self._cond:
+            pooled.failures = 0 if ok else pooled.failures + 1
+            if pooled.failures >= self.max_failures:
+                self._live -= 1
+                self.recycled += 1
+            else:
+                # 가장 최근에 쓴 클라이언트부터 다시 꺼내도록 뒤에 붙임 (연결이 살아 있을 가능성이 높음)
+                self._idle.setdefault(pooled.timeout, []).append(pooled)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            idle = sum(len(lst) for lst in self._idle.values())
+            return {
+                "size": self.size,
+                "live": self._live,
+                "in_use": self._live - idle,
+                "created": self.created,
+                "reused": self.reused,
+                "recycled": self.recycled
+            }
+
+_client_pool = None
+_client_pool_lock = threading.Lock()
+
+def get_client_pool():
+    """프로세스 공용 검색 클라이언트 풀 (SEARCH_CLIENT_POOL_SIZE / SEARCH_CLIENT_MAX_FAILURES, 라이브러리가 없으면 None)"""
+    global _client_pool
+    if RealDDGS is None:
+        return None
+    with _client_pool_lock:
+        if _client_pool is None:
+            # 교체된 RealDDGS(벤치마크 대역 등)도 반영되도록 생성 시점에 조회
+            _client_pool = ClientPool(
+                lambda timeout: RealDDGS(timeout=timeout),
+                size=int(os.getenv("SEARCH_CLIENT_POOL_SIZE", "8")),
+                max_failures=int(os.getenv("SEARCH_CLIENT_MAX_FAILURES", "3"))
+            )
+    return _client_pool
+
 class DDGS:
-    def __init__(self, timeout=20):
+    def __init__(self, timeout=20, use_cache=True, deadline=None):
         self.timeout = timeout
-        self.real_ddgs = RealDDGS(timeout=timeout) if RealDDGS else None
+        self.use_cache = use_cache
+        # 검색 단계 전체 마감 시각 (time.monotonic 기준, None이면 무제한)
+        self.deadline = deadline
 
     def __enter__(self):
         return self
@@ -46,38 +359,144 @@ class DDGS:
     def __exit__(self, exc_type, exc_val, exc_tb):
         pass
 
-    def _safe_search(self, method_name, *args, **kwargs):
-        """검색 실행 및 재시도, 실패 시 안전한 더미 데이터 반환"""
-        if not self.real_ddgs:
-            return self._fallback_results(*args, **kwargs)
+    def _remaining(self):
+        """마감까지 남은 시간 (요청 1회의 timeout을 넘지 않음)"""
+        if self.deadline is None:
+            return self.timeout
+        return min(self.timeout, self.deadline - time.monotonic())
 
-        method = getattr(self.real_ddgs, method_name)
+    def _safe_search(self, method_name, *args, use_cache=None, **kwargs):
+        """캐시 조회 후 검색 실행 및 재시도, 실패 시 안전한 더미 데이터 반환"""
+        if use_cache is None:
+            use_cache = self.use_cache
+        # 키워드/지역/기간/메서드별로 캐싱, 폴백 데이터는 저장하지 않음
+        key = DiskCache.make_key(method_name, *args, kwargs)
+        results = get_search_cache().get_or_set(
+            key,
+            lambda: self._search_with_retry(method_name, *args, **kwargs),
+            bypass=not use_cache,
+            wait_timeout=max(0, self._remaining())
+        )
+        return results if results else self._fallback_results(*args, **kwargs)
+
+    def _search_with_retry(self, method_name, *args, **kwargs):
+        """실제 검색 실행 및 재시도 (실패 시 None)"""
+        if get_client_pool() is None:
+            return None
+
+        limiter, breaker = _get_guard()
+        max_attempts = int(os.getenv("SEARCH_MAX_ATTEMPTS", "3"))
+        
+        for attempt in range(max_attempts):
+            # 시도별 span: outcome = ok / empty / error / timeout / deadline / breaker_open / rate_limited
+            with tracing.span("search.attempt", method=method_name, query=args[0] if args else "", attempt=attempt + 1) as span:
+                # 마감 시간 소진 시 즉시 종료
+                if self._remaining() <= 0:
+                    span.set(outcome="deadline")
+                    return None
+                # 브레이커가 열려 있으면 대기 없이 즉시 폴백
+                if not breaker.allow():
+                    span.set(outcome="breaker_open")
+                    return None
+                # 전체 프로세스 공용 속도 제한
+                waited = time.monotonic()
+                acquired = limiter.acquire(timeout=max(0, self._remaining()))
+                span.set(rate_wait_ms=round((time.monotonic() - waited) * 1000, 1))
+                if not acquired:
+                    breaker.release()
+                    span.set(outcome="rate_limited")
+                    return None
+                try:
+                    results = self._hedged_call(method_name, args, kwargs, self._remaining())
+                    if results is None:
+                        # 남은 시간 안에 응답 없음 (차단 여부는 알 수 없으므로 브레이커에 반영하지 않음)
+                        breaker.release()
+                        span.set(outcome="timeout")
+                        return None
+                    breaker.record_success()
+                    if results:
+                        span.set(outcome="ok", results=len(results))
+                        return results
+                    # 결과가 비어있으면 일시적 차단 가능성 → 백오프 후 재시도
+                    span.set(outcome="empty")
+                except Exception as e:
+                    breaker.record_failure()
+                    span.set(outcome="error", error=f"{type(e).__name__}: {e}")
+            if attempt < max_attempts - 1:
+                delay = min(_backoff_delay(attempt), self._remaining())
+                if delay > 0:
+                    with tracing.span("search.backoff", method=method_name, attempt=attempt + 1):
+                        time.sleep(delay)
         
-        # 최대 3회 재시도
-        for attempt in range(3):
+        # 재시도 소진 → 호출부에서 폴백 데이터 반환
+        return None
+
+    def _hedged_call(self, method_name, args, kwargs, time_limit):
+        """검색 1회 실행 (time_limit 초 안에 응답이 없으면 None)
+
+        응답이 최근 지연 백분위수보다 늦으면 풀의 다른 클라이언트로 복제 요청을 보내
+        먼저 도착한 응답을 사용합니다. 둘 다 실패하면 마지막 예외를 그대로 올립니다.
+        마감을 넘겨 버려진 요청은 끝날 때까지 클라이언트를 쥐고 있다가 반납합니다.
+        """
+        latency, executor = _get_hedging()
+        pool = get_client_pool()
+
+        def call(pooled):
+            ok = False
             try:
+                started = time.monotonic()
                 # 제너레이터를 리스트로 변환하여 실제 데이터 확보 시도
-                results = list(method(*args, **kwargs))
-                if results:
-                    return results
-                # 결과가 비어있으면 잠시 대기 후 재시도 (일시적 차단 가능성)
-                time.sleep(1 + attempt)
-            except Exception as e:
-                # 에러 발생 시 대기 후 재시도
-                time.sleep(2 + attempt)
-        
-        # 3회 실패 시 폴백 데이터 반환
-        return self._fallback_results(*args, **kwargs)
+                results = list(getattr(pooled.client, method_name)(*args, **kwargs))
+                latency.record(method_name, time.monotonic() - started)
+                ok = True
+                return results
+            finally:
+                pool.release(pooled, ok)
+
+        started = time.monotonic()
+        deadline = started + time_limit
+        pooled = pool.acquire(self.timeout, wait=max(0, time_limit))
+        if pooled is None:
+            # 남은 시간 안에 빈 클라이언트가 없음 → 응답 없음과 같게 처리
+            return None
+        hedge_after = latency.hedge_delay(method_name)
+        hedged = hedge_after is None
+        pending = {executor.submit(call, pooled)}
+        error = None
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                return None
+            timeout = deadline - now
+            if not hedged:
+                timeout = min(timeout, max(0, started + hedge_after - now))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+            if not done and not hedged:
+                hedged = True
+                # 복제 요청은 바로 빌릴 수 있는 클라이언트와 속도 제한 토큰이 있을 때만
+                spare = pool.acquire(self.timeout, wait=0)
+                if spare is not None:
+                    if _get_guard()[0].acquire(timeout=0):
+                        latency.record_hedge()
+                        pending.add(executor.submit(call, spare))
+                    else:
+                        pool.release(spare, True)
+        raise error
 
-    def news(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10):
-        return self._safe_search('news', keywords, region=region, safesearch=safesearch, timelimit=timelimit, max_results=max_results)
+    def news(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10, use_cache=None):
+        return self._safe_search('news', keywords, region=region, safesearch=safesearch, timelimit=timelimit, max_results=max_results, use_cache=use_cache)
 
-    def text(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10):
-        return self._safe_search('text', keywords, region=region, safesearch=safesearch, timelimit=timelimit, max_results=max_results)
+    def text(self, keywords, region='kr-kr', safesearch='off', timelimit=None, max_results=10, use_cache=None):
+        return self._safe_search('text', keywords, region=region, safesearch=safesearch, timelimit=timelimit, max_results=max_results, use_cache=use_cache)
     
     def _fallback_results(self, keywords, **kwargs):
         """검색 실패 시 AI 환각 방지를 위한 에러 메시지 반환"""
-        print(f"[System] 검색 연결 불안정: {keywords}")
+        tracing.event("search.fallback", query=keywords)
         
         # 환각(Hallucination)의 원인이 되는 더미 데이터 제거
         # 검색 엔진이 차단되었을 때 AI가 엉뚱한 소설을 쓰지 않도록 명시적인 에러 텍스트 반환
@@ -85,7 +504,8 @@ class DDGS:
             {
                 "title": "❌ 검색 제한(Rate Limit) 감지됨",
                 "body": "DuckDuckGo 검색 사용량이 많아 IP가 일시적으로 차단되었습니다. 잠시 후 다시 시도하거나 IP를 변경(공유기 재부팅 등)해 주세요. 이 상태에서는 정상적인 글 작성이 불가능합니다.",
-                "url": "https://duckduckgo.com"
+                "url": "https://duckduckgo.com",
+                "fallback": True
             }
         ]
 
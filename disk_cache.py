@@ -0,0 +1,154 @@
+# 여러 세션/프로세스가 공유하는 SQLite 기반 디스크 캐시입니다.
+# TTL 만료 + 최대 개수/용량 초과 시 가장 오래 사용하지 않은 항목(LRU)부터 제거합니다.
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+
+class DiskCache:
+    def __init__(self, path, table="cache", ttl=900, max_entries=2000, max_bytes=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        # 스레드 간 연결 공유 (모든 접근은 self._lock으로 직렬화)
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed)")
+
+    @staticmethod
+    def make_key(*parts):
+        """키 구성요소를 안정적인 문자열 키로 변환"""
+        return json.dumps(parts, ensure_ascii=False, sort_keys=True)
+
+    def get(self, key):
+        """캐시 조회 (만료 시 None), 조회된 항목은 최근 사용 시각 갱신"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """캐시 저장 후 최대 개수/용량을 넘으면 LRU 순서로 제거"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created < ?", (now - self.ttl,))
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY accessed ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            if self.max_bytes:
+                self._evict_bytes()
+
+    def _evict_bytes(self):
+        """저장 용량이 max_bytes 이하가 될 때까지 오래된 항목부터 제거 (호출 측에서 잠금)"""
+        total = self._conn.execute(f"SELECT COALESCE(SUM(LENGTH(CAST(value AS BLOB))), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(f"SELECT key, LENGTH(CAST(value AS BLOB)) FROM {self.table} ORDER BY accessed ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+
+    def get_or_set(self, key, compute, bypass=False, cacheable=None, wait_timeout=None):
+        """캐시 우선 조회, 없으면 compute() 실행 후 저장
+
+        - bypass=True: 캐시를 읽지 않고 새로 계산한 값으로 덮어씀
+        - 같은 키를 동시에 요청하면 한 번만 계산하고 나머지는 그 결과를 공유
+          (wait_timeout 초 안에 선행 요청이 끝나지 않으면 None)
+        - cacheable(value)가 False인 값(예: 폴백 데이터)은 저장하지 않음
+        """
+        if bypass:
+            self.bypasses += 1
+            value = compute()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(key, value)
+            return value
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            # 같은 키를 먼저 요청한 스레드의 결과를 기다림
+            if not event.wait(wait_timeout):
+                return None
+            value = self.get(key)
+            if value is not None:
+                return value
+            return compute()
+
+        try:
+            value = compute()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def stats(self):
+        """히트/미스 카운터와 현재 크기"""
+        with self._lock:
+            size = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
@@ -0,0 +1,287 @@
+# 여러 Gemini API 키 / 대체 모델을 묶어 쓰는 클라이언트 풀입니다.
+# 키마다 동시 요청 수와 분당 요청 수(RPM)를 제한하고, 가장 한가한 키로 요청을 보내며
+# 한도 초과(429)나 서버 오류(5xx)가 나면 그 키(해당 모델)를 잠시 쉬게 하고 다른 키 → 다음 모델 순으로 넘깁니다.
+# GenerativeModel과 같은 generate_content / model_name을 제공하므로 pipeline.generate_text에 그대로 끼울 수 있습니다.
+
+import time
+import threading
+from collections import deque
+
+
+class GeminiPoolError(RuntimeError):
+    pass
+
+
+def classify_error(error):
+    """예외 → "quota"(429) / "server"(5xx, 타임아웃) / "fatal"(요청 자체 문제)"""
+    code = getattr(error, "code", None)
+    code = code if isinstance(code, int) else None
+    text = str(error).lower()
+    if code == 429 or text.startswith("429") or "quota" in text or "exhausted" in text or "rate limit" in text:
+        return "quota"
+    if (code and 500 <= code < 600) or text[:3] in ("500", "502", "503", "504") or "deadline" in text or "unavailable" in text:
+        return "server"
+    return "fatal"
+
+
+def full_model_name(name):
+    """GenerativeModel.model_name과 같은 "models/..." 형태"""
+    return name if name.startswith("models/") else f"models/{name}"
+
+
+class KeyedModel:
+    """API 키 1개 전용 모델 (GenerativeModel과 같은 generate_content / model_name, 응답도 같은 GenerateContentResponse)
+
+    genai.configure는 전역 설정이라 키마다 공개 클라이언트(GenerativeServiceClient)를 만들어 요청을 직접 보냄
+    """
+
+    def __init__(self, api_key, model_name):
+        from google.ai import generativelanguage as glm
+
+        self.model_name = full_model_name(model_name)
+        self._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+    def generate_content(self, prompt, stream=False):
+        from google.ai import generativelanguage as glm
+        from google.generativeai.types import GenerateContentResponse
+
+        request = glm.GenerateContentRequest(
+            model=self.model_name,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])]
+        )
+        if stream:
+            return GenerateContentResponse.from_iterator(self._client.stream_generate_content(request))
+        return GenerateContentResponse.from_response(self._client.generate_content(request))
+
+
+def default_model_factory(api_key, model_name):
+    """키별 모델"""
+    return KeyedModel(api_key, model_name)
+
+
+class KeySlot:
+    """API 키 1개의 동시 요청/RPM 한도, 모델별 쉬는 시간, 사용 통계"""
+
+    def __init__(self, index, api_key, concurrency, rpm):
+        self.label = f"key{index + 1}"
+        self.masked = f"{api_key[:4]}…{api_key[-4:]}" if len(api_key) > 8 else "…"
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.rpm = rpm
+        self.inflight = 0
+        self.recent = deque()
+        # Gemini 한도는 키×모델 단위라 쉬는 시간도 모델별로 (대체 모델은 같은 키로 계속 시도)
+        self.cooldowns = {}
+        self.requests = 0
+        self.failures = 0
+        self.quota_errors = 0
+        self.server_errors = 0
+        self.last_error = ""
+
+    def _trim(self, now):
+        while self.recent and now - self.recent[0] >= 60:
+            self.recent.popleft()
+
+    def cooling(self, model_name, now):
+        return now < self.cooldowns.get(model_name, 0.0)
+
+    def available(self, now):
+        self._trim(now)
+        if self.inflight >= self.concurrency:
+            return False
+        return not self.rpm or len(self.recent) < self.rpm
+
+    def rpm_free_in(self, now):
+        """RPM 한도로 막혔으면 풀릴 때까지 남은 초 (동시 요청 한도로 막힌 경우는 None: 반납 시 깨움)"""
+        if self.rpm and len(self.recent) >= self.rpm:
+            return 60 - (now - self.recent[0])
+        return None
+
+
+class GeminiPool:
+    """키 여러 개 × 모델 여러 개를 하나의 모델처럼 쓰는 풀
+
+    - keys: API 키 목록, models: 우선순위 순 모델명 목록 (앞의 모델이 모든 키에서 실패하면 다음 모델)
+    - concurrency / rpm: 키별 동시 요청 수 / 분당 요청 수 한도 (rpm=0이면 무제한)
+    - quota_cooldown / server_cooldown: 429 / 5xx 후 그 키를 쉬게 하는 초
+    - model_factory(api_key, model_name): 실제 모델 생성 (테스트/벤치마크에서는 가짜 모델)
+    """
+
+    def __init__(self, keys, models, concurrency=4, rpm=0, quota_cooldown=60, server_cooldown=5,
+                 acquire_timeout=30, model_factory=default_model_factory):
+        if not keys:
+            raise GeminiPoolError("GEMINI_API_KEY(S)가 설정되지 않았습니다.")
+        self.models = list(models)
+        # 응답 캐시 조회 키로 쓰이므로 GenerativeModel.model_name과 같은 "models/..." 형태로
+        # (실제로 응답한 모델은 응답의 served_model — 대체 모델 응답이 기본 모델 응답으로 저장되지 않도록)
+        self.model_name = full_model_name(self.models[0])
+        self.quota_cooldown = quota_cooldown
+        self.server_cooldown = server_cooldown
+        self.acquire_timeout = acquire_timeout
+        self.slots = [KeySlot(i, key, concurrency, rpm) for i, key in enumerate(keys)]
+        self.model_usage = {name: 0 for name in self.models}
+        self._factory = model_factory
+        self._clients = {}
+        self._cond = threading.Condition()
+
+    def _client(self, slot, model_name):
+        key = (slot.label, model_name)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = self._factory(slot.api_key, model_name)
+        return client
+
+    def _acquire(self, model_name, exclude):
+        """exclude에 없고 model_name으로 쉬는 중이 아닌 키 중 진행 중 요청이 가장 적은 키
+
+        모두 바쁘면(동시 요청/RPM 한도) 자리가 날 때까지 대기, 쓸 키가 하나도 없으면 None (→ 다음 모델)
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                candidates = [s for s in self.slots if s.label not in exclude and not s.cooling(model_name, now)]
+                if not candidates:
+                    return None
+                ready = [s for s in candidates if s.available(now)]
+                if ready:
+                    slot = min(ready, key=lambda s: (s.inflight, len(s.recent)))
+                    slot.inflight += 1
+                    slot.requests += 1
+                    slot.recent.append(now)
+                    return slot
+                if now >= deadline:
+                    raise GeminiPoolError("사용 가능한 API 키가 없습니다 (모든 키가 한도 도달 또는 쉬는 중).")
+                waits = [w for w in (s.rpm_free_in(now) for s in candidates) if w is not None]
+                self._cond.wait(min(waits + [deadline - now]))
+
+    def _release(self, slot, model_name, error=None, served=False):
+        with self._cond:
+            slot.inflight -= 1
+            if served:
+                self.model_usage[model_name] += 1
+            if error is not None:
+                kind = classify_error(error)
+                slot.failures += 1
+                slot.last_error = f"{type(error).__name__}: {error}"[:200]
+                if kind == "quota":
+                    slot.quota_errors += 1
+                    slot.cooldowns[model_name] = time.monotonic() + self.quota_cooldown
+                elif kind == "server":
+                    slot.server_errors += 1
+                    slot.cooldowns[model_name] = time.monotonic() + self.server_cooldown
+            self._cond.notify_all()
+
+    def _attempts(self):
+        """(모델명, 키) 순서로 시도 대상 생성: 모델마다 아직 실패하지 않은 키를 한가한 순으로"""
+        for model_name in self.models:
+            tried = set()
+            while True:
+                slot = self._acquire(model_name, tried)
+                if slot is None:
+                    break
+                tried.add(slot.label)
+                yield model_name, slot
+
+    def _exhausted(self, last_error):
+        """더 시도할 키/모델이 없을 때의 오류 (실패 없이 끝났으면 모두 쉬는 중이므로 모델별 남은 시간을 알려줌)"""
+        if last_error is not None:
+            return GeminiPoolError(f"모든 API 키/모델에서 실패했습니다: {last_error}")
+        now = time.monotonic()
+        with self._cond:
+            waits = [
+                f"{name} {max(0.0, min(s.cooldowns.get(name, 0.0) for s in self.slots) - now):.0f}초"
+                for name in self.models
+            ]
+        return GeminiPoolError(f"모든 API 키가 쉬는 중입니다 (다시 시도까지 {', '.join(waits)})")
+
+    def generate_content(self, prompt, stream=False):
+        if stream:
+            return _PooledStream(self, prompt)
+        last_error = None
+        for model_name, slot in self._attempts():
+            try:
+                response = self._client(slot, model_name).generate_content(prompt)
+            except Exception as e:
+                self._release(slot, model_name, e)
+                if classify_error(e) == "fatal":
+                    raise
+                last_error = e
+                continue
+            self._release(slot, model_name, served=True)
+            return _PooledResponse(response, full_model_name(model_name))
+        raise self._exhausted(last_error)
+
+    def stats(self):
+        """키별 상태 (UI 표시용, 키 값은 앞뒤 4자리만)"""
+        now = time.monotonic()
+        with self._cond:
+            keys = []
+            for s in self.slots:
+                s._trim(now)
+                cooldown = max([until - now for until in s.cooldowns.values()] + [0.0])
+                keys.append({
+                    "key": s.label,
+                    "masked": s.masked,
+                    "healthy": cooldown == 0,
+                    "cooldown": round(cooldown, 1),
+                    "inflight": s.inflight,
+                    "rpm_used": len(s.recent),
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "quota_errors": s.quota_errors,
+                    "server_errors": s.server_errors,
+                    "last_error": s.last_error
+                })
+            return {"keys": keys, "models": dict(self.model_usage)}
+
+
+class _PooledResponse:
+    """일반 응답 + 실제로 응답한 모델 이름 (served_model, 나머지 속성은 원래 응답 그대로)"""
+
+    def __init__(self, response, served_model):
+        self._response = response
+        self.served_model = served_model
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+class _PooledStream:
+    """스트리밍 응답: 첫 청크가 오기 전 실패하면 다른 키/모델로 넘기고, 청크가 나간 뒤의 실패는 그대로 올림"""
+
+    def __init__(self, pool, prompt):
+        self._pool = pool
+        self._prompt = prompt
+        self._response = None
+        # 스트림이 끝난 뒤 실제로 응답한 모델 (대체 모델로 넘어갔을 수 있음)
+        self.served_model = None
+
+    @property
+    def usage_metadata(self):
+        return getattr(self._response, "usage_metadata", None)
+
+    def __iter__(self):
+        last_error = None
+        for model_name, slot in self._pool._attempts():
+            started = False
+            try:
+                response = self._pool._client(slot, model_name).generate_content(self._prompt, stream=True)
+                for chunk in response:
+                    started = True
+                    yield chunk
+                self._response = response
+                self.served_model = full_model_name(model_name)
+            except Exception as e:
+                self._pool._release(slot, model_name, e)
+                if started or classify_error(e) == "fatal":
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # 소비자가 중간에 멈춘 경우(GeneratorExit 등)에도 키 반납
+                self._pool._release(slot, model_name)
+                raise
+            self._pool._release(slot, model_name, served=True)
+            return
+        raise self._pool._exhausted(last_error)
@@ -0,0 +1,178 @@
+# 원고 생성을 스크립트 스레드 밖에서 돌리는 프로세스 공용 작업 실행기입니다.
+# 작업은 ID로 조회하고 페이지는 상태(대기 → 검색 → 생성 → 조립 → 완료)만 폴링하므로
+# 리런이나 모드 전환에도 작업과 결과가 유지됩니다.
+# 대기열은 사용자(세션)별로 나눠 돌아가며 꺼내므로, 한 사람이 여러 건을 쌓아도 다른 사용자가 뒤에 밀리지 않습니다.
+
+import time
+import uuid
+import threading
+from collections import OrderedDict, deque
+
+STAGE_LABELS = {
+    "queued": "⏳ 대기 중",
+    "searching": "🔎 검색 중",
+    "generating": "✍️ 생성 중",
+    "lengthening": "📐 글자수 보정 중",
+    "fixing": "🩹 금지 문구 문장 수정 중",
+    "rendering": "🧩 조립 중",
+    "done": "✅ 완료",
+    "error": "❌ 오류",
+    "cancelled": "🚫 취소됨"
+}
+
+FINISHED = ("done", "error", "cancelled")
+
+
+class Job:
+    def __init__(self, owner, kind, label, fn):
+        self.id = uuid.uuid4().hex[:12]
+        self.owner = owner
+        self.kind = kind
+        self.label = label
+        self.fn = fn
+        self.state = "queued"
+        self.result = None
+        self.error = ""
+        self.created = time.time()
+        self.started = None
+        self.finished_at = None
+        # 일괄 작업의 처리 건수 (done, total)와 건별 결과 한 줄씩
+        self.progress = None
+        self._chunks = []
+        self._notes = []
+
+    @property
+    def finished(self):
+        return self.state in FINISHED
+
+    def set_stage(self, stage):
+        """진행 단계 갱신 (워커 스레드에서 호출)"""
+        self.state = stage
+
+    def append(self, chunk):
+        """스트리밍 청크 누적 (워커 스레드에서 호출, 페이지는 text()로 미리보기, 작업이 끝나면 비움)"""
+        self._chunks.append(chunk)
+
+    def text(self):
+        return "".join(self._chunks)
+
+    def set_progress(self, done, total, note=None):
+        """처리 건수 갱신 (여러 건을 처리하는 일괄 작업용, 워커 스레드에서 호출, 작업이 끝나면 note는 비움)"""
+        self.progress = (done, total)
+        if note:
+            self._notes.append(note)
+
+    def notes(self):
+        return list(self._notes)
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started
+
+
+class JobExecutor:
+    """사용자별 대기열을 라운드 로빈으로 처리하는 고정 크기 워커 풀
+
+    - submit(owner, kind, label, fn): fn(job)을 워커 스레드에서 실행, 반환값이 job.result
+    - fn 안에서는 st.* 호출 금지 (진행 상황은 job.set_stage / job.append / job.set_progress로 전달)
+    - 끝난 작업은 최근 history건까지 보관 후 오래된 것부터 삭제
+    """
+
+    def __init__(self, workers=4, history=500):
+        self.workers = workers
+        self.history = history
+        self._jobs = OrderedDict()
+        self._queues = OrderedDict()
+        self._running = 0
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, owner, kind, label, fn):
+        job = Job(owner, kind, label, fn)
+        with self._cond:
+            self._jobs[job.id] = job
+            self._queues.setdefault(owner, deque()).append(job)
+            self._prune()
+            self._cond.notify()
+        return job.id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """아직 시작하지 않은 작업만 취소 가능"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return False
+            queue = self._queues.get(job.owner)
+            if queue and job in queue:
+                queue.remove(job)
+                # 빈 대기열을 남기면 _next_job이 빈 deque에서 꺼내다 워커가 죽음
+                if not queue:
+                    del self._queues[job.owner]
+            job.state = "cancelled"
+            job.finished_at = time.time()
+            return True
+
+    def position(self, job_id):
+        """대기 중인 작업 앞에 남은 내 작업 수 (대기 중이 아니면 None)"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            queue = self._queues.get(job.owner) if job else None
+            if not queue or job not in queue:
+                return None
+            return queue.index(job)
+
+    def stats(self):
+        with self._cond:
+            queued = sum(len(q) for q in self._queues.values())
+            return {"workers": self.workers, "running": self._running, "queued": queued, "owners": len(self._queues)}
+
+    def _next_job(self):
+        """대기열이 있는 첫 사용자의 작업을 꺼내고 그 사용자를 맨 뒤로 보냄 (잠금 상태에서 호출)"""
+        for owner, queue in self._queues.items():
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(owner)
+            else:
+                del self._queues[owner]
+            return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                self._running += 1
+                job.started = time.time()
+                job.state = "searching"
+            try:
+                job.result = job.fn(job)
+                job.state = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.state = "error"
+            finally:
+                job.finished_at = time.time()
+                # 스트리밍 미리보기는 생성 중에만 쓰므로 끝나면 비움 (보관 중인 작업이 응답 원문을 들고 있지 않도록)
+                job._chunks = []
+                job._notes = []
+                with self._cond:
+                    self._running -= 1
+
+    def _prune(self):
+        """보관 한도를 넘은 끝난 작업 삭제 (잠금 상태에서 호출)"""
+        overflow = len(self._jobs) - self.history
+        if overflow <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:overflow]:
+            del self._jobs[job_id]
@@ -0,0 +1,150 @@
+# 모델 응답에서 JSON 원고를 한 번의 선형 스캔으로 추출하는 모듈입니다.
+# 스트리밍 청크를 그대로 넣을 수 있고, 잘리거나 살짝 깨진 응답은 닫히지 않은
+# 문자열/괄호를 닫아 복구하며, 그래도 안 되면 title/content/hashtags 필드만 건집니다.
+
+import re
+import json
+
+# 문자열 밖에서 의미 있는 문자 / 문자열 본문(이스케이프 포함)을 한 번에 건너뛰는 패턴
+_STRUCT = re.compile(r'["{}\[\]]')
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+# 닫는 괄호 직전의 불필요한 쉼표, 값 없이 끝난 키
+_TRAILING_COMMA = re.compile(r',\s*$')
+_DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$', re.DOTALL)
+_COMMA_BEFORE_CLOSE = re.compile(r',(\s*[}\]])')
+
+# 최후 수단: 필드 단위 복구
+RECOVER_FIELDS = ("title", "content", "meta_description", "hashtags")
+_FIELD = re.compile(r'"(' + "|".join(RECOVER_FIELDS) + r')"\s*:\s*"((?:[^"\\]|\\.)*)', re.DOTALL)
+
+
+class JSONStreamExtractor:
+    """첫 번째 JSON 객체를 찾아 모으는 단일 패스 추출기 (feed로 청크 단위 입력)"""
+
+    def __init__(self):
+        self.started = False
+        self.complete = False
+        self._parts = []
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """청크 추가 (객체가 완성된 뒤 들어온 텍스트는 무시)"""
+        if self.complete or not chunk:
+            return
+        pos = 0
+        if not self.started:
+            pos = chunk.find("{")
+            if pos < 0:
+                return
+            self.started = True
+
+        end = len(chunk)
+        stop = None
+        if self._escape:
+            # 이전 청크가 백슬래시로 끝난 경우 이번 첫 글자는 이스케이프된 문자
+            self._escape = False
+            pos += 1
+        while pos < end:
+            if self._in_string:
+                pos = _STRING_BODY.match(chunk, pos).end()
+                if pos >= end:
+                    break
+                if chunk[pos] == "\\":
+                    # 청크가 백슬래시로 끝남 → 다음 청크 첫 글자가 이스케이프 대상
+                    self._escape = True
+                    break
+                self._in_string = False
+                pos += 1
+                continue
+
+            m = _STRUCT.search(chunk, pos)
+            if not m:
+                break
+            c = m.group()
+            pos = m.end()
+            if c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._stack.append(c)
+            elif self._stack:
+                self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+                    stop = pos
+                    break
+
+        start = chunk.find("{") if not self._parts else 0
+        self._parts.append(chunk[start:stop])
+
+    def text(self):
+        """지금까지 모은 JSON 텍스트"""
+        return "".join(self._parts)
+
+    def result(self):
+        """(dict, 복구 여부) 반환, 건질 내용이 전혀 없으면 ValueError"""
+        raw = self.text()
+        if self.complete:
+            try:
+                return json.loads(raw, strict=False), False
+            except ValueError:
+                pass
+        data = self._repair(raw)
+        if data is None:
+            raise ValueError("JSON 형식을 찾을 수 없습니다.")
+        return data, True
+
+    def _repair(self, raw):
+        """열린 문자열/괄호를 닫아 재시도, 실패 시 필드 단위 복구"""
+        if not raw:
+            return None
+        if self.complete:
+            candidates = [raw]
+        else:
+            head = raw[:-1] if self._escape else raw
+            if self._in_string:
+                head += '"'
+            closers = "".join("}" if c == "{" else "]" for c in reversed(self._stack))
+            # 1) 그대로 닫기  2) 값 없이 끝난 키 제거 후 닫기
+            candidates = [
+                _TRAILING_COMMA.sub("", text.rstrip()) + closers
+                for text in (head, _DANGLING_KEY.sub(r'\1', head))
+            ]
+        for candidate in candidates:
+            try:
+                data = json.loads(_COMMA_BEFORE_CLOSE.sub(r'\1', candidate), strict=False)
+            except ValueError:
+                continue
+            if isinstance(data, dict) and data:
+                return data
+        return recover_fields(raw)
+
+    def partial(self):
+        """생성 도중 미리보기용: 현재까지의 내용을 복구한 dict (없으면 빈 dict)"""
+        try:
+            return self.result()[0]
+        except ValueError:
+            return {}
+
+
+def recover_fields(raw):
+    """정규식으로 title/content 등 문자열 필드만 건짐 (없으면 None)"""
+    data = {}
+    for m in _FIELD.finditer(raw):
+        value = m.group(2)
+        if value.endswith("\\") and not value.endswith("\\\\"):
+            value = value[:-1]
+        try:
+            data[m.group(1)] = json.loads(f'"{value}"', strict=False)
+        except ValueError:
+            data[m.group(1)] = value.replace('\\n', '\n').replace('\\"', '"')
+    return data or None
+
+
+def extract_json(raw_text):
+    """응답 전체에서 JSON 추출 → (dict, 복구 여부)"""
+    extractor = JSONStreamExtractor()
+    extractor.feed(raw_text)
+    return extractor.result()
@@ -0,0 +1,68 @@
+# 일괄 생성용 키워드 묶음 모듈입니다.
+# "무선 청소기 추천", "무선 청소기 추천 2025", "다이슨 무선 청소기"처럼 거의 같은 키워드는 검색 결과도 거의 같으므로,
+# 연도/수식어를 뺀 토큰이 많이 겹치는 키워드를 한 묶음으로 모아 묶음당 한 번만 검색합니다.
+# (검색 결과는 pipeline에서 묶음의 키워드마다 다시 골라 압축하므로 키워드별 관련도는 유지)
+
+import re
+
+# 검색 결과를 거의 바꾸지 않는 수식어 (연도/날짜/순위 숫자는 따로 제거)
+MODIFIERS = {"추천", "순위", "비교", "후기", "리뷰", "가격", "정리", "총정리", "최신", "인기", "best", "top"}
+# 정규화한 토큰의 자카드 유사도가 이 이상이면 같은 묶음
+JACCARD_THRESHOLD = 0.5
+
+_TOKEN = re.compile(r'[0-9a-z가-힣]+')
+# 연도("2025", "2025년", "25년") / 날짜("3월", "5일") / 순위("1위", "2등", "3번째")만 제거
+# ("아이폰 15", "갤럭시 s24"의 모델 번호는 검색 대상 자체가 바뀌므로 남김)
+_NUMBER = re.compile(r'(?:19|20)\d{2}년?|\d{1,2}(?:년|월|일)|\d+(?:위|등|번째)')
+_DIGIT = re.compile(r'\d')
+
+
+def normalize(keyword):
+    """키워드 → 비교용 토큰 집합 (소문자, 연도/날짜/순위와 수식어 제거, 다 지워지면 원래 토큰 사용)"""
+    tokens = _TOKEN.findall((keyword or '').lower())
+    core = {t for t in tokens if t not in MODIFIERS and not _NUMBER.fullmatch(t)}
+    return core or set(tokens)
+
+
+def _numbers(tokens):
+    """숫자가 든 토큰 (모델 번호 등)"""
+    return {t for t in tokens if _DIGIT.search(t)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def cluster_keywords(keywords, threshold=JACCARD_THRESHOLD):
+    """키워드 목록 → 묶음 목록 [[인덱스, ...]] (입력 순서대로, 각 묶음의 첫 키워드가 비교 기준)
+
+    토큰 → 묶음 색인으로 토큰을 하나라도 공유하는 묶음만 비교
+    숫자가 든 토큰(모델 번호)이 기준 키워드와 다르면 나머지가 겹쳐도 다른 묶음 ("아이폰 15 케이스" ≠ "아이폰 16 케이스")
+    """
+    leaders = []
+    clusters = []
+    index = {}
+    for i, keyword in enumerate(keywords):
+        tokens = normalize(keyword)
+        best, best_score = None, 0.0
+        numbers = _numbers(tokens)
+        for c in sorted({c for t in tokens for c in index.get(t, ())}):
+            if _numbers(leaders[c]) != numbers:
+                continue
+            score = jaccard(tokens, leaders[c])
+            if score > best_score:
+                best, best_score = c, score
+        if best is not None and best_score >= threshold:
+            clusters[best].append(i)
+            continue
+        for t in tokens:
+            index.setdefault(t, []).append(len(clusters))
+        leaders.append(tokens)
+        clusters.append([i])
+    return clusters
+
+
+def search_keyword(keywords, members):
+    """묶음에서 실제로 검색할 키워드 (다른 키워드들과 가장 많이 겹치는 키워드, 같으면 먼저 나온 것)"""
+    tokens = {i: normalize(keywords[i]) for i in members}
+    return keywords[max(members, key=lambda i: (sum(jaccard(tokens[i], tokens[j]) for j in members if j != i), -i))]
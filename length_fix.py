@@ -0,0 +1,82 @@
+# 원고 글자수 보정 모듈입니다. (모델 호출은 pipeline.enforce_length에서)
+# 본문을 [TITLE] 소제목 단위 섹션으로 나눈 뒤, 짧으면 가장 짧은 섹션 몇 개만 늘리고
+# 길면 가장 긴 섹션 몇 개만 줄이도록 해당 섹션만 담은 프롬프트를 만듭니다.
+# 원고 전체를 다시 생성하는 것보다 입력/출력 토큰이 훨씬 적게 듭니다.
+
+import re
+
+from article_score import TARGET_CHARS, body_text
+
+_HEADING = re.compile(r'\[TITLE\].*?\[/TITLE\]', re.S)
+_CTA = re.compile(r'\[\[CTA_\d+\]\]')
+
+# 한 번에 고칠 최대 섹션 수
+MAX_SECTIONS = 3
+
+
+def split_sections(content):
+    """본문 → 섹션 본문 구간 [(시작, 끝)] (첫 소제목 앞 도입부 포함, 소제목 마커 자체는 제외)"""
+    bounds = []
+    start = 0
+    for m in _HEADING.finditer(content):
+        bounds.append((start, m.start()))
+        start = m.end()
+    bounds.append((start, len(content)))
+    return [(s, e) for s, e in bounds if body_text(content[s:e])]
+
+
+def plan(content, target=TARGET_CHARS):
+    """고칠 섹션과 섹션별 목표 글자수 → ("extend" | "condense" | None, [(시작, 끝, 현재, 목표)])"""
+    low, high = target
+    chars = len(body_text(content))
+    if low <= chars <= high:
+        return None, []
+    sections = [(s, e, len(body_text(content[s:e]))) for s, e in split_sections(content)]
+    if not sections:
+        return None, []
+    goal = (low + high) // 2
+    if chars < low:
+        # 짧은 섹션부터 부족분을 나눠 채움
+        chosen = sorted(sections, key=lambda x: x[2])[:MAX_SECTIONS]
+        extra = (goal - chars) / len(chosen)
+        return "extend", [(s, e, n, int(n + extra)) for s, e, n in sorted(chosen)]
+    # 긴 섹션부터 초과분을 길이 비율대로 덜어냄 (섹션당 절반 이상은 남김)
+    chosen = sorted(sections, key=lambda x: -x[2])[:MAX_SECTIONS]
+    total = sum(n for _, _, n in chosen)
+    surplus = chars - goal
+    return "condense", [(s, e, n, max(n // 2, int(n - surplus * n / total))) for s, e, n in sorted(chosen)]
+
+
+def build_prompt(keyword, action, content, sections):
+    """고칠 섹션만 담은 프롬프트 (응답은 {"1": "섹션 본문", ...})"""
+    verb = "내용을 보강해 늘려" if action == "extend" else "핵심만 남기고 줄여"
+    lines = "\n\n".join(
+        f"[{i}] 목표 약 {goal}자 (현재 {current}자)\n{content[s:e].strip()}"
+        for i, (s, e, current, goal) in enumerate(sections, 1)
+    )
+    return f"""
+'{keyword}' 블로그 원고의 일부 섹션입니다. 각 섹션을 목표 글자수에 맞게 {verb} 다시 쓰세요.
+- 말투, 이모지, <b>태그</b> 강조 방식은 그대로 유지
+- HTML 블록(표, 체크리스트 등)과 [[CTA_1]], [[CTA_2]] 같은 표시는 지우지 말고 그대로 두기
+- 인사말/자기소개/마무리 멘트/날짜 금지, 마크다운 금지
+- 섹션 제목은 쓰지 말고 본문만
+
+{lines}
+
+JSON만 출력하세요: {{"1": "다시 쓴 섹션 본문", "2": "다시 쓴 섹션 본문"}}
+"""
+
+
+def apply(content, sections, rewrites):
+    """다시 쓴 섹션을 본문에 반영 → (새 본문, 바뀐 섹션 수) (원래 있던 CTA 표시가 빠지면 끝에 다시 붙임)"""
+    changed = 0
+    for i, (s, e, _, _) in reversed(list(enumerate(sections, 1))):
+        rewrite = str(rewrites.get(str(i), "")).strip()
+        if not rewrite:
+            continue
+        missing = [m for m in _CTA.findall(content[s:e]) if m not in rewrite]
+        if missing:
+            rewrite += "\n" + "\n".join(missing)
+        content = content[:s] + "\n" + rewrite + "\n" + content[e:]
+        changed += 1
+    return content, changed
@@ -0,0 +1,36 @@
+# 모델 응답을 프롬프트 내용으로 주소를 매겨 저장하는 캐시입니다.
+# 같은 모델 + 같은 프롬프트면 Gemini를 다시 호출하지 않고 저장된 응답을 재생합니다.
+
+import hashlib
+import threading
+from disk_cache import DiskCache
+
+
+class LLMResponseCache:
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=1000, max_bytes=50 * 1024 * 1024):
+        self.store = DiskCache(path, table="llm", ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name, prompt):
+        """모델명 + 완성된 프롬프트의 SHA-256"""
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, model_name, prompt):
+        """저장된 응답 텍스트 (없거나 만료되면 None), 히트 시 절약 토큰 누적"""
+        entry = self.store.get(self.make_key(model_name, prompt))
+        if entry is None:
+            return None
+        with self._lock:
+            self.tokens_saved += entry.get("tokens", 0)
+        return entry["text"]
+
+    def put(self, model_name, prompt, text, tokens=0):
+        if text:
+            self.store.set(self.make_key(model_name, prompt), {"text": text, "tokens": tokens})
+
+    def stats(self):
+        stats = self.store.stats()
+        stats["tokens_saved"] = self.tokens_saved
+        return stats
@@ -0,0 +1,179 @@
+# 철칙 금지 문구 검사 모듈입니다.
+# 프롬프트 [철칙]의 금지 문구 전체를 Aho-Corasick 자동자 하나로 컴파일해 본문을 한 번만 훑고,
+# 날짜 표기는 정규식 한 번으로 찾아 위반 위치(시작/끝)를 돌려줍니다.
+# 금지 문구는 스타일(프롬프트)마다 다르므로 스타일별 자동자를 따로 둡니다.
+# 원고 1건은 수백 µs 수준이라 저장된 원고 수천 건도 몇 초 안에 전수 검사할 수 있습니다.
+#
+#   python phrase_guard.py posts.jsonl      # title/content 필드를 가진 JSONL 전수 검사 (style/keyword 필드가 있으면 반영)
+
+import re
+import sys
+import json
+import time
+
+# 네이버 수익형 프롬프트 [철칙]의 금지 문구 (분류별)
+BANNED_PHRASES = {
+    "인사": ["안녕하세요", "오늘은", "알아보겠습니다"],
+    "메타": ["태그를 사용", "방식으로", "구조는"],
+    "자기소개": ["저는", "블로거", "리뷰어", "전문가입니다", "년차", "운영중"],
+    "쿠팡": ["쿠팡에서", "쿠팡으로", "쿠팡 파트너스"],
+    "마무리": ["결론", "마무리", "마치며", "정리하면", "요약하면", "끝으로", "마지막으로"],
+    # [철칙] 8번의 상대 날짜 ("오늘은" 인사와 겹쳐도 둘 다 위반)
+    "날짜": ["오늘", "어제", "내일"]
+}
+# 스타일별 금지 문구 (각 프롬프트의 [철칙]/[절대 규칙] 그대로)
+# 정보성 프롬프트는 메타/쿠팡 조항이 없고 마무리도 "결론/마무리/마치며"만 금지 — 페르소나가 "정리하면"을 쓰라고 함
+_INFO_PHRASES = {
+    "인사": BANNED_PHRASES["인사"],
+    "자기소개": BANNED_PHRASES["자기소개"],
+    "마무리": ["결론", "마무리", "마치며"]
+}
+STYLE_PHRASES = {
+    "naver_profit": BANNED_PHRASES,
+    "naver_info": _INFO_PHRASES,
+    "tistory_info": _INFO_PHRASES
+}
+DEFAULT_STYLE = "naver_profit"
+# 날짜 노출 ("2025년", "1월", "1월 5일" 등, "3개월"/"5일 만에" 같은 기간은 제외)
+DATE_PATTERN = re.compile(r'\d{4}\s*년|(?<!\d)\d{1,2}\s*월(?:\s*\d{1,2}\s*일)?')
+
+
+class PhraseMatcher:
+    """여러 문구를 한 번에 찾는 Aho-Corasick 자동자
+
+    실패 링크를 미리 따라가 상태별 전이표(DFA)로 펼쳐 두므로 글자 1개당 dict 조회 1번으로 진행
+    (문구에 없는 글자는 곧바로 시작 상태로 돌아감)
+    """
+
+    def __init__(self, phrases):
+        """phrases: {문구: 분류}"""
+        goto = [{}]
+        outputs = [[]]
+        for phrase, category in phrases.items():
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((phrase, category))
+
+        # 너비 우선으로 실패 링크를 계산하면서 전이표를 완성
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs = outputs
+
+    def finditer(self, text):
+        """(시작, 끝, 문구, 분류) — 겹치는 문구도 모두"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for phrase, category in outputs[state]:
+                    yield i + 1 - len(phrase), i + 1, phrase, category
+
+
+def _compile(phrases):
+    return PhraseMatcher({phrase: category for category, items in phrases.items() for phrase in items})
+
+
+MATCHERS = {style: _compile(phrases) for style, phrases in STYLE_PHRASES.items()}
+MATCHER = MATCHERS[DEFAULT_STYLE]
+
+
+def _keyword_spans(text, keyword):
+    """본문에서 키워드가 나오는 구간 [(시작, 끝)]"""
+    spans = []
+    if keyword:
+        start = text.find(keyword)
+        while start != -1:
+            spans.append((start, start + len(keyword)))
+            start = text.find(keyword, start + 1)
+    return spans
+
+
+def find_violations(text, matcher=MATCHER, keyword=None):
+    """금지 문구 + 날짜 위반 → [(시작, 끝, 문구, 분류)] (위치순)
+
+    keyword가 주어지면 키워드 안에 걸친 위반은 제외 ("2025년 최저임금"의 "2025년"은 위반 아님)
+    """
+    found = list(matcher.finditer(text))
+    found += [(m.start(), m.end(), m.group(), "날짜") for m in DATE_PATTERN.finditer(text)]
+    spans = _keyword_spans(text, keyword)
+    if spans:
+        found = [v for v in found if not any(v[0] < e and s < v[1] for s, e in spans)]
+    found.sort()
+    return found
+
+
+def check_article(data, style=DEFAULT_STYLE, keyword=None):
+    """모델 JSON(dict)의 title/content를 스타일의 철칙으로 검사 → {"title": [...], "content": [...]} (위반 없는 필드는 빈 목록)"""
+    matcher = MATCHERS.get(style, MATCHER)
+    return {field: find_violations(data.get(field, '') or '', matcher, keyword) for field in ("title", "content")}
+
+
+# 문장 경계: 문장부호/줄바꿈 + 태그·마커 경계 (수정할 문장에 HTML/마커가 섞이지 않도록)
+_BOUNDARY = re.compile(r'[.!?。\n<>\[\]]')
+
+
+def sentence_spans(text, violations):
+    """위반 위치를 포함하는 문장 구간 [(시작, 끝)] (겹치면 합침)"""
+    spans = []
+    for start, end, _, _ in violations:
+        left = start
+        while left > 0 and not _BOUNDARY.match(text, left - 1):
+            left -= 1
+        m = _BOUNDARY.search(text, end)
+        right = len(text) if m is None else (m.end() if text[m.start()] in ".!?。" else m.start())
+        while left < right and text[left].isspace():
+            left += 1
+        if spans and left <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], right))
+        else:
+            spans.append((left, right))
+    return spans
+
+
+def audit(records):
+    """원고 목록(title/content dict) 전수 검사 → (위반 원고 수, 분류별 건수, 초)"""
+    started = time.perf_counter()
+    flagged = 0
+    counts = {}
+    for data in records:
+        result = check_article(data, data.get("style") or DEFAULT_STYLE, data.get("keyword"))
+        hits = result["title"] + result["content"]
+        if hits:
+            flagged += 1
+        for _, _, _, category in hits:
+            counts[category] = counts.get(category, 0) + 1
+    return flagged, counts, time.perf_counter() - started
+
+
+def main(paths):
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+    flagged, counts, seconds = audit(records)
+    print(f"{len(records)}건 중 {flagged}건 위반 · {seconds:.2f}초")
+    for category, count in sorted(counts.items(), key=lambda x: -x[1]):
+        print(f"  {category}: {count}건")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
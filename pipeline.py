@@ -0,0 +1,1104 @@
+# 검색 → 프롬프트 → 생성 → 조립 파이프라인입니다. Streamlit 없이 import해서 쓸 수 있습니다.
+# (웹 UI는 1.py, 명령줄 실행은 cli.py)
+# 모델/검색 풀/응답 캐시는 처음 쓰는 시점에 프로세스당 한 번만 만들고 이후 재사용합니다.
+
+import os
+import re
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime
+
+import tracing
+from ddgs import DDGS
+from gemini_pool import GeminiPool
+from json_extract import extract_json
+from llm_cache import LLMResponseCache
+from article_store import ArticleStore
+from phrase_guard import DEFAULT_STYLE, check_article, sentence_spans
+from article_score import body_text, score_article
+from prompt_budget import budget_facts, estimate_tokens
+import length_fix
+from snippet_dedup import dedup_snippets, shingles
+from keyword_cluster import cluster_keywords, search_keyword
+from render import NAVER_PROFIT_STYLE, NAVER_INFO_STYLE, TISTORY_INFO_STYLE, render_article
+
+MODEL_NAME = 'gemini-3-flash-preview'
+
+# ==========================================
+# 1. 공용 리소스
+# ==========================================
+
+_resources = {}
+_resources_lock = threading.Lock()
+
+def _resource(name, factory):
+    """name별로 factory()를 한 번만 실행해 재사용"""
+    with _resources_lock:
+        if name not in _resources:
+            _resources[name] = factory()
+        return _resources[name]
+
+def configure(api_key=None, model_name=MODEL_NAME):
+    """Gemini 클라이언트 풀 설정 (키/모델 구성이 바뀌면 새로 생성)
+
+    - 키: api_key(쉼표로 여러 개) → GEMINI_API_KEYS → GEMINI_API_KEY
+    - 모델: model_name 뒤에 GEMINI_FALLBACK_MODELS(쉼표 구분)를 대체 모델로 이어 붙임
+    - 키별 한도: GEMINI_KEY_CONCURRENCY(기본 4) / GEMINI_KEY_RPM(기본 0 = 무제한)
+    """
+    raw_keys = api_key or os.getenv("GEMINI_API_KEYS") or os.getenv("GEMINI_API_KEY") or ""
+    keys = [k.strip() for k in raw_keys.split(",") if k.strip()]
+    if not keys:
+        raise RuntimeError("GEMINI_API_KEY가 설정되지 않았습니다.")
+    fallbacks = [m.strip() for m in os.getenv("GEMINI_FALLBACK_MODELS", "").split(",") if m.strip()]
+    models = [model_name] + [m for m in fallbacks if m != model_name]
+    with _resources_lock:
+        if _resources.get("model_key") != (tuple(keys), tuple(models)):
+            _resources["model"] = GeminiPool(
+                keys, models,
+                concurrency=int(os.getenv("GEMINI_KEY_CONCURRENCY", "4")),
+                rpm=int(os.getenv("GEMINI_KEY_RPM", "0")),
+                quota_cooldown=float(os.getenv("GEMINI_QUOTA_COOLDOWN", "60")),
+                server_cooldown=float(os.getenv("GEMINI_SERVER_COOLDOWN", "5"))
+            )
+            _resources["model_key"] = (tuple(keys), tuple(models))
+        return _resources["model"]
+
+def set_model(model):
+    """미리 만든 모델 객체를 그대로 사용 (벤치마크의 가짜 모델 등, generate_content/model_name 필요)"""
+    with _resources_lock:
+        _resources["model"] = model
+        _resources["model_key"] = None
+
+def get_model():
+    """설정된 모델 (configure 전이면 환경변수로 설정)"""
+    model = _resources.get("model")
+    return model if model is not None else configure()
+
+def model_pool_stats():
+    """키별 상태/모델별 사용 수 (풀이 아닌 모델을 set_model로 넣었으면 None)"""
+    model = _resources.get("model")
+    return model.stats() if isinstance(model, GeminiPool) else None
+
+def get_search_pool():
+    """검색 팬아웃 전용 스레드 풀 (검색 클라이언트는 ddgs의 공용 클라이언트 풀에서 빌려 씀)"""
+    return _resource("search_pool", lambda: ThreadPoolExecutor(
+        max_workers=int(os.getenv("SEARCH_FANOUT_WORKERS", "16")), thread_name_prefix="search"
+    ))
+
+def get_llm_cache():
+    """모델 응답 캐시 (LLM_CACHE_PATH / LLM_CACHE_TTL / LLM_CACHE_MAX_ENTRIES / LLM_CACHE_MAX_MB)"""
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_cache.sqlite3")
+    return _resource("llm_cache", lambda: LLMResponseCache(
+        os.getenv("LLM_CACHE_PATH", default_path),
+        ttl=int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000")),
+        max_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024
+    ))
+
+def get_article_store():
+    """생성된 원고 저장소 (ARTICLE_STORE_PATH / ARTICLE_STORE_MAX / ARTICLE_STORE_SESSION_MAX / ARTICLE_STORE_MAX_MB)"""
+    default_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "articles.sqlite3")
+    return _resource("article_store", lambda: ArticleStore(
+        os.getenv("ARTICLE_STORE_PATH", default_path),
+        max_total=int(os.getenv("ARTICLE_STORE_MAX", "2000")),
+        max_per_session=int(os.getenv("ARTICLE_STORE_SESSION_MAX", "30")),
+        max_bytes=int(os.getenv("ARTICLE_STORE_MAX_MB", "200")) * 1024 * 1024
+    ))
+
+# ==========================================
+# 2. 검색 / 생성
+# ==========================================
+
+# 수익형 글에서 함께 검색할 변형 쿼리
+SEARCH_VARIANTS = ["후기", "가격"]
+
+# 검색 단계 전체 시간 예산(초), 초과 시 그때까지 모인 결과만 사용
+SEARCH_BUDGET_SEC = float(os.getenv("SEARCH_BUDGET_SEC", "15"))
+
+# 프롬프트에 넣을 검색 정보의 최대 토큰 수 (추정치 기준)
+FACTS_TOKEN_BUDGET = int(os.getenv("FACTS_TOKEN_BUDGET", "800"))
+
+# 공유 검색(일괄 생성 키워드 묶음)에서 쿼리당 가져올 결과 수 (키워드마다 이 중 상위 6개를 다시 고름)
+SHARED_SEARCH_RESULTS = int(os.getenv("SHARED_SEARCH_RESULTS", "12"))
+
+# 검색 출처별 가중치 (뉴스 > 기본 웹검색 > 변형 쿼리)
+SEARCH_SOURCE_WEIGHT = {"news": 2.0, "text": 1.0, "variant": 0.5}
+
+# 중복 스니펫 제거 누적 집계 (사이드바 표시용)
+_dedup_totals = {"runs": 0, "snippets": 0, "dropped": 0, "dropped_chars": 0}
+_dedup_lock = threading.Lock()
+
+def search_dedup_stats():
+    with _dedup_lock:
+        return dict(_dedup_totals)
+
+def remove_duplicate_snippets(results):
+    """여러 언론사에 실린 같은 기사 등 거의 같은 스니펫 제거 (제거 건수/글자 수는 span과 누적 집계로 남김)"""
+    with tracing.span("search.dedup", snippets=len(results)) as span:
+        kept, dropped, dropped_chars = dedup_snippets(results)
+        span.set(dropped=dropped, dropped_chars=dropped_chars)
+    with _dedup_lock:
+        _dedup_totals["runs"] += 1
+        _dedup_totals["snippets"] += len(results)
+        _dedup_totals["dropped"] += dropped
+        _dedup_totals["dropped_chars"] += dropped_chars
+    return kept
+
+def _search_one(method, query, source, use_cache, max_results, deadline=None):
+    """단일 검색 (워커 스레드용)"""
+    with DDGS(use_cache=use_cache, deadline=deadline) as ddgs:
+        if method == "news":
+            results = ddgs.news(query, region='kr-kr', safesearch='off', timelimit='w', max_results=max_results)
+        else:
+            results = ddgs.text(query, region='kr-kr', max_results=max_results)
+    return [dict(r, _source=source, _rank=i) for i, r in enumerate(results)]
+
+def rank_search_results(keyword, results, limit=6):
+    """중복(같은 링크/제목) 제거 후 키워드 관련도 + 출처 가중치로 정렬
+
+    관련도: 키워드 단어 포함 수 + 키워드 글자 2개 단위가 본문에 얼마나 들어 있는지
+    (조사가 붙거나 띄어쓰기가 달라 단어가 그대로 안 맞는 경우 보완)
+    """
+    tokens = [t for t in keyword.lower().split() if t]
+    keyword_grams = shingles(keyword, 2)
+    seen = set()
+    scored = []
+    for r in results:
+        if r.get("fallback"):
+            continue
+        title = r.get('title', '')
+        link = r.get('url') or r.get('href') or ''
+        dedup_key = link or re.sub(r'\s+', '', title)
+        if not dedup_key or dedup_key in seen:
+            continue
+        seen.add(dedup_key)
+        
+        text = f"{title} {r.get('body', '')}".lower()
+        score = sum(1 for t in tokens if t in text) * 2
+        if keyword_grams:
+            score += 2 * len(keyword_grams & shingles(text, 2)) / len(keyword_grams)
+        if tokens and all(t in title.lower() for t in tokens):
+            score += 1
+        score += SEARCH_SOURCE_WEIGHT.get(r.get("_source"), 0) - r.get("_rank", 0) * 0.1
+        scored.append((score, r))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [r for _, r in scored[:limit]]
+
+def search_fanout(keyword, use_cache=True, variants=(), max_results=6, deadline=None):
+    """뉴스/웹/변형 쿼리 검색을 동시에 실행해 병합 (소요 시간 = 가장 느린 단일 검색)
+    
+    deadline(time.monotonic 기준)까지 끝나지 않은 검색은 기다리지 않고 완료된 결과만 병합
+    """
+    jobs = [("news", keyword, "news"), ("text", keyword, "text")]
+    jobs += [("text", f"{keyword} {v}", "variant") for v in variants]
+    
+    merged = []
+    fallback = []
+    pool = get_search_pool()
+    # 검색 시도 span이 이 생성의 trace에 묶이도록 문맥을 넘겨 실행
+    futures = [pool.submit(tracing.bind(_search_one), method, query, source, use_cache, max_results, deadline) for method, query, source in jobs]
+    timeout = None if deadline is None else max(0, deadline - time.monotonic())
+    done, not_done = wait(futures, timeout=timeout)
+    # 마감을 넘긴 검색은 버리고 바로 반환 (아직 시작 안 한 작업은 취소)
+    for future in not_done:
+        future.cancel()
+    for future in futures:
+        if future not in done:
+            continue
+        try:
+            results = future.result()
+        except Exception:
+            continue
+        if results and all(r.get("fallback") for r in results):
+            fallback = results
+        else:
+            merged.extend(results)
+    
+    # 중복 스니펫이 순위 상위 자리를 차지하지 않도록 정렬 전에 제거
+    ranked = rank_search_results(keyword, remove_duplicate_snippets(merged), limit=max_results)
+    # 모든 검색이 실패하면 차단 안내 문구를 그대로 전달 (환각 방지)
+    return ranked if ranked else fallback
+
+# 검색 정보가 없을 때 프롬프트에 넣는 문구
+NO_FACTS = "최신 트렌드 분석을 기반으로 집필합니다."
+
+def hunt_realtime_info(keyword, use_cache=True, variants=(), budget=None, max_tokens=None):
+    """실시간 정보 수집 (use_cache=False면 검색 캐시를 건너뛰고 새로 검색, budget초 안에 끝냄)
+    
+    수집한 정보는 max_tokens(기본 FACTS_TOKEN_BUDGET) 안으로 압축해 프롬프트 크기를 고정
+    """
+    with tracing.span("search", keyword=keyword, variants=len(variants), use_cache=use_cache) as span:
+        try:
+            deadline = time.monotonic() + (SEARCH_BUDGET_SEC if budget is None else budget)
+            results = search_fanout(keyword, use_cache=use_cache, variants=variants, deadline=deadline)
+            limit = FACTS_TOKEN_BUDGET if max_tokens is None else max_tokens
+            context, before, after = budget_facts(keyword, results, limit)
+            span.set(results=len(results), facts_tokens=before, facts_tokens_budgeted=after, facts_budget=limit)
+            return context if context else NO_FACTS
+        except Exception as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            return NO_FACTS
+
+def search_shared(keyword, use_cache=True, variants=(), budget=None):
+    """여러 키워드가 나눠 쓸 검색 1회 → 중복 제거된 검색 결과 (키워드별로 다시 고를 수 있게 넉넉히, 실패하면 빈 목록)"""
+    with tracing.span("search.shared", keyword=keyword, variants=len(variants), use_cache=use_cache) as span:
+        try:
+            deadline = time.monotonic() + (SEARCH_BUDGET_SEC if budget is None else budget)
+            results = search_fanout(keyword, use_cache=use_cache, variants=variants, max_results=SHARED_SEARCH_RESULTS, deadline=deadline)
+            span.set(results=len(results))
+            return results
+        except Exception as e:
+            span.set(error=f"{type(e).__name__}: {e}")
+            return []
+
+def facts_from_shared(keyword, results, max_tokens=None):
+    """공유 검색 결과 → 이 키워드 기준으로 다시 순위를 매겨 압축한 정보 (hunt_realtime_info와 같은 형식, 토큰 수도 같은 방식으로 기록)"""
+    with tracing.span("search.facts", keyword=keyword, shared=len(results)) as span:
+        ranked = rank_search_results(keyword, results) or [r for r in results if r.get("fallback")]
+        limit = FACTS_TOKEN_BUDGET if max_tokens is None else max_tokens
+        context, before, after = budget_facts(keyword, ranked, limit)
+        span.set(results=len(ranked), facts_tokens=before, facts_tokens_budgeted=after, facts_budget=limit)
+        return context if context else NO_FACTS
+
+def clean_all_tags(text):
+    """HTML 태그 제거"""
+    text = re.sub(r'<[^>]*>', '', text)
+    text = text.replace("**", "").replace("__", "").replace("*", "")
+    return text.strip()
+
+def get_ftc_text(url):
+    """공정위 문구"""
+    if not url: return ""
+    u = url.lower()
+    if "coupang" in u: return "이 포스팅은 쿠팡 파트너스 활동의 일환으로, 이에 따른 일정액의 수수료를 제공받습니다."
+    if "naver" in u or "smartstore" in u: return "이 포스팅은 네이버 쇼핑커넥트 활동의 일환으로, 판매 발생 시 수수료를 제공받습니다."
+    if "oliveyoung" in u: return "이 포스팅은 올리브영 쇼핑 큐레이터 활동의 일환으로, 판매 발생시 수수료를 제공받습니다."
+    return "이 포스팅은 제휴 마케팅 활동의 일환으로 커미션를 받습니다."
+
+def _total_tokens(response):
+    """응답의 총 토큰 수 (메타데이터가 없으면 0)"""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", 0) or 0
+
+def _served_model(response, model):
+    """실제로 응답한 모델 (풀이 대체 모델로 넘긴 경우 그 모델, 알 수 없으면 요청한 모델)"""
+    return getattr(response, "served_model", None) or model.model_name
+
+def generate_text(prompt, on_chunk=None, use_cache=True):
+    """모델 호출 → (응답 텍스트, 첫 토큰까지 초, 전체 초, 캐시 재생 여부)
+    
+    on_chunk가 주어지면 stream=True로 받아 새로 도착한 청크 텍스트를 그대로 전달
+    같은 모델 + 같은 프롬프트의 응답이 캐시에 있으면 호출 없이 재생 (use_cache=False면 새로 생성 후 덮어씀)
+    대체 모델이 응답했으면 그 모델 이름으로 저장하므로 기본 모델 응답으로 재생되지 않음
+    """
+    model = get_model()
+    cache = get_llm_cache()
+    with tracing.span("llm.call", model=model.model_name, streamed=on_chunk is not None) as span:
+        started = time.perf_counter()
+        if use_cache:
+            cached = cache.get(model.model_name, prompt)
+            if cached is not None:
+                if on_chunk:
+                    on_chunk(cached)
+                elapsed = time.perf_counter() - started
+                span.set(cached=True)
+                return cached, elapsed, elapsed, True
+        
+        if on_chunk is None:
+            response = model.generate_content(prompt)
+            elapsed = time.perf_counter() - started
+            served = _served_model(response, model)
+            cache.put(served, prompt, response.text, _total_tokens(response))
+            span.set(cached=False, served_model=served, tokens=_total_tokens(response))
+            return response.text, elapsed, elapsed, False
+        
+        ttft = None
+        raw_text = ""
+        response = model.generate_content(prompt, stream=True)
+        for chunk in response:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            raw_text += chunk.text
+            on_chunk(chunk.text)
+        elapsed = time.perf_counter() - started
+        ttft = elapsed if ttft is None else ttft
+        served = _served_model(response, model)
+        cache.put(served, prompt, raw_text, _total_tokens(response))
+        span.set(cached=False, served_model=served, tokens=_total_tokens(response), ttft_ms=round(ttft * 1000, 1))
+        return raw_text, ttft, elapsed, False
+
+# 철칙 위반 문장 수정 반복 횟수 (0이면 검사만 하고 수정하지 않음)
+BANNED_FIX_ROUNDS = int(os.getenv("BANNED_FIX_ROUNDS", "1"))
+
+def build_fix_prompt(sentences, keyword=None):
+    """[(문장, 위반 문구 목록)] → 해당 문장만 고쳐 쓰게 하는 짧은 프롬프트"""
+    keep = f"\n- 키워드 '{keyword}'는 고치지 말고 그대로 두세요" if keyword else ""
+    lines = "\n".join(f"{i}. (금지: {', '.join(phrases)}) {sentence}" for i, (sentence, phrases) in enumerate(sentences, 1))
+    return f"""
+아래는 블로그 원고에서 금지 표현이 들어간 문장들입니다.
+각 문장에서 괄호 안의 금지 표현만 없애고 같은 뜻, 같은 말투, 비슷한 길이로 다시 쓰세요.
+- 인사말/자기소개/마무리 멘트/쿠팡 언급/날짜(연도·월·일, 오늘·어제·내일)는 어떤 형태로도 쓰지 마세요
+- 문장에 없던 HTML 태그나 [TITLE], [[CTA_n]] 같은 표시를 새로 넣지 마세요{keep}
+
+{lines}
+
+JSON만 출력하세요: {{"1": "고친 문장", "2": "고친 문장"}}
+"""
+
+def fix_banned_phrases(data, use_cache=True, on_stage=None, style=DEFAULT_STYLE, keyword=None):
+    """제목/본문의 철칙 위반 문장만 모델에 다시 쓰게 해서 교체 (전체 재생성 대신) → (data, 고친 문장 수)
+
+    style: 어느 프롬프트의 철칙으로 검사할지, keyword: 키워드 안에 걸친 표현은 위반으로 보지 않음
+    """
+    fixed = 0
+    for _ in range(BANNED_FIX_ROUNDS):
+        targets = []
+        for field, violations in check_article(data, style, keyword).items():
+            for start, end in sentence_spans(data[field], violations):
+                phrases = sorted({phrase for s, e, phrase, _ in violations if start <= s and e <= end})
+                targets.append((field, start, end, phrases))
+        if not targets:
+            break
+        if on_stage:
+            on_stage("fixing")
+        with tracing.span("rules.fix", sentences=len(targets)) as span:
+            prompt = build_fix_prompt([(data[field][start:end], phrases) for field, start, end, phrases in targets], keyword)
+            try:
+                raw_text, _, _, _ = generate_text(prompt, use_cache=use_cache)
+                rewrites, _ = extract_json(raw_text)
+            except Exception as e:
+                # 수정 호출이 실패해도 원고는 그대로 살림 (위반은 점수에 반영됨)
+                span.set(error=f"{type(e).__name__}: {e}")
+                break
+            data = dict(data)
+            # 뒤쪽 문장부터 바꿔야 앞쪽 위치가 어긋나지 않음
+            for i, (field, start, end, _) in reversed(list(enumerate(targets, 1))):
+                rewrite = str(rewrites.get(str(i), "")).strip()
+                if rewrite:
+                    data[field] = data[field][:start] + rewrite + data[field][end:]
+                    fixed += 1
+            span.set(fixed=fixed)
+    if fixed and on_stage:
+        on_stage("rendering")
+    return data, fixed
+
+# 글자수 보정 반복 횟수 (0이면 보정하지 않고 점수에만 반영)
+LENGTH_FIX_ROUNDS = int(os.getenv("LENGTH_FIX_ROUNDS", "2"))
+
+# 글자수 보정 누적 집계 (사이드바 표시용, full_tokens는 같은 원고를 처음부터 다시 생성했을 때의 추정치)
+_length_totals = {"articles": 0, "rounds": 0, "tokens": 0, "full_tokens": 0}
+_length_lock = threading.Lock()
+
+def length_fix_stats():
+    with _length_lock:
+        return dict(_length_totals)
+
+def enforce_length(keyword, data, full_tokens, use_cache=True, on_stage=None):
+    """본문 글자수가 범위를 벗어나면 짧은/긴 섹션만 늘리거나 줄임 (전체 재생성 대신) → (data, 보정 결과)
+
+    full_tokens: 원래 프롬프트 + 응답의 추정 토큰 수 (보정 토큰이 이보다 커질 것 같으면 멈춤)
+    보정 결과: {"rounds", "action", "before", "tokens", "full_tokens"} (rounds가 0이면 보정 안 함)
+    """
+    report = {"rounds": 0, "action": None, "before": len(body_text(data.get('content', ''))), "tokens": 0, "full_tokens": full_tokens}
+    for _ in range(LENGTH_FIX_ROUNDS):
+        action, sections = length_fix.plan(data.get('content', ''))
+        if not action:
+            break
+        prompt = length_fix.build_prompt(keyword, action, data['content'], sections)
+        # 응답도 프롬프트만큼 든다고 보고, 전체 재생성보다 비싸지면 멈춤
+        if report["tokens"] + 2 * estimate_tokens(prompt) > full_tokens:
+            break
+        if on_stage:
+            on_stage("lengthening")
+        with tracing.span("rules.length", action=action, sections=len(sections), chars=len(body_text(data['content']))) as span:
+            try:
+                raw_text, _, _, _ = generate_text(prompt, use_cache=use_cache)
+                rewrites, _ = extract_json(raw_text)
+            except Exception as e:
+                # 보정 호출이 실패해도 원고는 그대로 살림 (길이는 점수에 반영됨)
+                span.set(error=f"{type(e).__name__}: {e}")
+                break
+            tokens = estimate_tokens(prompt) + estimate_tokens(raw_text)
+            content, changed = length_fix.apply(data['content'], sections, rewrites)
+            report["tokens"] += tokens
+            span.set(changed=changed, tokens=tokens)
+            if not changed:
+                break
+            data = dict(data, content=content)
+            report["rounds"] += 1
+            report["action"] = action
+    if report["rounds"]:
+        with _length_lock:
+            _length_totals["articles"] += 1
+            _length_totals["rounds"] += report["rounds"]
+            _length_totals["tokens"] += report["tokens"]
+            _length_totals["full_tokens"] += full_tokens
+        if on_stage:
+            on_stage("rendering")
+    return data, report
+
+# 모드별 렌더링 스타일
+RENDER_STYLES = {
+    "naver_profit": NAVER_PROFIT_STYLE,
+    "naver_info": NAVER_INFO_STYLE,
+    "tistory_info": TISTORY_INFO_STYLE
+}
+
+def finish_article(keyword, mode, prompt, raw_text, fields, cta=(), use_llm_cache=True, on_stage=None, polish=True, **render_ctx):
+    """모델 응답 → 결과 원고 dict (파싱 → 글자수 보정 → 금지 문구 수정 → 렌더링 → 채점, 세 모드 공통)
+
+    fields: 모드별 항목(persona, structure, seed, cached 등), render_ctx: render_article에 넘길 값
+    polish=False면 글자수 보정/금지 문구 수정 없이 채점만 (후보 비교용, 고른 원고만 다시 polish=True로)
+    """
+    with tracing.span("json.parse") as span:
+        data, repaired = extract_json(raw_text)
+        span.set(repaired=repaired, chars=len(raw_text))
+    length, fixed = None, 0
+    if polish:
+        data, length = enforce_length(keyword, data, estimate_tokens(prompt) + estimate_tokens(raw_text), use_llm_cache, on_stage)
+        data, fixed = fix_banned_phrases(data, use_llm_cache, on_stage, mode, keyword)
+    with tracing.span("render"):
+        article = render_article(data, RENDER_STYLES[mode], keyword=keyword, **render_ctx)
+    quality = score_article(keyword, data, cta=cta, style=mode)
+    quality["fixed"] = fixed
+    quality["length"] = length
+    return dict({
+        "keyword": keyword,
+        "title": article['title'],
+        "content": article['html'],
+        "display": article['text'],
+        "clipboard": article['clipboard'],
+        "clipboard_hash": article['clipboard_hash'],
+        "quality": quality,
+        "repaired": repaired
+    }, **fields)
+
+# ==========================================
+# 3. 네이버 수익형
+# ==========================================
+
+NAVER_PROFIT_PERSONAS = [
+    {
+        "role": "30대 워킹맘",
+        "tone": "친근한 존댓말",
+        "keywords": ["진짜", "완전", "대박", "리얼", "솔직히"],
+        "emoji_style": "😊 💕 👍 ✨ 🔥",
+        "intro_style": "일상 에피소드"
+    },
+    {
+        "role": "20대 직장인",
+        "tone": "가벼운 반말",
+        "keywords": ["ㅇㅁ", "가성비", "꿀템", "핵이득", "존맛"],
+        "emoji_style": "🔥 💯 ✅ 💸 ⚡",
+        "intro_style": "문제 상황 제시"
+    },
+    {
+        "role": "40대 구매 전문가",
+        "tone": "정중한 존댓말",
+        "keywords": ["실제로", "확실히", "분명", "경험상", "추천드립니다"],
+        "emoji_style": "✅ 💡 📊 👌 ⭐",
+        "intro_style": "통계/데이터"
+    },
+    {
+        "role": "블로그 마니아",
+        "tone": "설명형 존댓말",
+        "keywords": ["정리해드릴게요", "알려드립니다", "확인해보세요", "참고하세요"],
+        "emoji_style": "📌 ✏️ 💬 🎯 📝",
+        "intro_style": "핫한 질문"
+    },
+    {
+        "role": "소비 분석가",
+        "tone": "분석적 존댓말",
+        "keywords": ["비교해보면", "데이터상", "실측", "결과적으로"],
+        "emoji_style": "📈 🔍 💰 🎓 ⚖️",
+        "intro_style": "폭로/반전"
+    }
+]
+
+NAVER_PROFIT_STRUCTURES = {
+    1: {"name": "스토리텔링형", "sections": ["개인 경험담", "문제 발견", "제품 만남", "사용 과정", "결과/변화"], "cta_position": "변화 직후"},
+    2: {"name": "데이터 분석형", "sections": ["시장 현황", "수치 비교", "스펙 분석", "가격 분석", "종합 평가"], "cta_position": "핵심 데이터 후"},
+    3: {"name": "비교 대결형", "sections": ["경쟁 제품들", "1차 비교", "심층 비교", "상황별 추천", "최종 승자"], "cta_position": "비교 결과 후"},
+    4: {"name": "폭로 고발형", "sections": ["충격 사실", "업계 속사정", "진실 분석", "대안 제시", "행동 촉구"], "cta_position": "진실 폭로 후"},
+    5: {"name": "Q&A 해결형", "sections": ["베스트 질문", "오해 바로잡기", "핵심 답변", "추가 팁", "최종 정리"], "cta_position": "핵심 답변 후"}
+}
+
+def _naver_profit_choice(seed):
+    """시드 → (프롬프트용 난수 생성기, 페르소나, 구조)"""
+    rng = random.Random(seed)
+    persona = rng.choice(NAVER_PROFIT_PERSONAS)
+    structure = NAVER_PROFIT_STRUCTURES[rng.randint(1, 5)]
+    return rng, persona, structure
+
+def generate_naver_profit_prompt(keyword, product, url, facts, persona, structure, rng=random):
+    """네이버 수익형 프롬프트"""
+    current_date = datetime.now().strftime("%Y년 %m월 %d일")
+    
+    return f"""
+당신은 지금 {persona["role"]}입니다. 블로그를 {rng.randint(3, 8)}년째 운영 중입니다.
+
+[철칙 - 위반 시 즉시 폐기]
+1. "안녕하세요", "오늘은", "알아보겠습니다" 같은 AI 티 나는 문구 절대 금지
+2. 예의 바른 인사 금지. 바로 충격/위기/호기심으로 시작!
+3. 메타 언급 금지 ("태그를 사용", "방식으로", "구조는")
+4. 마크다운(*, #, -, **) 절대 금지. 오직 <b>태그만!
+5. 🚫 자기소개 절대 금지 ("저는", "블로거", "리뷰어", "전문가입니다", "~년차", "운영중")
+6. 🚫 쿠팡 언급 절대 금지 ("쿠팡에서", "쿠팡으로", "쿠팡 파트너스")
+7. 🚫 마무리 멘트 절대 금지 ("결론", "마무리", "마치며", "정리하면", "요약하면", "끝으로", "마지막으로")
+8. 🚫 날짜 노출 절대 금지 ("2025년", "1월", "오늘", "어제", "내일", 구체적 날짜 표기)
+
+[작성 정보]
+- 날짜: {current_date} (참고용, 본문에 절대 쓰지 마세요!)
+- 키워드: {keyword}
+- 제품: {product}
+- 링크: {url}
+- 실시간 이슈: {facts}
+- 캐릭터 말투: {persona["tone"]}
+- 자주 쓸 말: {", ".join(persona["keywords"])}
+- 이모지: {persona["emoji_style"]} (본문에 자연스럽게)
+- 구조: {structure["name"]}
+
+[글자수]
+정확히 1800~2400자 (엄수)
+
+[JSON 응답]
+{{
+    "title": "제목",
+    "content": "본문",
+    "meta_description": "SEO 요약 (150자)",
+    "hashtags": "7개"
+}}
+
+[🔥 제목 작성법 - 클릭 유도 필수!]
+8가지 패턴 중 1개:
+1. 손해 공포형: "이거 모르면 {{금액}}원 날립니다"
+2. 정보 격차형: "알 사람은 다 아는 {{상품}} 진실"
+3. 시간 압박형: "지금만 {{혜택}}, 곧 가격 인상"
+4. 후회 경고형: "{{행동}} 했다가 멘붕 왔습니다"
+5. 내부자 폭로형: "업계인이 폭로하는 {{진실}}"
+6. 비교 충격형: "{{A}} vs {{B}}, 결과 충격"
+7. 반전 경험형: "{{기대}}했는데 {{반전}}"
+8. 긴급 정보형: "지금 당장 확인하세요, {{위험}}"
+
+제목 규칙:
+- {keyword} 반드시 포함
+- 15~25자
+- 구체적 숫자 사용
+- 이모지 금지
+
+[💣 도입부 (첫 5문장이 생명)]
+5가지 후킹 전략 중 1개:
+1. 충격 사실: "이거 알면 절대 못합니다." + 수치 증명
+2. 손해 경험: "{{금액}}원 날렸습니다." + 이유
+3. 시간 압박: "지금만입니다." + 손해
+4. 정보 격차: "알 사람만 압니다." + 모르면 손해
+5. 반전 경험: "{{기대}}했는데 {{반전}}"
+
+도입 필수:
+✅ 첫 문장 5단어 이내
+✅ 구체적 숫자 2개+
+✅ 이모지 1~2개
+✅ {persona["intro_style"]}로 시작
+
+[본문 구성]
+{", ".join(structure["sections"])}로 전개
+
+각 섹션:
+- 소제목: [TITLE]제목[/TITLE]
+- 키워드/숫자 <b>태그</b> 강조
+- 이모지 자연스럽게
+- FOMO 문구 반복
+
+🔥 중간 재후킹 (3번째 섹션):
+- "여기까지만 알아도 {{금액}}원 아낍니다"
+- "근데 진짜 중요한 건 지금부터예요"
+
+FOMO 문구 (최소 5회):
+"이거 모르고 샀다간...", "안 쓰면 바보", "알 사람만 안다", "지금 아니면 기회 없어요", "뒤늦게 알고 후회했어요"
+
+[CTA 배치]
+[[CTA_1]]을 {structure["cta_position"]}에 1번
+[[CTA_2]]를 FAQ 직전에 1번
+총 2번 배치
+
+[FAQ 필수 3개]
+Q1: 가장 큰 실수/오해
+Q2: 꼭 확인해야 할 것
+Q3: 지금 사야 하는 이유
+
+[마무리]
+FAQ 후 마지막 2~3문장으로 강하게:
+"지금 안 하면 진짜 후회합니다", "{{금액}}원 날리기 싫으면 지금 바로"
+→ 행동 촉구만! 정리/요약 절대 금지!
+
+[해시태그]
+7개 (이모지 없이, 검색 키워드)
+
+{product}에 대한 {structure["name"]} 스타일 원고를 작성하세요.
+JSON만 출력하세요.
+"""
+
+def _naver_profit_response(keyword, product, url, facts, seed, use_llm_cache=True, on_chunk=None, on_stage=None):
+    """수익형 프롬프트 → 모델 응답 → (프롬프트, 응답, 결과 항목)"""
+    rng, persona, structure = _naver_profit_choice(seed)
+    with tracing.span("prompt.build", mode="naver_profit"):
+        prompt = generate_naver_profit_prompt(keyword, product, url, facts, persona, structure, rng)
+    
+    if on_stage:
+        on_stage("generating")
+    raw_text, ttft, elapsed, cached = generate_text(prompt, on_chunk, use_llm_cache)
+    if on_stage:
+        on_stage("rendering")
+    return prompt, raw_text, {
+        "persona": persona['role'],
+        "structure": structure['name'],
+        "seed": seed,
+        "cached": cached,
+        "streamed": on_chunk is not None,
+        "ttft": ttft,
+        "elapsed": elapsed
+    }
+
+def _finish_naver_profit(keyword, product, url, prompt, raw_text, fields, use_llm_cache=True, on_stage=None, polish=True):
+    return finish_article(keyword, "naver_profit", prompt, raw_text, fields, ("1", "2"), use_llm_cache, on_stage, polish,
+                          product=product, url=url, disclosure=get_ftc_text(url))
+
+@tracing.traced("generate.naver_profit")
+def write_naver_profit(keyword, product, url, use_cache=True, on_chunk=None, use_llm_cache=True, seed=None, on_stage=None, facts=None):
+    """네이버 수익형 원고 생성 (검색 → 프롬프트 → 생성 → 조립, UI 호출 없음)
+    
+    seed가 같으면 같은 페르소나/구조/프롬프트가 만들어지므로 저장된 응답을 재생할 수 있음
+    on_stage(단계)는 "searching" / "generating" / "rendering" 진입 시 호출
+    facts가 주어지면 검색 없이 그 정보를 사용 (전체 플랫폼 생성에서 한 번 검색한 결과 공유)
+    """
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    if on_stage:
+        on_stage("searching")
+    if facts is None:
+        facts = hunt_realtime_info(keyword, use_cache=use_cache, variants=SEARCH_VARIANTS)
+    prompt, raw_text, fields = _naver_profit_response(keyword, product, url, facts, seed, use_llm_cache, on_chunk, on_stage)
+    return _finish_naver_profit(keyword, product, url, prompt, raw_text, fields, use_llm_cache, on_stage)
+
+VARIANT_COUNT = int(os.getenv("VARIANT_COUNT", "3"))
+
+def _variant_seeds(seed, n):
+    """페르소나/구조 조합이 서로 다른 후보 시드 n개 (첫 후보는 seed 그대로 → 같은 시드로 다시 돌리면 재생)"""
+    rng = random.Random(seed)
+    seeds, combos = [], set()
+    candidate = seed
+    for _ in range(n * 20):
+        _, persona, structure = _naver_profit_choice(candidate)
+        combo = (persona['role'], structure['name'])
+        if combo not in combos:
+            combos.add(combo)
+            seeds.append(candidate)
+            if len(seeds) == n:
+                break
+        candidate = rng.randrange(2 ** 32)
+    return seeds
+
+@tracing.traced("generate.variants")
+def write_naver_profit_variants(keyword, product, url, n=VARIANT_COUNT, use_cache=True, on_chunk=None, use_llm_cache=True, seed=None, on_stage=None):
+    """페르소나/구조가 다른 수익형 후보 n개를 동시에 생성해 점수(article_score)가 가장 높은 원고 반환
+    
+    후보는 보정 없이 그대로 채점하고, 글자수 보정/금지 문구 수정은 고른 원고 하나에만 적용
+    반환값은 최고 점수 원고(write_naver_profit 결과)에 "candidates"(점수순 전체 후보)와
+    "errors"(실패한 후보의 오류)를 더한 것. on_chunk는 후보가 섞이므로 사용하지 않음
+    """
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    seeds = _variant_seeds(seed, max(1, n))
+    if on_stage:
+        on_stage("searching")
+    facts = hunt_realtime_info(keyword, use_cache=use_cache, variants=SEARCH_VARIANTS)
+    if on_stage:
+        on_stage("generating")
+    drafts, errors = [], []
+    with ThreadPoolExecutor(max_workers=len(seeds), thread_name_prefix="variant") as pool:
+        futures = [
+            pool.submit(tracing.bind(_naver_profit_response), keyword, product, url, facts, s, use_llm_cache)
+            for s in seeds
+        ]
+        for future in as_completed(futures):
+            try:
+                prompt, raw_text, fields = future.result()
+                post = _finish_naver_profit(keyword, product, url, prompt, raw_text, fields, polish=False)
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            drafts.append((post, prompt, raw_text, fields))
+    if not drafts:
+        raise RuntimeError(f"모든 후보 생성 실패: {errors[0] if errors else '후보 없음'}")
+    drafts.sort(key=lambda draft: draft[0]['quality']['score'], reverse=True)
+    if on_stage:
+        on_stage("rendering")
+    _, prompt, raw_text, fields = drafts[0]
+    best = _finish_naver_profit(keyword, product, url, prompt, raw_text, fields, use_llm_cache, on_stage)
+    candidates = [best] + [post for post, _, _, _ in drafts[1:]]
+    return dict(best, candidates=candidates, errors=errors)
+
+# ==========================================
+# 4. 네이버 정보성
+# ==========================================
+
+NAVER_INFO_PERSONAS = [
+    {"role": "전문 칼럼니스트", "tone": "정중한 존댓말", "keywords": ["분석하면", "살펴보면", "알 수 있습니다"], "emoji": "📊 💡 ✅"},
+    {"role": "정보 큐레이터", "tone": "친절한 설명", "keywords": ["정리하면", "핵심은", "중요한 점은"], "emoji": "📌 ✏️ 💬"},
+    {"role": "업계 전문가", "tone": "전문적 존댓말", "keywords": ["실제로", "데이터상", "경험상"], "emoji": "🎓 📈 ⭐"}
+]
+
+def generate_naver_info_prompt(keyword, facts, persona):
+    """네이버 정보성 프롬프트"""
+    return f"""
+당신은 {persona["role"]}입니다.
+
+[철칙]
+1. AI 인사말 금지 ("안녕하세요", "오늘은", "알아보겠습니다")
+2. 자기소개 금지
+3. 마무리 멘트 금지 ("결론", "마무리", "마치며")
+4. 날짜 노출 금지
+5. 마크다운 금지, <b>태그만 사용
+
+[작성 정보]
+- 키워드: {keyword}
+- 실시간 정보: {facts}
+- 말투: {persona["tone"]}
+- 자주 쓸 표현: {", ".join(persona["keywords"])}
+- 이모지: {persona["emoji"]} (본문에 자연스럽게)
+
+[글자수]
+정확히 1800~2400자
+
+[JSON 응답]
+{{
+    "title": "제목 (15-25자, {keyword} 포함)",
+    "content": "본문",
+    "hashtags": "7개"
+}}
+
+[구조]
+도입: 주제 소개 (이모지 포함)
+본문: 5개 소제목 [TITLE]제목[/TITLE]
+- 소제목마다 <b>태그</b>로 키워드 강조
+- 이모지 {persona["emoji"]} 자연스럽게 배치
+
+[필수 섹션]
+1. ✅ 체크리스트
+   <div style="background:#f8f9fa; padding:15px; border-left:4px solid #2c5aa0; margin:20px 0;">
+   <b>📋 핵심 체크리스트</b><br>
+   ☑️ 항목 1<br>
+   ☑️ 항목 2<br>
+   ☑️ 항목 3
+   </div>
+
+2. 📊 속성표
+   <table style="width:100%; border-collapse:collapse; margin:20px 0;">
+   <tr style="background:#f8f9fa;"><th style="border:1px solid #ddd; padding:10px;">항목</th><th style="border:1px solid #ddd; padding:10px;">내용</th></tr>
+   <tr><td style="border:1px solid #ddd; padding:10px;"><b>대상</b></td><td style="border:1px solid #ddd; padding:10px;">내용</td></tr>
+   </table>
+
+3. ❓ Q&A (3~5개)
+   <div style="margin:30px 0;">
+   <b style="color:#2c5aa0;">Q1. 질문?</b><br>
+   A1. 답변...<br><br>
+   <b style="color:#2c5aa0;">Q2. 질문?</b><br>
+   A2. 답변...
+   </div>
+
+[해시태그]
+7개 (이모지 없이)
+
+JSON만 출력하세요.
+"""
+
+@tracing.traced("generate.naver_info")
+def write_naver_info(keyword, use_cache=True, on_chunk=None, use_llm_cache=True, seed=None, on_stage=None, facts=None):
+    """네이버 정보성 원고 생성 (UI 호출 없음)"""
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    persona = random.Random(seed).choice(NAVER_INFO_PERSONAS)
+    if on_stage:
+        on_stage("searching")
+    if facts is None:
+        facts = hunt_realtime_info(keyword, use_cache=use_cache)
+    with tracing.span("prompt.build", mode="naver_info"):
+        prompt = generate_naver_info_prompt(keyword, facts, persona)
+    
+    if on_stage:
+        on_stage("generating")
+    raw_text, ttft, elapsed, cached = generate_text(prompt, on_chunk, use_llm_cache)
+    if on_stage:
+        on_stage("rendering")
+    return finish_article(keyword, "naver_info", prompt, raw_text, {
+        "persona": persona['role'],
+        "structure": "",
+        "seed": seed,
+        "cached": cached,
+        "streamed": on_chunk is not None,
+        "ttft": ttft,
+        "elapsed": elapsed
+    }, use_llm_cache=use_llm_cache, on_stage=on_stage)
+
+# ==========================================
+# 5. 티스토리 정보성
+# ==========================================
+
+TISTORY_INFO_PERSONAS = [
+    {"role": "트렌드 분석가", "tone": "세련된 존댓말", "keywords": ["주목할 점은", "흥미로운 것은", "특징적인"], "emoji": "📊 💡 ✨"},
+    {"role": "콘텐츠 큐레이터", "tone": "친근한 존댓말", "keywords": ["정리하면", "핵심은", "중요한 건"], "emoji": "📌 ✏️ 💬"},
+    {"role": "정보 전문가", "tone": "전문적 존댓말", "keywords": ["분석하면", "데이터상", "실제로"], "emoji": "🎓 📈 ⭐"}
+]
+
+def generate_tistory_info_prompt(keyword, facts, persona):
+    """티스토리 정보성 프롬프트 - 주제 이탈 방지"""
+    return f"""
+당신은 {keyword}에 대한 {persona["role"]}입니다.
+
+[절대 규칙 - 매우 중요!]
+1. 🚫 {keyword} 주제에서 절대 벗어나지 마세요
+2. 🚫 관련 없는 경제/투자/전략 이야기 금지
+3. 🚫 억지로 미래 예측이나 분석 넣지 마세요
+4. 🚫 글자수 채우려고 이상한 내용 추가 금지
+5. 🚫 AI 인사말/자기소개/마무리 멘트 금지
+6. 🚫 날짜 노출 금지
+7. 마크다운 금지, HTML만 사용
+
+[작성 정보]
+- 주제: {keyword} (이 주제만 다루세요!)
+- 실시간 정보: {facts}
+- 말투: {persona["tone"]}
+- 자주 쓸 표현: {", ".join(persona["keywords"])}
+- 이모지: {persona["emoji"]} (본문에 자연스럽게)
+
+[글자수]
+정확히 1800~2400자
+(주제 관련 내용으로만! 글자수 채우려고 주제 벗어나지 마세요)
+
+[JSON 응답]
+{{
+    "title": "제목 (15-25자, {keyword} 포함)",
+    "content": "본문",
+    "hashtags": "7개"
+}}
+
+[작성 방향]
+- {keyword}의 핵심만 집중적으로 다루세요
+- 구체적 사실과 정보 위주로 작성
+- 독자가 {keyword}에 대해 궁금해할 내용만
+- 주제와 관련 없으면 절대 쓰지 마세요
+
+[구조]
+도입: {keyword} 관련 후킹 (이모지 포함)
+본문: 5개 소제목 [TITLE]제목[/TITLE]
+- {keyword}와 직접 관련된 내용만
+- <b>태그</b>로 키워드 강조
+- 이모지 자연스럽게
+
+[필수 요소]
+✅ {keyword}에 대한 구체적 정보
+✅ 실용적인 내용
+✅ 독자가 바로 적용할 수 있는 것
+❌ 관련 없는 경제/투자 이야기
+❌ 억지 예측이나 전망
+❌ 주제 벗어난 내용
+
+[해시태그]
+{keyword} 관련 7개 (이모지 없이)
+
+JSON만 출력하세요.
+"""
+
+@tracing.traced("generate.tistory_info")
+def write_tistory_info(keyword, use_cache=True, on_chunk=None, use_llm_cache=True, seed=None, on_stage=None, facts=None):
+    """티스토리 정보성 원고 생성 (UI 호출 없음)"""
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    persona = random.Random(seed).choice(TISTORY_INFO_PERSONAS)
+    if on_stage:
+        on_stage("searching")
+    if facts is None:
+        facts = hunt_realtime_info(keyword, use_cache=use_cache)
+    with tracing.span("prompt.build", mode="tistory_info"):
+        prompt = generate_tistory_info_prompt(keyword, facts, persona)
+    
+    if on_stage:
+        on_stage("generating")
+    raw_text, ttft, elapsed, cached = generate_text(prompt, on_chunk, use_llm_cache)
+    if on_stage:
+        on_stage("rendering")
+    return finish_article(keyword, "tistory_info", prompt, raw_text, {
+        "persona": persona['role'],
+        "structure": "",
+        "seed": seed,
+        "cached": cached,
+        "streamed": on_chunk is not None,
+        "ttft": ttft,
+        "elapsed": elapsed
+    }, use_llm_cache=use_llm_cache, on_stage=on_stage)
+
+# ==========================================
+# 6. 대량 생성 (키워드 목록 일괄 처리)
+# ==========================================
+
+BATCH_MODES = {
+    "naver_profit": "네이버 수익형",
+    "naver_info": "네이버 정보성",
+    "tistory_info": "티스토리 정보성"
+}
+
+# 시트에 한글 모드명을 적어도 인식
+BATCH_MODE_ALIASES = {name: key for key, name in BATCH_MODES.items()}
+
+def normalize_batch_mode(mode, product, url):
+    """시트의 모드 값을 내부 키로 변환 (비어 있으면 입력값으로 추정)"""
+    mode = str(mode).strip()
+    if mode in BATCH_MODES:
+        return mode
+    if mode in BATCH_MODE_ALIASES:
+        return BATCH_MODE_ALIASES[mode]
+    if not mode:
+        return "naver_profit" if product and url else "naver_info"
+    raise ValueError(f"알 수 없는 모드: {mode}")
+
+# 일괄 생성에서 키워드가 비슷한 행끼리 검색 1번을 나눠 씀 (0이면 행마다 따로 검색)
+BATCH_SHARED_SEARCH = os.getenv("BATCH_SHARED_SEARCH", "1") != "0"
+
+def plan_shared_searches(rows):
+    """행 목록 → (행별 묶음 번호, 묶음별 (검색 키워드, 변형 쿼리))
+
+    정규화한 키워드 토큰이 많이 겹치는 행끼리 묶고, 묶음에 수익형 행이 있으면 변형 쿼리(후기/가격)까지 검색
+    """
+    keywords = [str(row["keyword"]).strip() for row in rows]
+    row_group = [None] * len(rows)
+    plans = []
+    for g, members in enumerate(cluster_keywords(keywords)):
+        profit = False
+        for i in members:
+            row_group[i] = g
+            try:
+                mode = normalize_batch_mode(rows[i].get("mode", ""), str(rows[i].get("product", "")).strip(), str(rows[i].get("url", "")).strip())
+            except ValueError:
+                continue
+            profit = profit or mode == "naver_profit"
+        plans.append((search_keyword(keywords, members), SEARCH_VARIANTS if profit else ()))
+    return row_group, plans
+
+def shared_search_savings(results):
+    """일괄 생성 결과 → (공유 검색을 쓴 행 수, 실제 검색 횟수) (묶음마다 검색 키워드가 달라 키워드 수 = 검색 횟수)"""
+    queries = [r.get("search_keyword") for r in results if r.get("search_keyword")]
+    return len(queries), len(set(queries))
+
+def run_batch_row(row, use_cache=True, use_llm_cache=True, shared_facts=None):
+    """한 행(keyword/product/url/mode/seed) 처리, 실패해도 status="error" 결과를 반환
+
+    shared_facts(키워드)가 주어지면 행마다 검색하지 않고 (검색 키워드, 정보)를 받아 사용
+    """
+    started = time.perf_counter()
+    keyword = str(row["keyword"]).strip()
+    product = str(row.get("product", "")).strip()
+    url = str(row.get("url", "")).strip()
+    result = dict(row, title="", content="", display="", persona="", structure="", score="", chars="", search_keyword="", cached=False, status="ok", error="")
+    try:
+        mode = normalize_batch_mode(row.get("mode", ""), product, url)
+        seed = str(row.get("seed", "")).strip()
+        seed = int(float(seed)) if seed else None
+        result["mode"] = mode
+        if mode == "naver_profit" and (not product or not url):
+            raise ValueError("수익형은 상품명과 제휴 링크가 필요합니다.")
+        facts = None
+        if shared_facts is not None:
+            result["search_keyword"], facts = shared_facts(keyword)
+        if mode == "naver_profit":
+            post = write_naver_profit(keyword, product, url, use_cache=use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+        elif mode == "naver_info":
+            post = write_naver_info(keyword, use_cache=use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+        else:
+            post = write_tistory_info(keyword, use_cache=use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+        result.update(post)
+        result.pop("clipboard", None)
+        result.pop("clipboard_hash", None)
+        # 채점 결과는 시트에 넣기 쉽게 점수/글자수만 남김
+        quality = result.pop("quality")
+        result["score"] = quality["score"]
+        result["chars"] = quality["chars"]
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["elapsed"] = round(time.perf_counter() - started, 2)
+    return result
+
+def run_batch(rows, workers, on_progress=None, use_cache=True, use_llm_cache=True, shared_search=None):
+    """제한된 스레드 풀로 행을 병렬 처리하고 입력 순서대로 결과 반환
+    
+    on_progress(완료 수, 전체 수, 결과)는 호출한 스레드에서 실행되므로 UI 갱신에 사용 가능
+    shared_search(기본 BATCH_SHARED_SEARCH)면 비슷한 키워드 행끼리 검색 1번을 나눠 씀
+    (묶음의 검색은 그 묶음에서 처음 시작한 행이 실행하고, 나머지 행은 그 결과를 자기 키워드 기준으로 다시 골라 사용)
+    """
+    shared_search = BATCH_SHARED_SEARCH if shared_search is None else shared_search
+    row_facts = [None] * len(rows)
+    if shared_search:
+        row_group, plans = plan_shared_searches(rows)
+        locks = [threading.Lock() for _ in plans]
+        searched = {}
+
+        def fetch(g, keyword):
+            with locks[g]:
+                if g not in searched:
+                    query, variants = plans[g]
+                    searched[g] = search_shared(query, use_cache=use_cache, variants=variants)
+            return plans[g][0], facts_from_shared(keyword, searched[g])
+
+        row_facts = [lambda keyword, g=g: fetch(g, keyword) for g in row_group]
+
+    results = [None] * len(rows)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run_batch_row, row, use_cache, use_llm_cache, row_facts[i]): i for i, row in enumerate(rows)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            results[i] = future.result()
+            if on_progress:
+                on_progress(done, len(rows), results[i])
+    return results
+
+# ==========================================
+# 7. 전체 플랫폼 동시 생성 (키워드 하나 → 모든 원고)
+# ==========================================
+
+@tracing.traced("generate.fanout")
+def write_all_platforms(keyword, product="", url="", use_cache=True, on_chunk=None, use_llm_cache=True, seed=None, on_stage=None):
+    """한 번 검색한 정보로 네이버 수익형(상품/링크가 있을 때)·네이버 정보성·티스토리 정보성을 동시에 생성
+    
+    전체 시간 ≈ 검색 1회 + 가장 느린 생성 1건. 한 플랫폼이 실패해도 나머지 결과는 반환
+    on_chunk는 세 응답이 한 미리보기에 섞이므로 사용하지 않음 (write_* 와 같은 인자 모양 유지용)
+    → {"posts": {모드: 결과}, "errors": {모드: 오류}, "seed", "elapsed"}
+    """
+    started = time.perf_counter()
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    writers = {}
+    if product and url:
+        writers["naver_profit"] = lambda facts: write_naver_profit(keyword, product, url, use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+    writers["naver_info"] = lambda facts: write_naver_info(keyword, use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+    writers["tistory_info"] = lambda facts: write_tistory_info(keyword, use_cache, use_llm_cache=use_llm_cache, seed=seed, facts=facts)
+    
+    if on_stage:
+        on_stage("searching")
+    # 수익형이 포함되면 수익형과 같은 변형 쿼리까지 검색 (정보성 원고도 같은 정보 사용)
+    facts = hunt_realtime_info(keyword, use_cache=use_cache, variants=SEARCH_VARIANTS if "naver_profit" in writers else ())
+    
+    if on_stage:
+        on_stage("generating")
+    posts, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix="fanout") as pool:
+        futures = {pool.submit(tracing.bind(write), facts): mode for mode, write in writers.items()}
+        for future in as_completed(futures):
+            mode = futures[future]
+            try:
+                posts[mode] = future.result()
+            except Exception as e:
+                errors[mode] = str(e)
+    return {
+        "keyword": keyword,
+        "posts": {mode: posts[mode] for mode in writers if mode in posts},
+        "errors": errors,
+        "seed": seed,
+        "elapsed": time.perf_counter() - started
+    }
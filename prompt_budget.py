@@ -0,0 +1,105 @@
+# 프롬프트에 넣는 검색 정보(facts)의 크기를 토큰 예산 안으로 줄이는 모듈입니다.
+# 토큰 수는 외부 토크나이저 없이 문자 종류별 비율로 빠르게 추정하고,
+# 스니펫을 문장 단위로 나눠 중복/잡음을 걷어낸 뒤 키워드 관련도가 높은 문장부터 채웁니다.
+
+import re
+import math
+
+# 한글 음절 / 영문·숫자 몇 글자가 대략 1토큰인지 (Gemini 토크나이저 기준 보수적 근사)
+HANGUL_PER_TOKEN = 1.5
+ASCII_PER_TOKEN = 4
+
+_HANGUL = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
+_ASCII = re.compile(r'[A-Za-z0-9]')
+_SPACE = re.compile(r'\s+')
+_SENTENCE = re.compile(r'[^.!?。\n]+(?:[.!?。]+|$)')
+_ELLIPSIS = re.compile(r'\.{3,}|…')
+_DIGIT = re.compile(r'\d')
+
+# 이보다 짧은 문장은 정보가 거의 없어 버림 (날짜 조각, "더보기" 등)
+MIN_SENTENCE_CHARS = 8
+
+FACT_TEMPLATE = "정보원: {title}\n핵심내용: {body}\n\n"
+
+
+def estimate_tokens(text):
+    """문자 종류별 비율로 토큰 수 추정 (공백 제외, 그 밖의 문자는 1글자 = 1토큰)"""
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    ascii_chars = len(_ASCII.findall(text))
+    other = len(_SPACE.sub('', text)) - hangul - ascii_chars
+    return math.ceil(hangul / HANGUL_PER_TOKEN + ascii_chars / ASCII_PER_TOKEN + other)
+
+
+def format_facts(results):
+    """검색 결과 → 프롬프트용 정보 문자열 (예산 적용 전 원형)"""
+    return "".join(FACT_TEMPLATE.format(title=r.get('title', ''), body=r.get('body', '')) for r in results)
+
+
+def _sentences(text):
+    """공백/말줄임표 정리 후 문장 단위로 분리"""
+    text = _SPACE.sub(' ', _ELLIPSIS.sub('. ', text or ''))
+    return [s.strip() for s in _SENTENCE.findall(text) if len(s.strip()) >= MIN_SENTENCE_CHARS]
+
+
+def _truncate(sentence, max_tokens):
+    """문장을 max_tokens 안에 들어오도록 뒤에서부터 자름 (말줄임 표시)"""
+    cost = estimate_tokens(sentence)
+    if cost <= max_tokens:
+        return sentence
+    cut = sentence[:max(0, int(len(sentence) * max_tokens / cost) - 1)]
+    while cut and estimate_tokens(cut + "…") > max_tokens:
+        cut = cut[:-1]
+    return cut.rstrip() + "…" if cut else ""
+
+
+def budget_facts(keyword, results, max_tokens):
+    """검색 결과를 max_tokens 안의 정보 문자열로 압축 → (문자열, 적용 전 토큰, 적용 후 토큰)
+
+    - 스니펫을 문장으로 나누고 같은 문장(출처가 달라도)은 한 번만 사용
+    - 키워드 포함 수 > 숫자(가격/날짜) 포함 > 상위 검색 결과 순으로 우선
+    - 선택된 문장은 원래 출처/순서대로 다시 묶어 기존 형식 유지
+    """
+    before = estimate_tokens(format_facts(results))
+    if before <= max_tokens:
+        return format_facts(results), before, before
+
+    tokens = [t for t in keyword.lower().split() if t]
+    seen = set()
+    candidates = []
+    for i, r in enumerate(results):
+        for j, sentence in enumerate(_sentences(r.get('body', ''))):
+            dedup_key = _SPACE.sub('', sentence).lower()
+            if dedup_key in seen:
+                continue
+            seen.add(dedup_key)
+            lowered = sentence.lower()
+            score = sum(2 for t in tokens if t in lowered)
+            score += 1 if _DIGIT.search(sentence) else 0
+            score -= i * 0.3 + j * 0.1
+            candidates.append((score, i, j, sentence))
+    candidates.sort(key=lambda c: c[0], reverse=True)
+
+    # 출처 줄(정보원/핵심내용 틀)은 그 출처의 첫 문장이 뽑힐 때 비용으로 계산
+    header_cost = {i: estimate_tokens(FACT_TEMPLATE.format(title=r.get('title', ''), body='')) for i, r in enumerate(results)}
+    picked = {}
+    remaining = max_tokens
+    for score, i, j, sentence in candidates:
+        cost = estimate_tokens(sentence) + (0 if i in picked else header_cost[i])
+        if cost > remaining:
+            # 최상위 문장이 통째로 안 들어가면 잘라서라도 넣음 (아무것도 못 넣는 상황 방지)
+            if picked:
+                continue
+            sentence = _truncate(sentence, remaining - header_cost[i])
+            if not sentence:
+                continue
+            cost = estimate_tokens(sentence) + header_cost[i]
+        picked.setdefault(i, []).append((j, sentence))
+        remaining -= cost
+
+    context = "".join(
+        FACT_TEMPLATE.format(title=results[i].get('title', ''), body=" ".join(s for _, s in sorted(picked[i])))
+        for i in sorted(picked)
+    )
+    return context, before, estimate_tokens(context)
@@ -0,0 +1,185 @@
+# 모델 JSON → 최종 HTML / 미리보기 텍스트 / 클립보드 HTML을 한 번에 만드는 렌더 파이프라인입니다.
+# 소제목·CTA·외곽 틀·클립보드 줄바꿈 규칙은 플랫폼별 PlatformStyle로 교체할 수 있습니다.
+
+import re
+import json
+import random
+import hashlib
+
+# 본문 마커: 소제목 / CTA (둘을 한 패턴으로 묶어 한 번에 치환)
+_MARKER = re.compile(r'\[(?:TITLE\](.*?)\[/TITLE\]|\[CTA_(\d+)\]\])')
+_TAG = re.compile(r'<[^>]*>')
+_BETWEEN_TAGS = re.compile(r'>\s*\n\s*<')
+
+# ==========================================
+# 플랫폼별 소제목
+# ==========================================
+
+DIVIDERS = [
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+    "────────────────────────────",
+    "◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈◈",
+    "============================================"
+]
+
+def get_naver_h3(text):
+    """네이버 19px 소제목"""
+    return f'\n{random.choice(DIVIDERS)}\n<span style="font-size: 19px; font-weight: bold; color: #000000;">📍 {text}</span>\n'
+
+def get_naver_info_h3(text):
+    """네이버 정보성 19px 소제목"""
+    styles = [
+        'border-left: 10px solid #2c5aa0; padding-left: 15px; border-bottom: 1px solid #eee; margin: 40px 0 20px 0;',
+        'border-top: 4px solid #2c5aa0; padding: 15px; border-bottom: 1px solid #eee; margin: 40px 0 20px 0;',
+        'display: inline-block; padding: 5px 15px; border: 2px solid #2c5aa0; color: #2c5aa0; border-radius: 20px; margin: 40px 0 20px 0; font-weight: bold;'
+    ]
+    return f"<h3 style='font-size:19px; font-weight:bold; color:#111; {random.choice(styles)}'>{text}</h3>"
+
+def get_tistory_info_h3():
+    """티스토리 정보성 화려한 소제목"""
+    color = "#{:06x}".format(random.randint(0, 0x777777))
+    styles = [
+        f'border-left: 15px solid {color}; padding: 10px 15px; background: #f8f9fa; font-weight: bold; margin: 40px 0 20px 0;',
+        f'background: linear-gradient(to right, {color}, transparent); padding: 12px 20px; border-radius: 5px; margin: 40px 0 20px 0;',
+        f'border: 2px solid {color}; padding: 15px; border-left: 10px solid {color}; border-radius: 0 10px 10px 0; margin: 40px 0 20px 0;'
+    ]
+    return random.choice(styles)
+
+def get_naver_profit_cta(ctx):
+    """네이버 수익형 CTA 박스"""
+    return f'<div style="margin: 30px 0; padding: 20px; border: 3px solid #000; background: #fff; border-radius: 5px;"><p style="font-size: 15px; color: #000; margin: 0 0 10px 0; font-weight: bold;">🚨 이거 모르고 사면 손해!</p><p style="font-size: 16px; color: #000; margin: 0; font-weight: bold;">👉 {ctx["product"]} 최저가 & 혜택 확인하기</p></div>'
+
+# ==========================================
+# 플랫폼 스타일
+# ==========================================
+
+class PlatformStyle:
+    """플랫폼별 렌더링 규칙
+
+    - template: {content} 자리에 본문이 들어가는 외곽 틀 ({title}, {hashtags}, 호출 시 넘긴 값 사용 가능)
+    - heading(text): [TITLE]..[/TITLE] 소제목 HTML
+    - cta(ctx): [[CTA_1]]/[[CTA_2]] 첫 등장 위치에 넣을 HTML (None이면 마커를 그대로 둠)
+    - collapse_tags: 클립보드에서 태그 사이 줄바꿈 제거 (>\n< → ><)
+    - clipboard_newline: 클립보드에서 남은 줄바꿈을 바꿀 문자열
+    """
+    def __init__(self, name, template, heading, default_title, cta=None, collapse_tags=True, clipboard_newline="<br>"):
+        self.name = name
+        self.prefix, self.suffix = template.split("{content}")
+        self.heading = heading
+        self.default_title = default_title
+        self.cta = cta
+        self.collapse_tags = collapse_tags
+        self.clipboard_newline = clipboard_newline
+
+NAVER_PROFIT_STYLE = PlatformStyle(
+    "naver_profit",
+    """<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
+{disclosure}
+
+<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #000;">{title}</h1>
+
+{content}
+
+<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{hashtags}</div>
+</div>""",
+    heading=get_naver_h3,
+    default_title="{keyword} 후기",
+    cta=get_naver_profit_cta
+)
+
+NAVER_INFO_STYLE = PlatformStyle(
+    "naver_info",
+    """<div style="font-family: 'Nanum Gothic', sans-serif; font-size: 15px; line-height: 1.8; color: #000;">
+<h1 style="font-size: 24px; font-weight: bold; color: #000; margin: 20px 0; padding-bottom: 10px; border-bottom: 2px solid #2c5aa0;">{title}</h1>
+
+{content}
+
+<div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #0066cc; font-weight: bold;">{hashtags}</div>
+</div>""",
+    heading=get_naver_info_h3,
+    default_title="{keyword} 완전 정리"
+)
+
+TISTORY_INFO_STYLE = PlatformStyle(
+    "tistory_info",
+    """<div style="font-family: 'Noto Sans KR', sans-serif; font-size: 16px; line-height: 1.8; color: #333; max-width: 800px; margin: auto;">
+<h1 style="font-size: 32px; font-weight: bold; color: #222; margin: 30px 0; text-align: center;">{title}</h1>
+
+<div style="padding: 15px; background: #f1f3f5; border-radius: 8px; margin: 20px 0;">
+<b style="color: #495057;">💡 핵심 요약:</b> {keyword}에 대한 심층 분석
+</div>
+
+{content}
+
+<div style="margin-top: 40px; padding-top: 20px; border-top: 2px solid #dee2e6; color: #6c757d; font-size: 14px;">{hashtags}</div>
+</div>""",
+    heading=lambda text: f"<h3 style='{get_tistory_info_h3()}'>{text}</h3>",
+    default_title="{keyword} 완전 분석",
+    collapse_tags=False,
+    clipboard_newline=""
+)
+
+STYLES = {style.name: style for style in (NAVER_PROFIT_STYLE, NAVER_INFO_STYLE, TISTORY_INFO_STYLE)}
+
+# ==========================================
+# 렌더링
+# ==========================================
+
+def _strip_markup(html):
+    """미리보기 텍스트: 태그 제거 후 마크다운 강조 제거 (기존 clean_all_tags와 같은 순서)"""
+    text = _TAG.sub('', html)
+    return text.replace("**", "").replace("__", "").replace("*", "").strip()
+
+def _clipboard(html, style):
+    """복사 버튼으로 넣을 HTML (플랫폼 줄바꿈 규칙 적용, JS 이스케이프는 clipboard_literal에서)"""
+    if style.collapse_tags:
+        html = _BETWEEN_TAGS.sub('><', html)
+    return html.replace("\n", style.clipboard_newline)
+
+def clipboard_hash(html):
+    """클립보드 HTML의 내용 해시 (브라우저에 보낸 원고 구분용)"""
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()[:16]
+
+def clipboard_literal(html):
+    """<script> 안에 그대로 넣을 수 있는 JS 문자열 리터럴
+
+    JSON 이스케이프로 따옴표/역슬래시/줄바꿈을 처리하고, 스크립트를 끝내거나 주석으로 바꿀 수 있는
+    </ 와 <!-- 그리고 U+2028/U+2029도 이스케이프
+    """
+    literal = json.dumps(html, ensure_ascii=False)
+    literal = literal.replace("</", "<\\/").replace("<!--", "\\u003c!--")
+    return literal.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+
+def render_article(data, style, **ctx):
+    """모델 JSON(dict) → {"title", "html", "text", "clipboard", "clipboard_hash"}
+
+    ctx: keyword(필수), product/url/disclosure 등 틀과 CTA에서 쓰는 값
+    text는 태그/마크다운을 뺀 미리보기, clipboard는 복사 버튼으로 넣을 HTML
+    """
+    title = data.get('title', style.default_title.format(**ctx))
+    used_cta = set()
+
+    def expand(m):
+        heading, cta = m.groups()
+        if heading is not None:
+            return style.heading(heading)
+        if style.cta is None:
+            return m.group()
+        if cta in ("1", "2") and cta not in used_cta:
+            # CTA_1, CTA_2 첫 등장 위치에만 1번씩, 나머지 마커는 제거
+            used_cta.add(cta)
+            return style.cta(ctx)
+        return ''
+
+    # 소제목/CTA 마커를 한 번의 스캔으로 치환
+    content = _MARKER.sub(expand, data.get('content', ''))
+    fields = dict(ctx, title=title, hashtags=data.get('hashtags', ''))
+    html = style.prefix.format(**fields) + content + style.suffix.format(**fields)
+    clipboard = _clipboard(html, style)
+    return {
+        "title": title,
+        "html": html,
+        "text": _strip_markup(html),
+        "clipboard": clipboard,
+        "clipboard_hash": clipboard_hash(clipboard)
+    }
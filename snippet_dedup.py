@@ -0,0 +1,70 @@
+# 검색 스니펫 중복 제거 모듈입니다.
+# 같은 통신사 기사가 여러 언론사 이름으로 돌아오는 경우가 많아, 문자 n-gram 집합이 거의 같은 스니펫은 하나만 남깁니다.
+# 모든 쌍을 비교하지 않도록 MinHash처럼 n-gram 해시 중 가장 작은 몇 개를 버킷 키로 써서 후보만 고르고,
+# 후보끼리는 실제 n-gram 집합으로 유사도를 계산합니다. (해시는 crc32라 실행마다 결과가 같음 → 시드 재현/응답 캐시 유지)
+
+import re
+import zlib
+import heapq
+
+# 한글은 띄어쓰기/조사 차이가 커서 공백·문장부호를 뺀 글자 3개 단위로 비교
+SHINGLE_SIZE = 3
+# 새 스니펫은 가장 작은 해시 QUERY_ANCHORS개로 찾고, 남긴 스니펫은 INDEX_ANCHORS개로 등록
+# (짧은 스니펫이 긴 스니펫에 포함된 경우 짧은 쪽의 최솟값이 긴 쪽의 상위 몇 개 안에 들어가므로 등록을 넉넉히)
+QUERY_ANCHORS = 4
+INDEX_ANCHORS = 16
+# 자카드 유사도 / 짧은 쪽 포함률이 이 이상이면 중복
+JACCARD_THRESHOLD = 0.6
+CONTAINMENT_THRESHOLD = 0.85
+
+_NOISE = re.compile(r'[\W_]+')
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """공백·문장부호를 뺀 소문자 글자 size개 단위 집합"""
+    text = _NOISE.sub('', (text or '').lower())
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def similarity(a, b):
+    """(자카드 유사도, 짧은 쪽 포함률)"""
+    if not a or not b:
+        return 0.0, 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter), inter / min(len(a), len(b))
+
+
+def dedup_snippets(results, jaccard=JACCARD_THRESHOLD, containment=CONTAINMENT_THRESHOLD):
+    """거의 같은 스니펫 제거 → (남긴 결과, 버린 건수, 버린 글자 수)
+
+    - 본문이 긴 스니펫부터 남기므로 같은 기사라면 정보가 많은 쪽이 살아남음
+    - 남긴 결과는 원래 순서 유지 (본문이 없으면 제목으로 비교)
+    """
+    texts = [r.get('body') or r.get('title') or '' for r in results]
+    kept_grams = {}
+    buckets = {}
+    dropped = set()
+    dropped_chars = 0
+    for i in sorted(range(len(results)), key=lambda i: -len(texts[i])):
+        grams = shingles(texts[i])
+        if not grams:
+            continue
+        hashes = heapq.nsmallest(INDEX_ANCHORS, (zlib.crc32(g.encode('utf-8')) for g in grams))
+        candidates = {j for h in hashes[:QUERY_ANCHORS] for j in buckets.get(h, ())}
+        duplicate = False
+        for j in candidates:
+            jac, contained = similarity(grams, kept_grams[j])
+            if jac >= jaccard or contained >= containment:
+                duplicate = True
+                break
+        if duplicate:
+            dropped.add(i)
+            dropped_chars += len(texts[i])
+            continue
+        kept_grams[i] = grams
+        for h in hashes:
+            buckets.setdefault(h, []).append(i)
+    kept = [r for i, r in enumerate(results) if i not in dropped]
+    return kept, len(dropped), dropped_chars
@@ -0,0 +1,54 @@
+# 테스트 공용 설정입니다.
+# 실제 캐시/속도 제한과 섞이지 않도록 임시 캐시 + 넉넉한 제한을 import 전에 걸고,
+# 네트워크 없이 돌도록 벤치마크 대역(benchmarks/fakes.py)으로 검색/모델을 바꿉니다.
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+_TMP = tempfile.mkdtemp(prefix="tests_")
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(_TMP, "search.sqlite3"))
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_TMP, "llm.sqlite3"))
+os.environ.setdefault("SEARCH_RATE_PER_SEC", "1000")
+os.environ.setdefault("SEARCH_BURST", "1000")
+os.environ.setdefault("SEARCH_BREAKER_THRESHOLD", "1000")
+os.environ.setdefault("TRACE_LOG", "off")
+
+import ddgs  # noqa: E402
+import pipeline  # noqa: E402
+from fakes import PROFILES, FakeDDGS, FakeGenerativeModel  # noqa: E402
+
+
+@pytest.fixture
+def use_model(monkeypatch):
+    """use_model(model): 이 테스트 동안만 pipeline 모델 교체 (끝나면 원래 모델로 되돌림)"""
+    def use(model):
+        monkeypatch.setitem(pipeline._resources, "model", model)
+        monkeypatch.setitem(pipeline._resources, "model_key", None)
+        return model
+    return use
+
+
+@pytest.fixture
+def use_search(monkeypatch):
+    """use_search(backend): 이 테스트 동안만 검색 백엔드 교체 (클라이언트 풀도 새로 만들고 끝나면 되돌림)"""
+    def use(backend):
+        # 실제 라이브러리가 없으면 RealDDGS 자체가 없을 수 있음
+        monkeypatch.setattr(ddgs, "RealDDGS", backend, raising=False)
+        monkeypatch.setattr(ddgs, "_client_pool", None)
+        return backend
+    return use
+
+
+@pytest.fixture
+def fake_backends(use_model, use_search):
+    """지연/오류 없는 가짜 검색 + 가짜 모델 (모델 객체를 돌려줌, 호출 수 확인용)"""
+    FakeDDGS.configure(PROFILES["instant"])
+    use_search(FakeDDGS)
+    return use_model(FakeGenerativeModel(PROFILES["instant"]))
@@ -0,0 +1,61 @@
+import pytest
+
+from article_store import ArticleStore
+
+
+def post(keyword, title="제목", score=80, body="본문"):
+    return {"keyword": keyword, "title": title, "content": body, "quality": {"score": score}}
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    def make(**limits):
+        return ArticleStore(str(tmp_path / "articles.sqlite3"), **limits)
+    return make
+
+
+def test_save_get_and_recent(make_store):
+    store = make_store()
+    first = store.save("s1", "naver_info", "청소기", post("청소기", "청소기 정리"))
+    store.save("s1", "naver_profit", "청소기", post("청소기"))
+    store.save("s2", "naver_info", "에어프라이어", post("에어프라이어"))
+    assert store.get(first)["title"] == "청소기 정리"
+    assert store.get("missing") is None
+    recent = store.recent(mode="naver_info", session="s1")
+    assert [(r["id"], r["keyword"], r["title"], r["score"]) for r in recent] == [(first, "청소기", "청소기 정리", 80)]
+    assert [r["keyword"] for r in store.recent(keyword="에어프라이어")] == ["에어프라이어"]
+
+
+def test_session_limit_evicts_least_recently_used(make_store):
+    store = make_store(max_per_session=2)
+    ids = [store.save("s1", "naver_info", str(i), post(str(i))) for i in range(2)]
+    store.get(ids[0])
+    other = store.save("s2", "naver_info", "x", post("x"))
+    newest = store.save("s1", "naver_info", "2", post("2"))
+    # 최근에 읽은 원고는 남고, 다른 세션 원고는 영향 없음
+    assert store.get(ids[1]) is None
+    assert store.get(ids[0]) and store.get(newest) and store.get(other)
+    assert store.stats()["evicted"] == 1
+
+
+def test_total_and_byte_limits(make_store):
+    store = make_store(max_total=3)
+    ids = [store.save(f"s{i}", "naver_info", "k", post("k")) for i in range(5)]
+    assert [store.get(i) is not None for i in ids] == [False, False, True, True, True]
+
+    store = make_store(max_bytes=1500)
+    big = [store.save("s1", "naver_info", "k", post("k", body="가" * 200)) for _ in range(4)]
+    assert store.stats()["bytes"] <= 1500
+    assert store.get(big[0]) is None and store.get(big[-1]) is not None
+
+
+def test_save_many_keeps_whole_batch(make_store):
+    store = make_store(max_per_session=2)
+    old = store.save("s1:batch", "batch", "old", post("old"))
+    rows = [post(f"k{i}") for i in range(5)]
+    ids = store.save_many("s1:batch", "batch", rows)
+    # 세션 한도(2)보다 많아도 이번 묶음은 모두 남고, 이전 원고만 밀려남
+    assert [r["keyword"] for r in store.get_many(ids)] == [f"k{i}" for i in range(5)]
+    assert store.get(old) is None
+    assert store.get_many([ids[0], "missing"])[1] is None
+    assert store.get_many([]) == []
@@ -0,0 +1,26 @@
+# 벤치마크 스위트 테스트입니다. (bench_pipeline 단계를 instant 프로필로 1회씩 돌려 오류 없이 끝나는지)
+
+import argparse
+
+import pytest
+
+import bench_pipeline
+import ddgs
+import pipeline
+
+
+@pytest.mark.parametrize("pool_keys", [0, 2])
+def test_bench_stages_run_without_errors(pool_keys, use_model, use_search):
+    # run()이 검색 백엔드/모델을 직접 바꾸므로 테스트가 끝나면 원래대로 되돌리도록 등록
+    use_search(getattr(ddgs, "RealDDGS", None))
+    use_model(pipeline._resources.get("model"))
+    args = argparse.Namespace(search_profile="instant", model_profile="instant", chars_per_sec=0,
+                              pool_keys=pool_keys, results=8, repeat=2, io_repeat=1)
+    report = bench_pipeline.run(args)
+    for name, stats in report["stages"].items():
+        assert stats["errors"] == 0, name
+        assert "p50_ms" in stats, name
+    assert report["meta"]["search_errors"] == 0
+    assert report["meta"]["model_errors"] == 0
+    calls = report["meta"]["batch_search_calls"]
+    assert calls["shared"] < calls["separate"]
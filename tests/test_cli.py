@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import pipeline
+
+cli = pytest.importorskip("cli")
+
+
+def test_parse_line_formats():
+    assert cli.parse_line("  ") is None
+    assert cli.parse_line("# 메모") is None
+    assert cli.parse_line("무선 청소기", "naver_info") == {"keyword": "무선 청소기", "mode": "naver_info"}
+    assert cli.parse_line("청소기\t다이슨 V15\thttps://x") == {"keyword": "청소기", "product": "다이슨 V15", "url": "https://x", "mode": ""}
+    assert cli.parse_line('{"keyword": "청소기", "mode": "tistory_info", "seed": 3}')["seed"] == 3
+    with pytest.raises(ValueError):
+        cli.parse_line('{"mode": "naver_info"}')
+
+
+def test_read_rows_reports_line_number():
+    with pytest.raises(SystemExit, match="2번째 줄"):
+        cli.read_rows(["청소기\n", '{"product": "다이슨 V15"}\n'])
+
+
+def test_main_writes_one_json_line_per_row(fake_backends, monkeypatch, tmp_path, capsys):
+    # 환경변수 키 대신 테스트용 가짜 모델을 그대로 사용
+    monkeypatch.setattr(pipeline, "configure", lambda *args, **kwargs: fake_backends)
+    source = tmp_path / "keywords.txt"
+    source.write_text("# 키워드 목록\n무선 청소기 추천\n\n{\"keyword\": \"에어프라이어 추천\", \"mode\": \"tistory_info\"}\n", encoding="utf-8")
+
+    code = cli.main([str(source), "-w", "2", "--mode", "naver_info", "--fresh-llm", "--no-shared-search"])
+
+    out, err = capsys.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert code == 0
+    assert sorted((r["keyword"], r["mode"], r["status"]) for r in rows) == [
+        ("무선 청소기 추천", "naver_info", "ok"), ("에어프라이어 추천", "tistory_info", "ok")
+    ]
+    assert "완료: 2/2건 성공" in err
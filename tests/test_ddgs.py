@@ -0,0 +1,141 @@
+# 검색 보호 장치(토큰 버킷, 서킷 브레이커, 헤지 요청, 클라이언트 풀) 테스트입니다.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ddgs
+from ddgs import CircuitBreaker, ClientPool, LatencyTracker, TokenBucket
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in() <= 60
+
+
+def test_breaker_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 요청은 한 번에 하나만, 보내지 못하고 반환하면 다시 허용
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_breaker_probe_result_closes_or_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_token_bucket_burst_then_refill():
+    bucket = TokenBucket(rate=50, capacity=3)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0)
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - started < 0.5
+    assert bucket.tokens() < 1
+
+
+
+def test_hedge_counter_is_exact_under_concurrency():
+    tracker = LatencyTracker()
+    threads = [threading.Thread(target=lambda: [tracker.record_hedge() for _ in range(1000)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert tracker.hedges == 8000
+
+
+def test_hedge_delay_needs_enough_samples():
+    tracker = LatencyTracker(percentile=50, min_samples=3)
+    tracker.record("text", 0.1)
+    tracker.record("text", 0.3)
+    assert tracker.hedge_delay("text") is None
+    tracker.record("text", 0.2)
+    assert tracker.hedge_delay("text") == 0.2
+
+
+class _SlowFirst:
+    """첫 호출만 느린 검색 백엔드 (복제 요청이 먼저 도착)"""
+    calls = 0
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+
+    def text(self, keywords, **kwargs):
+        _SlowFirst.calls += 1
+        if _SlowFirst.calls == 1:
+            time.sleep(0.5)
+            return [{"title": "느린 응답"}]
+        return [{"title": "복제 응답"}]
+
+
+def test_slow_request_is_hedged(use_search, monkeypatch):
+    use_search(_SlowFirst)
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record("text", 0.01)
+    monkeypatch.setattr(ddgs, "_latency", tracker)
+    monkeypatch.setattr(ddgs, "_search_executor", ThreadPoolExecutor(max_workers=4))
+    started = time.monotonic()
+    results = ddgs.DDGS()._hedged_call("text", ("무선 청소기",), {}, 2.0)
+    assert results == [{"title": "복제 응답"}]
+    assert time.monotonic() - started < 0.4
+    assert tracker.hedges == 1
+
+
+class _Client:
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+
+def test_client_pool_reuses_idle_clients():
+    pool = ClientPool(_Client, size=2)
+    first = pool.acquire(10)
+    pool.release(first, ok=True)
+    again = pool.acquire(10)
+    assert again is first
+    assert pool.stats()["created"] == 1 and pool.stats()["reused"] == 1
+
+
+def test_client_pool_limits_live_clients():
+    pool = ClientPool(_Client, size=1)
+    held = pool.acquire(10)
+    assert pool.acquire(10, wait=0.01) is None
+    pool.release(held, ok=True)
+    # 다른 timeout용 클라이언트가 놀고 있으면 버리고 새로 만듦
+    other = pool.acquire(20, wait=0.01)
+    assert other is not None and other.timeout == 20
+    assert pool.stats()["live"] == 1
+
+
+def test_client_pool_recycles_failing_clients():
+    pool = ClientPool(_Client, size=1, max_failures=2)
+    client = pool.acquire(10)
+    pool.release(client, ok=False)
+    assert pool.acquire(10) is client
+    pool.release(client, ok=False)
+    assert pool.stats()["recycled"] == 1 and pool.stats()["live"] == 0
+    assert pool.acquire(10) is not client
@@ -0,0 +1,83 @@
+# 검색 결과 디스크 캐시(TTL/LRU, 동시 요청 합치기, 캐시 무시) 테스트입니다.
+
+import threading
+import time
+
+import ddgs
+from disk_cache import DiskCache
+from fakes import FakeDDGS
+
+
+def make_cache(tmp_path, **kwargs):
+    return DiskCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_get_set_and_ttl(tmp_path):
+    cache = make_cache(tmp_path, ttl=0.05)
+    key = DiskCache.make_key("text", "무선 청소기", {"max_results": 6})
+    assert cache.get(key) is None
+    cache.set(key, [{"title": "결과"}])
+    assert cache.get(key) == [{"title": "결과"}]
+    time.sleep(0.06)
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1 and cache.get("b") is None and cache.get("c") == 3
+
+
+def test_concurrent_misses_compute_once(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["결과"]
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_or_set("key", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and results == [["결과"]] * 8
+
+
+def test_bypass_recomputes_and_overwrites(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get_or_set("key", lambda: "old") == "old"
+    assert cache.get_or_set("key", lambda: "ignored") == "old"
+    assert cache.get_or_set("key", lambda: "new", bypass=True) == "new"
+    assert cache.get("key") == "new" and cache.stats()["bypasses"] == 1
+
+
+def test_uncacheable_values_are_not_stored(tmp_path):
+    cache = make_cache(tmp_path)
+    value = cache.get_or_set("key", lambda: [{"fallback": True}], cacheable=lambda v: not v[0].get("fallback"))
+    assert value == [{"fallback": True}] and cache.get("key") is None
+
+
+def test_search_uses_cache_unless_bypassed(fake_backends, monkeypatch, tmp_path):
+    monkeypatch.setattr(ddgs, "_search_cache", make_cache(tmp_path, table="search"))
+    before = FakeDDGS.calls
+    with ddgs.DDGS() as client:
+        first = client.text("캐시 테스트 키워드", max_results=3)
+        again = client.text("캐시 테스트 키워드", max_results=3)
+    assert first == again and FakeDDGS.calls - before == 1
+    with ddgs.DDGS(use_cache=False) as client:
+        client.text("캐시 테스트 키워드", max_results=3)
+    assert FakeDDGS.calls - before == 2
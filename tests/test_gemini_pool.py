@@ -0,0 +1,73 @@
+# Gemini 키/모델 풀 테스트입니다.
+
+import pytest
+
+from fakes import FakeGenerativeModel
+from gemini_pool import GeminiPool, GeminiPoolError, classify_error
+
+
+class _Failing:
+    def __init__(self, error):
+        self.error = error
+
+    def generate_content(self, prompt, stream=False):
+        raise self.error
+
+
+def make_pool(broken, **kwargs):
+    """broken: {(키, 모델): 예외} 조합은 실패, 나머지는 가짜 모델"""
+    def factory(api_key, model_name):
+        error = broken.get((api_key, model_name))
+        return _Failing(error) if error else FakeGenerativeModel(model_name=f"models/{model_name}")
+    return GeminiPool(["key-a", "key-b"], ["main", "lite"], model_factory=factory, **kwargs)
+
+
+def test_classify_error():
+    assert classify_error(RuntimeError("429 Resource has been exhausted")) == "quota"
+    assert classify_error(RuntimeError("503 Service Unavailable")) == "server"
+    assert classify_error(ValueError("invalid argument")) == "fatal"
+
+
+def test_quota_error_moves_to_other_key_and_cools_down():
+    pool = make_pool({("key-a", "main"): RuntimeError("429 quota")})
+    for _ in range(3):
+        response = pool.generate_content("프롬프트")
+        assert response.served_model == "models/main"
+    keys = {k["key"]: k for k in pool.stats()["keys"]}
+    assert keys["key1"]["quota_errors"] == 1 and not keys["key1"]["healthy"]
+    assert pool.stats()["models"] == {"main": 3, "lite": 0}
+
+
+def test_falls_back_to_next_model_and_reports_it():
+    error = RuntimeError("503 unavailable")
+    pool = make_pool({("key-a", "main"): error, ("key-b", "main"): error})
+    response = pool.generate_content("프롬프트")
+    assert response.text and response.served_model == "models/lite"
+    stream = pool.generate_content("프롬프트", stream=True)
+    assert "".join(chunk.text for chunk in stream) == response.text
+    assert stream.served_model == "models/lite"
+
+
+def test_fatal_error_is_raised_without_failover():
+    pool = make_pool({("key-a", "main"): ValueError("bad request"), ("key-b", "main"): ValueError("bad request")})
+    with pytest.raises(ValueError):
+        pool.generate_content("프롬프트")
+
+
+def test_all_keys_failing_raises_pool_error():
+    error = RuntimeError("429 quota")
+    pool = make_pool({(k, m): error for k in ("key-a", "key-b") for m in ("main", "lite")})
+    with pytest.raises(GeminiPoolError):
+        pool.generate_content("프롬프트")
+
+
+def test_all_keys_cooling_reports_wait():
+    error = RuntimeError("429 quota")
+    pool = make_pool({(k, m): error for k in ("key-a", "key-b") for m in ("main", "lite")}, quota_cooldown=30)
+    with pytest.raises(GeminiPoolError, match="실패했습니다: 429 quota"):
+        pool.generate_content("프롬프트")
+    # 이번에는 시도할 키가 없으므로 마지막 오류(None) 대신 쉬는 시간을 알려줌
+    with pytest.raises(GeminiPoolError, match=r"쉬는 중입니다 \(다시 시도까지 main 30초, lite 30초\)"):
+        pool.generate_content("프롬프트")
+    with pytest.raises(GeminiPoolError, match="쉬는 중"):
+        list(pool.generate_content("프롬프트", stream=True))
@@ -0,0 +1,99 @@
+# 백그라운드 작업 실행기 테스트입니다.
+
+import threading
+import time
+
+from jobs import JobExecutor
+
+
+def wait_finished(executor, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not executor.get(job_id).finished:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    return executor.get(job_id)
+
+
+def test_result_error_and_stage():
+    executor = JobExecutor(workers=1)
+
+    def ok(job):
+        job.set_stage("generating")
+        job.append("청크")
+        return 42
+
+    def fail(job):
+        raise RuntimeError("실패")
+
+    done = wait_finished(executor, executor.submit("a", "naver_info", "ok", ok))
+    failed = wait_finished(executor, executor.submit("a", "naver_info", "fail", fail))
+    assert done.state == "done" and done.result == 42
+    # 끝난 작업은 스트리밍 청크를 들고 있지 않음
+    assert done.text() == ""
+    assert failed.state == "error" and failed.error == "실패"
+
+
+def test_progress_notes_cleared_when_finished():
+    executor = JobExecutor(workers=1)
+
+    def run(job):
+        for i in range(3):
+            job.set_progress(i + 1, 3, f"- {i}")
+        assert job.notes() == ["- 0", "- 1", "- 2"]
+        return "ok"
+
+    job = wait_finished(executor, executor.submit("a", "batch", "batch", run))
+    assert job.result == "ok" and job.progress == (3, 3) and job.notes() == []
+
+
+def test_owners_take_turns_and_queued_jobs_can_be_cancelled():
+    executor = JobExecutor(workers=1)
+    gate = threading.Event()
+    order = []
+
+    def blocker(job):
+        gate.wait(5)
+
+    def record(name):
+        def run(job):
+            order.append(name)
+        return run
+
+    first = executor.submit("a", "x", "blocker", blocker)
+    while executor.get(first).state == "queued":
+        time.sleep(0.005)
+    a_jobs = [executor.submit("a", "x", f"a{i}", record(f"a{i}")) for i in range(3)]
+    b_job = executor.submit("b", "x", "b0", record("b0"))
+    assert executor.position(a_jobs[2]) == 2
+    assert executor.cancel(a_jobs[1])
+    assert not executor.cancel(first)
+    gate.set()
+    for job_id in [first, a_jobs[0], a_jobs[2], b_job]:
+        wait_finished(executor, job_id)
+    # a가 여러 건을 쌓아도 b가 끝까지 밀리지 않음
+    assert order == ["a0", "b0", "a2"]
+    assert executor.get(a_jobs[1]).state == "cancelled"
+
+
+def test_finished_jobs_pruned_past_history():
+    executor = JobExecutor(workers=2, history=3)
+    ids = [executor.submit("a", "x", str(i), lambda job: None) for i in range(3)]
+    for job_id in ids:
+        wait_finished(executor, job_id)
+    executor.submit("a", "x", "new", lambda job: None)
+    assert executor.get(ids[0]) is None and executor.get(ids[2]) is not None
+
+
+def test_cancelling_owners_only_job_keeps_worker_alive():
+    executor = JobExecutor(workers=1)
+    gate = threading.Event()
+    first = executor.submit("a", "x", "blocker", lambda job: gate.wait(5))
+    while executor.get(first).state == "queued":
+        time.sleep(0.005)
+    only = executor.submit("b", "x", "b0", lambda job: "b")
+    assert executor.cancel(only)
+    assert executor.stats()["owners"] == 0
+    nxt = executor.submit("c", "x", "c0", lambda job: "c")
+    gate.set()
+    assert wait_finished(executor, nxt).result == "c"
+    assert executor.get(only).state == "cancelled"
@@ -0,0 +1,55 @@
+# 모델 응답 JSON 추출/복구 테스트입니다.
+
+import json
+
+import pytest
+
+from json_extract import JSONStreamExtractor, extract_json
+
+DATA = {"title": "무선 청소기 추천", "content": "[TITLE]소제목[/TITLE]\n\"진짜\" 달라요 {중괄호}", "hashtags": "#청소기 #추천"}
+TEXT = json.dumps(DATA, ensure_ascii=False, indent=4)
+
+
+@pytest.mark.parametrize("raw", [
+    TEXT,
+    f"```json\n{TEXT}\n```",
+    f"요청하신 원고입니다.\n{TEXT}\n참고: {{필요 시 수정}}"
+])
+def test_complete_response_is_not_repaired(raw):
+    assert extract_json(raw) == (DATA, False)
+
+
+def test_truncated_string_is_closed():
+    data, repaired = extract_json(TEXT[:TEXT.index("달라요") + 3])
+    assert repaired
+    assert data["title"] == DATA["title"]
+    assert data["content"].endswith("달라요")
+
+
+def test_dangling_key_and_trailing_comma_are_dropped():
+    data, repaired = extract_json('{"title": "제목", "content": "본문",\n "hashtags":')
+    assert repaired
+    assert data == {"title": "제목", "content": "본문"}
+
+
+def test_broken_json_falls_back_to_fields():
+    data, repaired = extract_json('{"title": "제목", "content": "본문" "hashtags": "#a"}')
+    assert repaired
+    assert data["title"] == "제목" and data["content"] == "본문"
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        extract_json("죄송합니다. 요청을 처리할 수 없습니다.")
+
+
+def test_stream_chunks_match_whole_text():
+    extractor = JSONStreamExtractor()
+    previews = []
+    for i in range(0, len(TEXT), 7):
+        extractor.feed(TEXT[i:i + 7])
+        previews.append(extractor.partial().get("content", ""))
+    assert extractor.result() == (DATA, False)
+    # 미리보기는 앞부분부터 점점 늘어남
+    assert previews[-1] == DATA["content"]
+    assert all(DATA["content"].startswith(p) for p in previews if p)
@@ -0,0 +1,38 @@
+# 일괄 생성 키워드 묶음 테스트입니다.
+
+from keyword_cluster import cluster_keywords, normalize, search_keyword
+
+KEYWORDS = ["무선 청소기 추천", "다이슨 무선 청소기", "건강보험 환급 방법", "무선 청소기 추천 2025", "2025년 건강보험 환급 방법", "청소기"]
+
+
+def test_normalize_drops_years_and_modifiers():
+    assert normalize("무선 청소기 추천 2025") == {"무선", "청소기"}
+    assert normalize("2025년 건강보험 환급 방법") == {"건강보험", "환급", "방법"}
+    # 다 지워지면 원래 토큰
+    assert normalize("추천 2025") == {"추천", "2025"}
+
+
+def test_normalize_keeps_model_numbers():
+    assert normalize("아이폰 15 케이스 추천") == {"아이폰", "15", "케이스"}
+    assert normalize("갤럭시 s24 3월 1위") == {"갤럭시", "s24"}
+
+
+def test_different_model_numbers_are_not_merged():
+    keywords = ["아이폰 15 케이스", "아이폰 16 케이스", "아이폰 15 케이스 추천", "아이폰 케이스", "2025 아이폰 16 케이스"]
+    assert cluster_keywords(keywords) == [[0, 2], [1, 4], [3]]
+
+
+def test_similar_keywords_share_a_cluster():
+    clusters = cluster_keywords(KEYWORDS)
+    assert clusters == [[0, 1, 3, 5], [2, 4]]
+
+
+def test_search_keyword_is_the_medoid():
+    clusters = cluster_keywords(KEYWORDS)
+    assert search_keyword(KEYWORDS, clusters[0]) == "무선 청소기 추천"
+    assert search_keyword(KEYWORDS, clusters[1]) == "건강보험 환급 방법"
+    assert search_keyword(KEYWORDS, [5]) == "청소기"
+
+
+def test_threshold_one_keeps_only_identical_keywords():
+    assert cluster_keywords(KEYWORDS, threshold=1.0) == [[0, 3], [1], [2, 4], [5]]
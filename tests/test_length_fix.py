@@ -0,0 +1,72 @@
+# 글자수 보정(섹션 단위 늘리기/줄이기) 테스트입니다.
+
+import json
+import re
+
+import pipeline
+from article_score import body_text
+from fakes import FakeGenerativeModel
+import length_fix
+
+
+def make_content(lengths):
+    parts = [f"[TITLE]{i + 1}. 소제목[/TITLE]\n" + "가" * n for i, n in enumerate(lengths)]
+    return "도입부입니다.\n" + "\n".join(parts) + "\n[[CTA_1]]"
+
+
+def test_split_sections_skips_headings():
+    content = make_content([100, 200])
+    sections = length_fix.split_sections(content)
+    assert [body_text(content[s:e]) for s, e in sections] == ["도입부입니다.", "가" * 100, "가" * 200]
+
+
+def test_plan_in_range_does_nothing():
+    assert length_fix.plan(make_content([500, 500, 500, 500])) == (None, [])
+
+
+def test_plan_extends_shortest_sections():
+    content = make_content([100, 600, 200, 700, 150])
+    action, sections = length_fix.plan(content)
+    assert action == "extend"
+    assert sorted(current for _, _, current, _ in sections) == [7, 100, 150]
+    assert all(goal > current for _, _, current, goal in sections)
+
+
+def test_plan_condenses_longest_sections():
+    content = make_content([1500, 900, 400, 200])
+    action, sections = length_fix.plan(content)
+    assert action == "condense"
+    assert sorted(current for _, _, current, _ in sections) == [400, 900, 1500]
+    # 섹션당 절반 이상은 남김
+    assert all(current // 2 <= goal < current for _, _, current, goal in sections)
+
+
+def test_apply_keeps_missing_cta_markers():
+    content = "[TITLE]1[/TITLE]\n짧은 본문 [[CTA_1]]\n[TITLE]2[/TITLE]\n다른 본문"
+    sections = [(s, e, 0, 0) for s, e in length_fix.split_sections(content)]
+    new, changed = length_fix.apply(content, sections, {"1": "늘린 본문", "2": ""})
+    assert changed == 1
+    assert "늘린 본문\n[[CTA_1]]" in new and "다른 본문" in new
+
+
+def test_enforce_length_rewrites_only_chosen_sections(use_model):
+    def respond(prompt):
+        goals = re.findall(r"\[(\d+)\] 목표 약 (\d+)자", prompt)
+        return json.dumps({i: "나" * int(goal) for i, goal in goals}, ensure_ascii=False)
+
+    use_model(FakeGenerativeModel(respond=respond))
+    data = {"title": "제목", "content": make_content([300, 300, 300])}
+    stages = []
+    fixed, report = pipeline.enforce_length("키워드", data, full_tokens=10000, use_cache=False, on_stage=stages.append)
+    chars = len(body_text(fixed["content"]))
+    assert 1800 <= chars <= 2400
+    assert report["action"] == "extend" and report["rounds"] == 1 and report["before"] < 1800
+    assert stages == ["lengthening", "rendering"]
+    assert "[[CTA_1]]" in fixed["content"]
+
+
+def test_enforce_length_stops_when_fix_costs_more_than_regenerating(use_model):
+    use_model(FakeGenerativeModel(respond=lambda prompt: "{}"))
+    data = {"title": "제목", "content": make_content([300, 300, 300])}
+    fixed, report = pipeline.enforce_length("키워드", data, full_tokens=10, use_cache=False)
+    assert fixed is data and report["rounds"] == 0 and report["tokens"] == 0
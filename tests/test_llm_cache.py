@@ -0,0 +1,57 @@
+import pytest
+
+import pipeline
+from fakes import FakeGenerativeModel
+from llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """이 테스트 전용 응답 캐시"""
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setitem(pipeline._resources, "llm_cache", cache)
+    return cache
+
+
+def test_key_depends_on_model_and_prompt(cache):
+    cache.put("models/a", "프롬프트", "응답", tokens=10)
+    assert cache.get("models/b", "프롬프트") is None
+    assert cache.get("models/a", "다른 프롬프트") is None
+    assert cache.get("models/a", "프롬프트") == "응답"
+    assert cache.get("models/a", "프롬프트") == "응답"
+    assert cache.stats()["tokens_saved"] == 20
+
+
+def test_empty_response_is_not_stored(cache):
+    cache.put("models/a", "프롬프트", "")
+    assert cache.get("models/a", "프롬프트") is None
+
+
+def test_generate_text_replays_without_model_call(cache, use_model):
+    model = use_model(FakeGenerativeModel(respond=lambda prompt: f"응답:{prompt}"))
+    first = pipeline.generate_text("p1")
+    second = pipeline.generate_text("p1")
+    assert first[0] == second[0] == "응답:p1"
+    assert (first[3], second[3]) == (False, True)
+    assert model.calls == 1
+
+
+def test_streamed_replay_sends_cached_text(cache, use_model):
+    model = use_model(FakeGenerativeModel(respond=lambda prompt: "가" * 150, chunk_chars=60))
+    chunks = []
+    pipeline.generate_text("p2", on_chunk=chunks.append)
+    assert len(chunks) == 3
+    replayed = []
+    text, ttft, elapsed, cached = pipeline.generate_text("p2", on_chunk=replayed.append)
+    assert cached and replayed == [text] == ["가" * 150]
+    assert model.calls == 1
+
+
+def test_bypass_regenerates_and_overwrites(cache, use_model):
+    answers = iter(["첫 응답", "새 응답"])
+    model = use_model(FakeGenerativeModel(respond=lambda prompt: next(answers)))
+    assert pipeline.generate_text("p3")[0] == "첫 응답"
+    text, _, _, cached = pipeline.generate_text("p3", use_cache=False)
+    assert (text, cached) == ("새 응답", False)
+    assert pipeline.generate_text("p3")[0] == "새 응답"
+    assert model.calls == 2
@@ -0,0 +1,56 @@
+# 철칙 금지 문구 검사 테스트입니다.
+
+from article_score import score_article
+from phrase_guard import PhraseMatcher, check_article, find_violations, sentence_spans
+
+
+def test_matcher_finds_overlapping_phrases():
+    matcher = PhraseMatcher({"정리": "a", "정리하면": "b", "하면": "c"})
+    found = sorted((s, e, p) for s, e, p, _ in matcher.finditer("요약 정리하면 끝"))
+    assert found == [(3, 5, "정리"), (3, 7, "정리하면"), (5, 7, "하면")]
+
+
+def test_dates_are_violations():
+    found = find_violations("2025년 1월 5일 발표")
+    assert [(p, c) for _, _, p, c in found] == [("2025년", "날짜"), ("1월 5일", "날짜")]
+    found = find_violations("1월에 가격이 오르고 12월까지 이어집니다")
+    assert [p for _, _, p, _ in found] == ["1월", "12월"]
+    # 기간 표현은 날짜가 아님
+    assert find_violations("3개월 써 보니 5일 만에 적응") == []
+
+
+def test_relative_days_are_violations():
+    found = find_violations("어제 샀는데 내일 또 오르고, 오늘 가격이 최저")
+    assert [(p, c) for _, _, p, c in found] == [("어제", "날짜"), ("내일", "날짜"), ("오늘", "날짜")]
+    # "오늘은"은 인사 문구이면서 상대 날짜
+    assert sorted(p for _, _, p, _ in find_violations("오늘은 청소기")) == ["오늘", "오늘은"]
+    # 정보성 프롬프트는 상대 날짜 조항이 없고 날짜 표기만 금지
+    info = check_article({"content": "어제보다 싸졌고 3월부터 오릅니다"}, "naver_info")["content"]
+    assert [p for _, _, p, _ in info] == ["3월"]
+
+
+def test_styles_use_their_own_rules():
+    data = {"title": "무선 청소기", "content": "정리하면 쿠팡에서 사세요. 결론은 흡입력입니다."}
+    profit = [p for _, _, p, _ in check_article(data, "naver_profit")["content"]]
+    info = [p for _, _, p, _ in check_article(data, "naver_info")["content"]]
+    assert profit == ["정리하면", "쿠팡에서", "결론"]
+    # 정보성 페르소나는 "정리하면"을 쓰라고 하고, 쿠팡 조항도 없음
+    assert info == ["결론"]
+    assert check_article(data, "tistory_info") == check_article(data, "naver_info")
+
+
+def test_hits_inside_keyword_are_skipped():
+    data = {"title": "2025년 최저임금 총정리", "content": "2025년 최저임금은 올랐습니다. 2024년보다 높습니다."}
+    result = check_article(data, "naver_info", "2025년 최저임금")
+    assert result["title"] == []
+    assert [p for _, _, p, _ in result["content"]] == ["2024년"]
+    quality = score_article("2025년 최저임금", data, cta=(), style="naver_info")
+    assert quality["title_keyword"]
+    assert quality["banned"] == [("날짜", "2024년", 1)]
+
+
+def test_sentence_spans_stop_at_markers_and_merge():
+    text = "[TITLE]제목[/TITLE]안녕하세요 여러분. 저는 블로거입니다! 본문"
+    violations = find_violations(text)
+    spans = sentence_spans(text, violations)
+    assert [text[s:e] for s, e in spans] == ["안녕하세요 여러분.", "저는 블로거입니다!"]
@@ -0,0 +1,64 @@
+# 가짜 검색/모델로 원고 생성 경로를 돌려 보는 테스트입니다.
+
+import pipeline
+from fakes import FakeDDGS
+
+
+def test_same_seed_replays_cached_response(fake_backends):
+    first = pipeline.write_naver_info("에어프라이어 추천", seed=42)
+    calls = fake_backends.calls
+    again = pipeline.write_naver_info("에어프라이어 추천", seed=42)
+    assert again["cached"] and fake_backends.calls == calls
+    # 소제목 스타일은 렌더 때마다 랜덤이므로 본문 대신 제목/길이로 비교
+    assert again["title"] == first["title"]
+    assert again["quality"]["chars"] == first["quality"]["chars"]
+
+
+def test_write_modes_return_scored_posts(fake_backends):
+    posts = [
+        pipeline.write_naver_profit("무선 청소기 추천", "다이슨 V15", "https://link.coupang.com/x", use_llm_cache=False),
+        pipeline.write_naver_info("무선 청소기 추천", use_llm_cache=False),
+        pipeline.write_tistory_info("무선 청소기 추천", use_llm_cache=False)
+    ]
+    for post in posts:
+        assert post["keyword"] == "무선 청소기 추천"
+        assert post["title"] and post["content"] and post["clipboard_hash"]
+        assert 0 <= post["quality"]["score"] <= 100
+    assert posts[0]["quality"]["cta_missing"] == []
+
+
+def test_variants_polish_only_the_winner(fake_backends):
+    post = pipeline.write_naver_profit_variants("무선 청소기 추천", "다이슨 V15", "https://link.coupang.com/x", n=3, use_llm_cache=False)
+    assert len(post["candidates"]) == 3
+    assert post["candidates"][0]["seed"] == post["seed"]
+    # 고른 원고만 보정 단계를 거침 (보정 결과가 있음), 나머지 후보는 그대로
+    assert post["quality"]["length"] is not None
+    assert all(c["quality"]["length"] is None for c in post["candidates"][1:])
+
+
+def test_run_batch_shares_search_between_similar_keywords(fake_backends):
+    rows = [
+        {"keyword": "무선 청소기 추천", "mode": "naver_info"},
+        {"keyword": "무선 청소기 추천 2025", "mode": "tistory_info"},
+        {"keyword": "아이폰 배터리 교체 비용", "mode": "naver_info"}
+    ]
+    progress = []
+    before = FakeDDGS.calls
+    results = pipeline.run_batch(rows, 2, lambda done, total, result: progress.append(done), use_cache=False, use_llm_cache=False, shared_search=True)
+    shared_calls = FakeDDGS.calls - before
+    assert [r["status"] for r in results] == ["ok"] * 3
+    assert sorted(progress) == [1, 2, 3]
+    # 청소기 두 행은 검색 1번을 나눠 씀 → 3행을 검색 2번으로
+    assert pipeline.shared_search_savings(results) == (3, 2)
+
+    before = FakeDDGS.calls
+    pipeline.run_batch(rows, 2, use_cache=False, use_llm_cache=False, shared_search=False)
+    assert shared_calls < FakeDDGS.calls - before
+
+
+def test_facts_from_shared_respects_budget():
+    results = [{"title": "무선 청소기 추천", "body": "무선 청소기 흡입력 비교. " * 80, "href": "https://a"}]
+    facts = pipeline.facts_from_shared("무선 청소기", results, max_tokens=50)
+    assert facts != pipeline.NO_FACTS
+    assert pipeline.estimate_tokens(facts) <= 60
+    assert pipeline.facts_from_shared("무선 청소기", []) == pipeline.NO_FACTS
@@ -0,0 +1,37 @@
+from prompt_budget import budget_facts, estimate_tokens, format_facts
+
+RESULTS = [
+    {"title": "청소기 비교", "body": "무선 청소기 흡입력은 모델마다 다릅니다. 가격은 30만원부터 시작합니다. 더보기"},
+    {"title": "청소기 후기", "body": "무선 청소기 흡입력은 모델마다 다릅니다. 필터 청소는 한 달에 한 번이면 충분합니다."},
+    {"title": "날씨", "body": "내일은 전국이 대체로 맑겠습니다. " * 20}
+]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("가나다") == 2
+    assert estimate_tokens("abcd efgh") == 2
+    assert estimate_tokens("!!") == 2
+
+
+def test_under_budget_keeps_original():
+    context, before, after = budget_facts("무선 청소기", RESULTS[:1], 1000)
+    assert context == format_facts(RESULTS[:1])
+    assert before == after == estimate_tokens(context)
+
+
+def test_over_budget_keeps_relevant_sentences():
+    context, before, after = budget_facts("무선 청소기", RESULTS, 60)
+    assert after <= 60 < before
+    assert after == estimate_tokens(context)
+    # 출처가 달라도 같은 문장은 한 번만, 키워드가 든 문장이 우선
+    assert context.count("흡입력은 모델마다") == 1
+    assert "날씨" not in context
+    assert "더보기" not in context
+    assert context.startswith("정보원: 청소기 비교\n핵심내용: ")
+
+
+def test_tiny_budget_truncates_top_sentence():
+    context, _, after = budget_facts("무선 청소기", RESULTS, 20)
+    assert context and after <= 20
+    assert "…" in context
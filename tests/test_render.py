@@ -0,0 +1,49 @@
+import json
+import random
+
+import pytest
+
+from render import STYLES, clipboard_hash, clipboard_literal, render_article
+
+CTX = {"keyword": "무선 청소기", "product": "다이슨 V15", "disclosure": "수수료를 제공받습니다."}
+DATA = {
+    "title": "무선 청소기 후기",
+    "content": "도입 **강조**\n[TITLE]첫 소제목[/TITLE]\n본문\n[[CTA_1]]\n[[CTA_1]]\n[TITLE]둘째[/TITLE]\n[[CTA_2]]",
+    "hashtags": "#청소기"
+}
+
+
+@pytest.mark.parametrize("mode", sorted(STYLES))
+def test_render_replaces_markers(mode):
+    random.seed(1)
+    article = render_article(DATA, STYLES[mode], **CTX)
+    assert "[TITLE]" not in article["html"] and "첫 소제목" in article["html"]
+    assert "<" not in article["text"] and "**" not in article["text"]
+    assert article["clipboard_hash"] == clipboard_hash(article["clipboard"])
+    if mode == "naver_profit":
+        # CTA는 번호마다 첫 등장 위치에 1번씩만
+        assert article["html"].count("최저가 & 혜택 확인하기") == 2
+        assert "[[CTA_" not in article["html"]
+    else:
+        assert "[[CTA_1]]" in article["html"]
+
+
+def test_clipboard_newlines_follow_style():
+    random.seed(1)
+    naver = render_article(DATA, STYLES["naver_info"], **CTX)["clipboard"]
+    tistory = render_article(DATA, STYLES["tistory_info"], **CTX)["clipboard"]
+    assert "\n" not in naver and "<br>" in naver and ">\n<" not in naver
+    assert "\n" not in tistory and "<br>" not in tistory
+
+
+@pytest.mark.parametrize("html", [
+    '<p>a</p><script>alert(1)</script>',
+    '<!-- x --><p>"따옴표" \\ `백틱` ${x}</p>',
+    'line\u2028sep\u2029para\n줄바꿈'
+])
+def test_clipboard_literal_is_script_safe(html):
+    literal = clipboard_literal(html)
+    assert "</" not in literal and "<!--" not in literal
+    assert "\u2028" not in literal and "\u2029" not in literal and "\n" not in literal
+    # 이스케이프를 풀면 원래 HTML 그대로
+    assert json.loads(literal) == html
@@ -0,0 +1,35 @@
+# 검색 스니펫 중복 제거 테스트입니다.
+
+from snippet_dedup import dedup_snippets, shingles, similarity
+
+STORY = "정부가 내년 최저임금을 시간당 1만 30원으로 확정했다고 고용노동부가 밝혔다. 올해보다 1.7% 오른 금액이다."
+
+
+def test_shingles_ignore_spaces_and_punctuation():
+    assert shingles("가 나, 다라") == shingles("가나다라")
+    assert shingles("가나") == {"가나"} and shingles("") == set()
+
+
+def test_same_story_from_different_outlets_kept_once():
+    results = [
+        {"title": "A일보", "body": STORY},
+        {"title": "B경제", "body": "[B경제] " + STORY + " (사진=연합)"},
+        {"title": "무관한 기사", "body": "무선 청소기 흡입력 비교 결과 다이슨이 가장 강했다."}
+    ]
+    kept, dropped, dropped_chars = dedup_snippets(results)
+    # 더 긴 쪽(정보가 많은 쪽)을 남기고 원래 순서 유지
+    assert [r["title"] for r in kept] == ["B경제", "무관한 기사"]
+    assert dropped == 1 and dropped_chars == len(STORY)
+
+
+def test_short_snippet_contained_in_long_one_is_dropped():
+    short = STORY[:25]
+    jac, contained = similarity(shingles(short), shingles(STORY))
+    assert jac < 0.6 and contained >= 0.85
+    kept, dropped, _ = dedup_snippets([{"body": short}, {"body": STORY}])
+    assert kept == [{"body": STORY}] and dropped == 1
+
+
+def test_title_used_when_body_missing():
+    kept, dropped, _ = dedup_snippets([{"title": STORY}, {"title": STORY}, {"title": ""}])
+    assert len(kept) == 2 and dropped == 1
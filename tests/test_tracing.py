@@ -0,0 +1,78 @@
+import io
+import json
+import re
+import threading
+
+import pytest
+
+import tracing
+
+
+@pytest.fixture
+def trace_log(monkeypatch, tmp_path):
+    """이 테스트 동안 span 로그를 메모리에 모으고 Prometheus 파일은 tmp_path에 씀"""
+    log = io.StringIO()
+    config = {"log": "memory", "window": 500, "prom_file": str(tmp_path / "metrics.prom"), "prom_interval": 0, "prom_port": None}
+    monkeypatch.setattr(tracing, "_config", config)
+    monkeypatch.setattr(tracing, "_log_file", log)
+    monkeypatch.setattr(tracing, "_last_export", 0.0)
+
+    def lines():
+        return [json.loads(line) for line in log.getvalue().splitlines()]
+    lines.config = config
+    return lines
+
+
+def test_nested_spans_share_trace(trace_log):
+    with tracing.span("test.outer", keyword="청소기") as outer:
+        with tracing.span("test.inner") as inner:
+            inner.set(tokens=12)
+        tracing.event("test.event", reason="폴백")
+    inner_line, event_line, outer_line = trace_log()
+    assert inner_line["name"] == "test.inner" and inner_line["tokens"] == 12
+    assert inner_line["trace"] == outer_line["trace"] == event_line["trace"] == outer.trace_id
+    assert inner_line["parent"] == event_line["parent"] == outer.span_id
+    assert outer_line["parent"] is None and outer_line["keyword"] == "청소기"
+
+
+def test_errors_are_counted(trace_log):
+    @tracing.traced("test.traced")
+    def fail():
+        raise ValueError("깨짐")
+
+    with pytest.raises(ValueError):
+        fail()
+    with tracing.span("test.traced") as span:
+        span.set(error="잡은 오류")
+    with tracing.span("test.traced"):
+        pass
+    assert trace_log()[0]["error"] == "ValueError: 깨짐"
+    stats = tracing.stats()["test.traced"]
+    assert stats["count"] == 3 and stats["errors"] == 2
+    assert stats["p50_ms"] <= stats["p95_ms"]
+
+
+def test_bind_carries_trace_into_threads(trace_log):
+    with tracing.span("test.parent") as parent:
+        def child():
+            with tracing.span("test.child"):
+                pass
+        thread = threading.Thread(target=tracing.bind(child))
+        thread.start()
+        thread.join()
+    child_line = trace_log()[0]
+    assert child_line["trace"] == parent.trace_id and child_line["parent"] == parent.span_id
+
+
+def test_prometheus_text_and_file(trace_log):
+    for _ in range(3):
+        with tracing.span("test.prom"):
+            pass
+    text = tracing.prometheus_text()
+    assert text.startswith("# HELP ghost_span_seconds")
+    assert re.search(r'^ghost_span_seconds\{span="test.prom",quantile="0.95"\} \d+\.\d{6}$', text, re.M)
+    assert 'ghost_span_seconds_count{span="test.prom"} 3' in text
+    assert 'ghost_span_errors_total{span="test.prom"} 0' in text
+    # TRACE_PROM_FILE을 지정하면 기록할 때마다(간격 0) 파일을 갱신
+    with open(trace_log.config["prom_file"], encoding="utf-8") as f:
+        assert 'ghost_span_seconds_count{span="test.prom"} 3' in f.read()
@@ -0,0 +1,247 @@
+# 단계별 소요 시간 추적(span) 모듈입니다.
+# 검색 시도/백오프, 프롬프트 조립, LLM 호출, JSON 파싱, 렌더링을 span으로 감싸
+# 1) 한 줄짜리 JSON 로그로 남기고 2) 단계별 최근 p50/p95를 집계하며
+# 3) 필요하면 Prometheus 텍스트 형식으로 파일/HTTP로 내보냅니다.
+#
+# 설정 (처음 기록할 때 한 번 읽음)
+#   TRACE_LOG: stderr(기본) / off / 로그 파일 경로
+#   TRACE_WINDOW: 단계별 p50/p95 계산에 쓰는 최근 기록 수 (기본 500)
+#   TRACE_PROM_FILE: Prometheus 텍스트를 주기적으로 덮어쓸 파일 경로
+#   TRACE_PROM_INTERVAL: 파일 갱신 최소 간격(초, 기본 15)
+#   TRACE_PROM_PORT: 지정하면 http://0.0.0.0:<port>/metrics 제공
+
+import os
+import sys
+import atexit
+import json
+import time
+import uuid
+import functools
+import threading
+import contextvars
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_current = contextvars.ContextVar("trace_span", default=None)
+
+_lock = threading.Lock()
+_windows = {}
+_totals = {}
+_config = None
+_log_file = None
+_last_export = 0.0
+
+
+def _setup():
+    """환경변수 읽기 + 내보내기 시작 (첫 기록 시 1회)"""
+    global _config, _log_file
+    with _lock:
+        if _config is not None:
+            return _config
+        target = os.getenv("TRACE_LOG", "stderr")
+        if target not in ("stderr", "off"):
+            folder = os.path.dirname(target)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            _log_file = open(target, "a", encoding="utf-8", buffering=1)
+        config = {
+            "log": target,
+            "window": int(os.getenv("TRACE_WINDOW", "500")),
+            "prom_file": os.getenv("TRACE_PROM_FILE"),
+            "prom_interval": float(os.getenv("TRACE_PROM_INTERVAL", "15")),
+            "prom_port": os.getenv("TRACE_PROM_PORT")
+        }
+        if config["prom_port"]:
+            _start_http(int(config["prom_port"]))
+        if config["prom_file"]:
+            # 주기 사이에 쌓인 기록도 종료 시 남김
+            atexit.register(_write_file, config["prom_file"])
+        _config = config
+        return config
+
+
+def _emit(line):
+    config = _config or _setup()
+    if config["log"] == "off":
+        return
+    text = json.dumps(line, ensure_ascii=False, default=str)
+    if _log_file is not None:
+        with _lock:
+            _log_file.write(text + "\n")
+    else:
+        print(text, file=sys.stderr)
+
+
+def _record(name, seconds, error=False):
+    config = _config or _setup()
+    with _lock:
+        window = _windows.get(name)
+        if window is None:
+            window = _windows[name] = deque(maxlen=config["window"])
+            _totals[name] = [0, 0.0, 0]
+        window.append(seconds)
+        total = _totals[name]
+        total[0] += 1
+        total[1] += seconds
+        total[2] += error
+    if config["prom_file"]:
+        _maybe_write_file(config)
+
+
+class Span:
+    """with span("llm.call", model=...) as s: ... s.set(tokens=123)"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = None
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = None
+        self._token = None
+        self._started = 0.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current.get()
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self._token = _current.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        # 예외로 끝났거나 호출부에서 잡은 오류를 error로 남긴 경우 실패로 집계
+        _record(self.name, seconds, error="error" in self.attrs)
+        _emit({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "ms": round(seconds * 1000, 2),
+            **self.attrs
+        })
+        return False
+
+
+def span(name, **attrs):
+    return Span(name, attrs)
+
+
+def traced(name):
+    """함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def event(name, **attrs):
+    """시간 없는 단발성 기록 (예: 검색 폴백), 현재 span의 trace에 묶임"""
+    parent = _current.get()
+    _emit({
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "trace": parent.trace_id if parent else None,
+        "parent": parent.span_id if parent else None,
+        "name": name,
+        **attrs
+    })
+
+
+def bind(fn):
+    """현재 trace 문맥을 다른 스레드(스레드 풀 작업)로 넘기는 래퍼"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def stats():
+    """단계별 최근 기록 기준 {이름: {count, p50_ms, p95_ms, errors}} (이름순)"""
+    with _lock:
+        snapshot = {name: (sorted(window), _totals[name]) for name, window in _windows.items()}
+    return {
+        name: {
+            "count": total[0],
+            "errors": total[2],
+            "p50_ms": round(_quantile(values, 0.5) * 1000, 1),
+            "p95_ms": round(_quantile(values, 0.95) * 1000, 1)
+        }
+        for name, (values, total) in sorted(snapshot.items()) if values
+    }
+
+
+def prometheus_text():
+    """Prometheus 텍스트 형식 (summary: 최근 기록 기준 분위수 + 누적 합/횟수)"""
+    with _lock:
+        snapshot = {name: (sorted(window), list(_totals[name])) for name, window in _windows.items()}
+    lines = [
+        "# HELP ghost_span_seconds Pipeline stage duration",
+        "# TYPE ghost_span_seconds summary"
+    ]
+    for name, (values, (count, total, _)) in sorted(snapshot.items()):
+        label = f'span="{name}"'
+        for q in (0.5, 0.95):
+            lines.append(f'ghost_span_seconds{{{label},quantile="{q}"}} {_quantile(values, q):.6f}')
+        lines.append(f"ghost_span_seconds_sum{{{label}}} {total:.6f}")
+        lines.append(f"ghost_span_seconds_count{{{label}}} {count}")
+    lines += ["# HELP ghost_span_errors_total Pipeline stage failures", "# TYPE ghost_span_errors_total counter"]
+    for name, (_, (_, _, errors)) in sorted(snapshot.items()):
+        lines.append(f'ghost_span_errors_total{{span="{name}"}} {errors}')
+    return "\n".join(lines) + "\n"
+
+
+def _maybe_write_file(config):
+    """TRACE_PROM_INTERVAL초마다 파일 갱신 (임시 파일에 쓴 뒤 교체해 읽는 쪽이 반쪽 파일을 보지 않게)"""
+    global _last_export
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export < config["prom_interval"]:
+            return
+        _last_export = now
+    _write_file(config["prom_file"])
+
+
+def _write_file(path):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_http(port):
+    """/metrics 서버 (포트가 이미 쓰이면 경고만 남기고 계속)"""
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    except OSError as e:
+        print(f"[Trace] 메트릭 포트 {port} 사용 불가: {e}", file=sys.stderr)
+        return
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()